@@ -0,0 +1,127 @@
+from typing import Optional
+
+import numpy as np
+
+from WizardAI.Card import CardType, Suit, CARDS_BY_ID, TRICK_STRENGTHS
+from WizardAI.PlayoutEngine import NO_CARD, NO_PLAYER
+
+NUM_CARD_IDS: int = len(CARDS_BY_ID)
+
+# Indexed by [trump][lead suit][card id], see Card.TRICK_STRENGTHS
+STRENGTHS: np.ndarray = np.array(TRICK_STRENGTHS, dtype=np.int8)
+# Indexed by card id. Wizards, jesters and the "no card" id have Suit.NONE
+CARD_SUITS: np.ndarray = np.array(
+    [Suit.NONE if card is None else card.suit for card in CARDS_BY_ID], dtype=np.int8
+)
+IS_WIZARD: np.ndarray = np.array(
+    [card is not None and card.card_type == CardType.WIZARD for card in CARDS_BY_ID]
+)
+# Indexed by [suit][card id]. The Suit.NONE row is empty, so that following it never restricts a hand
+SUIT_MEMBERSHIP: np.ndarray = np.array(
+    [[suit != Suit.NONE and card_suit == suit for card_suit in CARD_SUITS] for suit in Suit.values]
+)
+IS_SPECIAL: np.ndarray = CARD_SUITS == Suit.NONE
+
+
+def hands_from_deals(
+    deals: np.ndarray, hand_sizes: list[int], num_players: int, first_seat: int = 0
+) -> np.ndarray:
+    """
+    :param deals: deals as returned by Dealer.deal_from_pool
+    :param hand_sizes: sizes of the hands in each deal
+    :param num_players: number of players in the round
+    :param first_seat: seat the first hand of every deal goes to. The following hands go to the following seats
+    :return: boolean array of shape (num_deals, num_players, number of card ids), True if the card id is in the
+             hand of the player at that seat
+    """
+    num_deals: int = len(deals)
+    hands: np.ndarray = np.zeros((num_deals, num_players, NUM_CARD_IDS), dtype=bool)
+    rows: np.ndarray = np.arange(num_deals)[:, None]
+    start_idx: int = 0
+    for i, hand_size in enumerate(hand_sizes):
+        hands[rows, first_seat + i, deals[:, start_idx : start_idx + hand_size]] = True
+        start_idx += hand_size
+    return hands
+
+
+def batch_playouts(
+    trump: Suit,
+    hands: np.ndarray,
+    tricks_won: list[int],
+    current_seat: int,
+    winner_seat: int,
+    winning_card_id: int,
+    suit_to_follow: Optional[Suit],
+    cards_played: int,
+    player_seat: int,
+    rng: np.random.Generator,
+) -> np.ndarray:
+    """
+    Plays out every sampled world in lockstep, one card at a time, with every player choosing uniformly at
+    random between its playable cards. All the worlds start from the same trick position
+
+    :param trump: trump suit for the round
+    :param hands: boolean array of shape (num_worlds, num_players, number of card ids) as returned by
+                  hands_from_deals. The cards are removed from it as they get played
+    :param tricks_won: tricks won so far by every player, indexed by seat
+    :param current_seat: seat of the next player to play
+    :param winner_seat: seat of the player currently winning the trick, NO_PLAYER if nobody has played
+    :param winning_card_id: id of the card currently winning the trick, NO_CARD if nobody has played
+    :param suit_to_follow: suit to follow in the trick
+    :param cards_played: number of cards played in the round so far
+    :param player_seat: seat of the player whose tricks are counted
+    :param rng: random generator to draw the moves from
+    :return: histogram of the number of tricks won by the player, indexed by number of tricks
+    """
+    num_worlds, num_players, num_card_ids = hands.shape
+    rows: np.ndarray = np.arange(num_worlds)
+    strengths: np.ndarray = STRENGTHS[trump]
+
+    tricks: np.ndarray = np.tile(np.array(tricks_won, dtype=np.int16), (num_worlds, 1))
+    seats: np.ndarray = np.full(num_worlds, current_seat, dtype=np.intp)
+    winners: np.ndarray = np.full(num_worlds, winner_seat, dtype=np.intp)
+    winning_cards: np.ndarray = np.full(num_worlds, winning_card_id, dtype=np.intp)
+    # Suit.NONE covers both "nothing to follow yet" and "anything can be played"
+    lead_suits: np.ndarray = np.full(
+        num_worlds,
+        Suit.NONE if suit_to_follow is None else suit_to_follow,
+        dtype=np.intp,
+    )
+    cards_left: int = int(hands[0].sum())
+
+    while True:
+        if cards_played > 0 and cards_played % num_players == 0:
+            tricks[rows, winners] += 1
+            seats = winners
+            winners = np.full(num_worlds, NO_PLAYER, dtype=np.intp)
+            winning_cards = np.full(num_worlds, NO_CARD, dtype=np.intp)
+            lead_suits = np.full(num_worlds, Suit.NONE, dtype=np.intp)
+
+        if cards_left == 0:
+            break
+
+        hand: np.ndarray = hands[rows, seats]
+        following_cards: np.ndarray = hand & SUIT_MEMBERSHIP[lead_suits]
+        playable: np.ndarray = np.where(
+            following_cards.any(axis=1)[:, None],
+            following_cards | (hand & IS_SPECIAL),
+            hand,
+        )
+        keys: np.ndarray = rng.random((num_worlds, num_card_ids))
+        keys[~playable] = -1.0
+        cards: np.ndarray = keys.argmax(axis=1)
+        hands[rows, seats, cards] = False
+
+        wins: np.ndarray = (
+            strengths[lead_suits, cards] > strengths[lead_suits, winning_cards]
+        )
+        sets_lead_suit: np.ndarray = wins & ~IS_WIZARD[cards] & (lead_suits == Suit.NONE)
+        lead_suits = np.where(sets_lead_suit, CARD_SUITS[cards], lead_suits)
+        winners = np.where(wins, seats, winners)
+        winning_cards = np.where(wins, cards, winning_cards)
+
+        seats = (seats + 1) % num_players
+        cards_played += 1
+        cards_left -= 1
+
+    return np.bincount(tricks[:, player_seat], minlength=1)
@@ -0,0 +1,208 @@
+import argparse
+import itertools
+import os
+from typing import Iterator, Optional
+
+import numpy as np
+
+from WizardAI.Card import Suit
+from WizardAI.CardSet import JESTER_MASK, WIZARD_MASK, cards_in
+from WizardAI.MonteCarloPlayer import MonteCarloSimulator
+from WizardAI.SuitIsomorphism import SUIT_SIZE, canonicalize
+
+# Rounds with at most this many cards are covered by the book
+BOOK_MAX_CARDS = 5
+BOOK_PLAYOUTS = 500
+
+FIRST_WIZARD_BIT = (WIZARD_MASK & -WIZARD_MASK).bit_length() - 1
+FIRST_JESTER_BIT = (JESTER_MASK & -JESTER_MASK).bit_length() - 1
+
+
+def canonical_hand(hand: int, trump: Suit) -> int:
+    """
+    :return: mask of an equivalent hand against blue trumps (or no trumps): the suits are relabelled as by
+             SuitIsomorphism.canonicalize, and the wizards and jesters are replaced by the lowest ones, as they
+             are interchangeable
+    """
+    hand = canonicalize(hand, trump)[0][0]
+    num_wizards: int = (hand & WIZARD_MASK).bit_count()
+    num_jesters: int = (hand & JESTER_MASK).bit_count()
+    return (
+        (hand & ~(WIZARD_MASK | JESTER_MASK))
+        | (((1 << num_wizards) - 1) << FIRST_WIZARD_BIT)
+        | (((1 << num_jesters) - 1) << FIRST_JESTER_BIT)
+    )
+
+
+def canonical_hands(hand_size: int, trump: Suit) -> Iterator[int]:
+    """:return: every canonical hand of the given size against blue trumps or no trumps, see canonical_hand"""
+    suited_bits: list[int] = [
+        bit
+        for suit in Suit.all_suits
+        for bit in range(suit * SUIT_SIZE, (suit + 1) * SUIT_SIZE)
+    ]
+    for num_wizards in range(min(hand_size, 4) + 1):
+        for num_jesters in range(min(hand_size - num_wizards, 4) + 1):
+            special: int = (((1 << num_wizards) - 1) << FIRST_WIZARD_BIT) | (
+                ((1 << num_jesters) - 1) << FIRST_JESTER_BIT
+            )
+            for bits in itertools.combinations(
+                suited_bits, hand_size - num_wizards - num_jesters
+            ):
+                hand: int = special
+                for bit in bits:
+                    hand |= 1 << bit
+                if canonical_hand(hand, trump) == hand:
+                    yield hand
+
+
+def table_name(num_players: int, hand_size: int, seat: int, has_trump: bool) -> str:
+    """
+    :param seat: position of the player in the order of play, starting from 0 for the player who leads
+    """
+    return f"bids_{num_players}p_{hand_size}c_seat{seat}_{'trump' if has_trump else 'notrump'}"
+
+
+def generate_table(
+    num_players: int,
+    hand_size: int,
+    seat: int,
+    has_trump: bool,
+    num_playouts: int = BOOK_PLAYOUTS,
+) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Plays out every canonical hand. The trump card is not known, so it might be in the other players' hands
+
+    :return: sorted canonical hand masks, and the matching distributions of the number of tricks won, with
+             one row per hand
+    """
+    players: list[str] = [f"P{i}" for i in range(num_players)]
+    next_player_lookup: dict[str, str] = {
+        player: players[(i + 1) % num_players] for i, player in enumerate(players)
+    }
+    keys: list[int] = []
+    distributions: list[np.ndarray] = []
+    trump: Suit = Suit.BLUE if has_trump else Suit.NONE
+    for hand in sorted(canonical_hands(hand_size, trump)):
+        simulator: MonteCarloSimulator = MonteCarloSimulator(
+            players[0],
+            cards_in(hand),
+            dict(),
+            trump,
+            None,
+            None,
+            None,
+            None,
+            players[-seat],
+            dict(),
+            dict(),
+            next_player_lookup,
+            1,
+            num_playouts,
+            batch_playouts=True,
+        )
+        distribution: np.ndarray = np.zeros(hand_size + 1, dtype=np.float32)
+        for tricks_won, freq in simulator.bid_histogram(num_playouts).items():
+            distribution[tricks_won] = freq / num_playouts
+        keys.append(hand)
+        distributions.append(distribution)
+    return np.array(keys, dtype=np.uint64), np.array(distributions, dtype=np.float32)
+
+
+def write_book(
+    directory: str,
+    players: list[int],
+    max_cards: int = BOOK_MAX_CARDS,
+    num_playouts: int = BOOK_PLAYOUTS,
+) -> None:
+    """Generates a table for every number of players, round of at most max_cards cards, seat and trump"""
+    os.makedirs(directory, exist_ok=True)
+    for num_players in players:
+        for hand_size in range(1, max_cards + 1):
+            for seat in range(num_players):
+                for has_trump in (True, False):
+                    name: str = table_name(num_players, hand_size, seat, has_trump)
+                    keys, distributions = generate_table(
+                        num_players, hand_size, seat, has_trump, num_playouts
+                    )
+                    np.save(os.path.join(directory, f"{name}_keys.npy"), keys)
+                    np.save(
+                        os.path.join(directory, f"{name}_distributions.npy"),
+                        distributions,
+                    )
+                    print(f"{name}: {len(keys)} hands")
+
+
+class BidBook:
+    """
+    Distributions of the number of tricks won with every hand in the first rounds, precomputed by write_book.
+    The tables are memory-mapped, so only the pages which get looked up are read
+    """
+
+    def __init__(self, directory: str) -> None:
+        super().__init__()
+        self.directory: str = directory
+        # Keys and distributions by table name, None for the tables which are not in the book
+        self.tables: dict[str, Optional[tuple[np.ndarray, np.ndarray]]] = dict()
+
+    def get_table(self, name: str) -> Optional[tuple[np.ndarray, np.ndarray]]:
+        if name not in self.tables:
+            keys_path: str = os.path.join(self.directory, f"{name}_keys.npy")
+            if os.path.exists(keys_path):
+                self.tables[name] = (
+                    np.load(keys_path, mmap_mode="r"),
+                    np.load(
+                        os.path.join(self.directory, f"{name}_distributions.npy"),
+                        mmap_mode="r",
+                    ),
+                )
+            else:
+                self.tables[name] = None
+        return self.tables[name]
+
+    def distribution(
+        self, hand: int, trump: Suit, num_players: int, seat: int
+    ) -> Optional[np.ndarray]:
+        """
+        :param hand: CardSet mask of the hand
+        :param seat: position of the player in the order of play, starting from 0 for the player who leads
+        :return: probability of winning every number of tricks, None if the hand is not in the book
+        """
+        table: Optional[tuple[np.ndarray, np.ndarray]] = self.get_table(
+            table_name(num_players, hand.bit_count(), seat, trump != Suit.NONE)
+        )
+        if table is None:
+            return None
+        keys, distributions = table
+        key: np.uint64 = np.uint64(canonical_hand(hand, trump))
+        idx: int = int(np.searchsorted(keys, key))
+        if idx == len(keys) or keys[idx] != key:
+            return None
+        return distributions[idx]
+
+    def bid(self, hand: int, trump: Suit, num_players: int, seat: int) -> Optional[int]:
+        """:return: most likely number of tricks won, None if the hand is not in the book"""
+        distribution: Optional[np.ndarray] = self.distribution(
+            hand, trump, num_players, seat
+        )
+        if distribution is None:
+            return None
+        return int(np.argmax(distribution))
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description="Precompute the bid book of MonteCarloPlayer"
+    )
+    parser.add_argument("directory", help="directory to write the tables to")
+    parser.add_argument(
+        "--players", type=int, nargs="+", default=[3, 4, 5, 6], help="numbers of players"
+    )
+    parser.add_argument("--max-cards", type=int, default=BOOK_MAX_CARDS)
+    parser.add_argument("--playouts", type=int, default=BOOK_PLAYOUTS)
+    args = parser.parse_args()
+    write_book(args.directory, args.players, args.max_cards, args.playouts)
+
+
+if __name__ == "__main__":
+    main()
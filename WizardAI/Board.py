@@ -1,4 +1,4 @@
-from typing import Optional
+from typing import Callable, Optional
 
 from WizardGame.Card import Card, Suit
 from WizardGame.PlayerBid import PlayerBid
@@ -27,10 +27,14 @@ class Board:
         self.next_player_lookup: dict[str, str] = next_player_lookup
         self.trump = trump
         self.num_players = len(self.player_scores)
+        # Called with the player and the card every time a card is played
+        self.card_played_listeners: list[Callable[[str, Card], None]] = []
 
     def card_played(self, player: str, card: Card) -> None:
         self.player_played_cards.setdefault(player, []).append(card)
         self.turn = self.next_player_lookup[player]
+        for listener in self.card_played_listeners:
+            listener(player, card)
 
     def trick_won(self, player: str) -> None:
         self.player_tricks_won.setdefault(player, 0)
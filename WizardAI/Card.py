@@ -60,29 +60,63 @@ Suit.all_suits = Suit.values[:-1]
 
 
 class Card:
-    wizard_index = 0
-    jester_index = 0
+    """
+    Immutable playing card. There is exactly one instance per card in the deck: constructing a card
+    returns the interned instance from the card table, so cards compare (and hash) by identity
+    """
+
+    __slots__ = ("card_type", "suit", "wizard_index", "jester_index", "id")
 
-    def __init__(
-        self,
+    card_type: CardType
+    suit: Suit
+    wizard_index: int
+    jester_index: int
+    id: int
+
+    def __new__(
+        cls,
         card_type: CardType,
         suit: Suit,
         wizard_index: int = 0,
         jester_index: int = 0,
-    ) -> None:
-        super().__init__()
-        self.card_type = card_type
-        self.suit = suit
-        self.wizard_index = wizard_index
-        self.jester_index = jester_index
+    ) -> "Card":
+        if card_type != CardType.WIZARD:
+            wizard_index = 0
+        if card_type != CardType.JESTER:
+            jester_index = 0
+        try:
+            return _CARD_LOOKUP[(card_type, suit, wizard_index, jester_index)]
+        except KeyError:
+            raise InvalidCardException(
+                f"Card {card_type}{suit} (wizard_index={wizard_index}, jester_index={jester_index}) "
+                f"is not a valid card!"
+            )
 
-    def __eq__(self, o: object) -> bool:
-        return isinstance(o, Card) and hash(self) == hash(o)
+    @classmethod
+    def _create(
+        cls, card_type: CardType, suit: Suit, wizard_index: int, jester_index: int
+    ) -> "Card":
+        card: Card = object.__new__(cls)
+        object.__setattr__(card, "card_type", card_type)
+        object.__setattr__(card, "suit", suit)
+        object.__setattr__(card, "wizard_index", wizard_index)
+        object.__setattr__(card, "jester_index", jester_index)
+        object.__setattr__(
+            card, "id", Card.index(card_type, suit, jester_index, wizard_index)
+        )
+        return card
+
+    def __setattr__(self, name: str, value: object) -> None:
+        raise AttributeError(f"Card {self} is immutable")
+
+    def __delattr__(self, name: str) -> None:
+        raise AttributeError(f"Card {self} is immutable")
 
     def __hash__(self) -> int:
-        return Card.index(
-            self.card_type, self.suit, self.jester_index, self.wizard_index
-        )
+        return self.id
+
+    def __reduce__(self):
+        return card_from_id, (self.id,)
 
     @staticmethod
     def index(
@@ -119,6 +153,41 @@ class Card:
         return f"{self.card_type}{self.suit}"
 
 
+NUM_CARDS = 60
+NUM_SPECIAL_CARDS = 4
+
+# Canonical deck, in the order build_deck has always returned it
+DECK: tuple[Card, ...] = tuple(
+    [
+        Card._create(CardType(card_type), Suit(suit), 0, 0)
+        for suit in Suit.all_suits
+        for card_type in CardType.numbers
+    ]
+    + [
+        card
+        for i in range(NUM_SPECIAL_CARDS)
+        for card in (
+            Card._create(CardType.WIZARD, Suit.NONE, i, 0),
+            Card._create(CardType.JESTER, Suit.NONE, 0, i),
+        )
+    ]
+)
+
+# Card table indexed by card id. Id 0 is never used by a card, so it can stand for "no card"
+CARDS_BY_ID: tuple[Optional[Card], ...] = tuple(
+    [None] + sorted(DECK, key=lambda deck_card: deck_card.id)
+)
+
+_CARD_LOOKUP: dict[tuple[int, int, int, int], Card] = {
+    (card.card_type, card.suit, card.wizard_index, card.jester_index): card
+    for card in DECK
+}
+
+
+def card_from_id(card_id: int) -> Card:
+    return CARDS_BY_ID[card_id]
+
+
 def card_from_string(card_str: str) -> Card:
     card_str = card_str.upper()
     match card_str:
@@ -168,7 +237,7 @@ def compare_cards(card1: Optional[Card], card2: Optional[Card], trump: Suit) ->
     :param trump: trump suit for the round
     :return: 1 if card1 wins against card2, -1 if card1 loses card2 when card1 is played first
     """
-    if card1 == card2:
+    if card1 is card2:
         return 0
 
     if card1 is None:
@@ -196,39 +265,90 @@ def compare_cards(card1: Optional[Card], card2: Optional[Card], trump: Suit) ->
             return -1
 
 
-def build_deck() -> list[Card]:
-    deck: list[Card] = list(
-        Card(CardType(card_type), Suit(suit))
-        for suit in Suit.all_suits
-        for card_type in CardType.numbers
+# Strength of a card within a trick. The card with the highest strength wins the trick and, as strengths are
+# compared strictly, the first of several wizards or jesters keeps winning
+NO_CARD_STRENGTH = -1
+JESTER_STRENGTH = 0
+OFF_SUIT_STRENGTH = 1
+LEAD_SUIT_STRENGTH = 2
+TRUMP_STRENGTH = LEAD_SUIT_STRENGTH + CardType.THIRTEEN + 1
+WIZARD_STRENGTH = TRUMP_STRENGTH + CardType.THIRTEEN + 1
+
+
+def _card_strength(card: Optional[Card], trump: Suit, lead_suit: Suit) -> int:
+    if card is None:
+        return NO_CARD_STRENGTH
+    if card.card_type == CardType.WIZARD:
+        return WIZARD_STRENGTH
+    if card.card_type == CardType.JESTER:
+        return JESTER_STRENGTH
+    if card.suit == trump:
+        return TRUMP_STRENGTH + card.card_type
+    # Until a number card is played there is no lead suit, and any number card beats the jesters played so far
+    if card.suit == lead_suit or lead_suit == Suit.NONE:
+        return LEAD_SUIT_STRENGTH + card.card_type
+    return OFF_SUIT_STRENGTH
+
+
+# Strength tables indexed by [trump][lead suit][card id]. Suit.NONE is used both for "no trump" and for
+# "no lead suit yet", and card id 0 stands for "no card played yet"
+TRICK_STRENGTHS: tuple[tuple[tuple[int, ...], ...], ...] = tuple(
+    tuple(
+        tuple(_card_strength(card, trump, lead_suit) for card in CARDS_BY_ID)
+        for lead_suit in Suit.values
     )
+    for trump in Suit.values
+)
 
-    for i in range(4):
-        deck.append(Card(CardType.WIZARD, Suit.NONE, wizard_index=i))
-        deck.append(Card(CardType.JESTER, Suit.NONE, jester_index=i))
 
-    return deck
+def trick_strengths(trump: Suit, suit_to_follow: Optional[Suit]) -> tuple[int, ...]:
+    """
+    :param trump: trump suit for the round
+    :param suit_to_follow: suit to follow in the trick, None/Suit.NONE if it has not been set yet
+    :return: strength of every card, indexed by card id
+    """
+    return TRICK_STRENGTHS[trump][Suit.NONE if suit_to_follow is None else suit_to_follow]
 
 
-def build_shuffled_deck() -> list[Card]:
-    deck: list[Card] = build_deck()
+def wins_trick(
+    card: Card,
+    winning_card: Optional[Card],
+    trump: Suit,
+    suit_to_follow: Optional[Suit],
+) -> bool:
+    """:return: True if card beats the card currently winning the trick, equivalent to compare_cards(...) < 0"""
+    strengths: tuple[int, ...] = trick_strengths(trump, suit_to_follow)
+    return strengths[card.id] > strengths[0 if winning_card is None else winning_card.id]
 
-    random.shuffle(deck)
 
-    return deck
+def trick_winner(cards: list[Card], trump: Suit) -> int:
+    """
+    :param cards: cards of a trick, in the order they were played
+    :param trump: trump suit for the round
+    :return: position of the winning card within cards
+    """
+    lead_suit: Suit = Suit.NONE
+    for card in cards:
+        if card.card_type == CardType.WIZARD:
+            break
+        if card.card_type != CardType.JESTER:
+            lead_suit = card.suit
+            break
 
+    strengths: tuple[int, ...] = TRICK_STRENGTHS[trump][lead_suit]
+    return max(range(len(cards)), key=lambda i: strengths[cards[i].id])
 
-def playable_cards(hand: list[Card], suit_to_follow: Optional[Suit]) -> list[Card]:
-    cards: set[Card] = set(
-        card
-        for card in hand
-        if card.suit == suit_to_follow and suit_to_follow != Suit.NONE
-    )
 
-    if len(cards) == 0:
-        return list(hand)
-    else:
-        return list(cards.union({card for card in hand if card.suit == Suit.NONE}))
+def build_deck() -> list[Card]:
+    return list(DECK)
+
+
+def build_shuffled_deck(rng: random.Random = random) -> list[Card]:
+    deck: list[Card] = build_deck()
+
+    rng.shuffle(deck)
+
+    return deck
 
 
 class InvalidSuitException(Exception):
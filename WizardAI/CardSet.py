@@ -0,0 +1,138 @@
+from typing import Iterable, Iterator, Optional
+
+from WizardAI.Card import Card, CardType, Suit, CARDS_BY_ID, DECK
+
+# Bit (id - 1) of a mask is set when the card with that id is in the set. Cards of the same suit are adjacent,
+# ordered by rank, so the lowest set bit of a suit is always its lowest card
+CARD_MASKS: tuple[int, ...] = tuple(
+    [0] + [1 << (card.id - 1) for card in CARDS_BY_ID[1:]]
+)
+
+FULL_DECK_MASK: int = (1 << len(DECK)) - 1
+
+WIZARD_MASK: int = sum(
+    CARD_MASKS[card.id] for card in DECK if card.card_type == CardType.WIZARD
+)
+JESTER_MASK: int = sum(
+    CARD_MASKS[card.id] for card in DECK if card.card_type == CardType.JESTER
+)
+
+# Indexed by suit. Suit.NONE holds the wizards and jesters
+SUIT_MASKS: tuple[int, ...] = tuple(
+    sum(CARD_MASKS[card.id] for card in DECK if card.suit == suit)
+    for suit in Suit.values
+)
+SPECIAL_MASK: int = SUIT_MASKS[Suit.NONE]
+
+
+def mask_of(cards: Iterable[Card]) -> int:
+    mask: int = 0
+    for card in cards:
+        mask |= CARD_MASKS[card.id]
+    return mask
+
+
+def lowest_card(mask: int) -> Card:
+    """:return: card with the lowest id in a non-empty mask"""
+    return CARDS_BY_ID[(mask & -mask).bit_length()]
+
+
+def cards_in(mask: int) -> list[Card]:
+    """:return: cards in the mask, ordered by id"""
+    cards: list[Card] = []
+    while mask:
+        low: int = mask & -mask
+        cards.append(CARDS_BY_ID[low.bit_length()])
+        mask ^= low
+    return cards
+
+
+def playable_mask(hand: int, suit_to_follow: Optional[Suit]) -> int:
+    """
+    :param hand: mask of the cards in the hand
+    :param suit_to_follow: suit which has to be followed in the trick, if any
+    :return: mask of the cards in the hand which can be played
+    """
+    if suit_to_follow is None:
+        return hand
+
+    following_cards: int = hand & SUIT_MASKS[suit_to_follow]
+    if following_cards == 0 or suit_to_follow == Suit.NONE:
+        return hand
+
+    return following_cards | (hand & SPECIAL_MASK)
+
+
+class CardSet:
+    """Set of cards backed by a 60 bit integer mask"""
+
+    __slots__ = ("mask",)
+
+    def __init__(self, cards: Iterable[Card] = ()) -> None:
+        super().__init__()
+        self.mask: int = cards.mask if isinstance(cards, CardSet) else mask_of(cards)
+
+    @staticmethod
+    def from_mask(mask: int) -> "CardSet":
+        card_set: CardSet = CardSet()
+        card_set.mask = mask
+        return card_set
+
+    def add(self, card: Card) -> None:
+        self.mask |= CARD_MASKS[card.id]
+
+    def remove(self, card: Card) -> None:
+        card_mask: int = CARD_MASKS[card.id]
+        if not self.mask & card_mask:
+            raise KeyError(card)
+        self.mask ^= card_mask
+
+    def discard(self, card: Card) -> None:
+        self.mask &= ~CARD_MASKS[card.id]
+
+    def copy(self) -> "CardSet":
+        return CardSet.from_mask(self.mask)
+
+    def of_suit(self, suit: Suit) -> "CardSet":
+        return CardSet.from_mask(self.mask & SUIT_MASKS[suit])
+
+    def __contains__(self, card: object) -> bool:
+        return isinstance(card, Card) and bool(self.mask & CARD_MASKS[card.id])
+
+    def __len__(self) -> int:
+        return self.mask.bit_count()
+
+    def __bool__(self) -> bool:
+        return self.mask != 0
+
+    def __iter__(self) -> Iterator[Card]:
+        mask: int = self.mask
+        while mask:
+            low: int = mask & -mask
+            yield CARDS_BY_ID[low.bit_length()]
+            mask ^= low
+
+    def __or__(self, other: "CardSet") -> "CardSet":
+        return CardSet.from_mask(self.mask | other.mask)
+
+    def __and__(self, other: "CardSet") -> "CardSet":
+        return CardSet.from_mask(self.mask & other.mask)
+
+    def __sub__(self, other: "CardSet") -> "CardSet":
+        return CardSet.from_mask(self.mask & ~other.mask)
+
+    def __eq__(self, o: object) -> bool:
+        return isinstance(o, CardSet) and self.mask == o.mask
+
+    # Sets are mutable, so they can't be hashed. Use the mask as the key instead
+    __hash__ = None
+
+    def __str__(self) -> str:
+        return str(cards_in(self.mask))
+
+    def __repr__(self) -> str:
+        return f"CardSet({cards_in(self.mask)})"
+
+
+def playable_cards(hand: CardSet, suit_to_follow: Optional[Suit]) -> CardSet:
+    return CardSet.from_mask(playable_mask(hand.mask, suit_to_follow))
@@ -0,0 +1,179 @@
+import math
+import random
+from typing import Iterable, Optional
+
+from WizardAI.Card import Suit
+from WizardAI.CardSet import CARD_MASKS, SUIT_MASKS, cards_in
+
+
+def compositions(total: int, bounds: tuple[int, ...]) -> list[tuple[int, ...]]:
+    """:return: every way of writing total as a sum of len(bounds) terms, each between 0 and its bound"""
+    if not bounds:
+        return [()] if total == 0 else []
+    result: list[tuple[int, ...]] = []
+    rest_bound: int = sum(bounds[1:])
+    for first in range(max(0, total - rest_bound), min(total, bounds[0]) + 1):
+        for rest in compositions(total - first, bounds[1:]):
+            result.append((first,) + rest)
+    return result
+
+
+class DealSampler:
+    """
+    Samples the hands of the other players uniformly among the deals which are consistent with what is known:
+    the unseen cards, the size of every hand and the suits every player is known to be missing.
+
+    The unseen cards are grouped into classes of cards which the same constrained players can hold (each suit,
+    and the wizards and jesters, which anyone can hold, end up in one of them). For every constrained player
+    in turn, the number of cards it gets from each class is drawn with probability proportional to the number
+    of consistent deals which follow from it, and the cards are then dealt from shuffled classes. Players
+    without known voids and the undealt cards share whatever is left, which they can split in the same number
+    of ways whatever its composition
+    """
+
+    def __init__(
+        self,
+        pool: int,
+        hand_sizes: list[int],
+        missing_suits: Optional[list[Iterable[Suit]]] = None,
+    ) -> None:
+        """
+        :param pool: CardSet mask of the cards which might be in the hands
+        :param hand_sizes: size of every hand
+        :param missing_suits: suits every player is known not to have, in the same order as hand_sizes
+        """
+        super().__init__()
+        missing_suits = (
+            [()] * len(hand_sizes) if missing_suits is None else missing_suits
+        )
+        self.hand_sizes: list[int] = hand_sizes
+        self.pool_size: int = pool.bit_count()
+        if sum(hand_sizes) > self.pool_size:
+            raise ValueError(
+                f"cannot deal {sum(hand_sizes)} cards from {self.pool_size} unseen cards"
+            )
+
+        voids: list[frozenset[Suit]] = [frozenset(suits) for suits in missing_suits]
+        self.constrained_players: list[int] = [
+            player for player, suits in enumerate(voids) if suits
+        ]
+        self.free_players: list[int] = [
+            player for player, suits in enumerate(voids) if not suits
+        ]
+
+        # Group the cards by which constrained players can hold them
+        class_masks: dict[tuple[bool, ...], int] = dict()
+        for suit in Suit.values:
+            holders: tuple[bool, ...] = tuple(
+                suit not in voids[player] for player in self.constrained_players
+            )
+            class_masks[holders] = class_masks.get(holders, 0) | (pool & SUIT_MASKS[suit])
+        self.class_holders: list[tuple[bool, ...]] = list(class_masks)
+        self.class_cards: list[list[int]] = [
+            [card.id for card in cards_in(mask)] for mask in class_masks.values()
+        ]
+        class_sizes: tuple[int, ...] = tuple(len(cards) for cards in self.class_cards)
+
+        # Number of ways of dealing the constrained players from position i on, by class sizes left
+        self.ways: list[dict[tuple[int, ...], int]] = [
+            dict() for player in self.constrained_players
+        ] + [dict()]
+        # Choices of the number of cards from each class for a constrained player, with cumulative weights
+        self.choices: list[dict[tuple[int, ...], tuple[list[tuple[int, ...]], list[int]]]] = [
+            dict() for player in self.constrained_players
+        ]
+        self.num_constrained_deals: int = self.count_ways(0, class_sizes)
+        self.class_sizes: tuple[int, ...] = class_sizes
+
+    @property
+    def num_deals(self) -> int:
+        """Number of consistent deals, counting every way of splitting the free cards and the undealt ones"""
+        free_cards: int = self.pool_size - sum(
+            self.hand_sizes[player] for player in self.constrained_players
+        )
+        ways_to_split: int = math.factorial(free_cards)
+        for player in self.free_players:
+            ways_to_split //= math.factorial(self.hand_sizes[player])
+        return (
+            self.num_constrained_deals
+            * ways_to_split
+            // math.factorial(self.pool_size - sum(self.hand_sizes))
+        )
+
+    def count_ways(self, i: int, sizes_left: tuple[int, ...]) -> int:
+        """:return: number of ways of dealing constrained players i onwards from classes of the given sizes"""
+        if i == len(self.constrained_players):
+            return 1
+        if sizes_left in self.ways[i]:
+            return self.ways[i][sizes_left]
+
+        holders: list[bool] = [holders[i] for holders in self.class_holders]
+        bounds: tuple[int, ...] = tuple(
+            size if can_hold else 0 for size, can_hold in zip(sizes_left, holders)
+        )
+        options: list[tuple[int, ...]] = []
+        cumulative_weights: list[int] = []
+        total: int = 0
+        for option in compositions(self.hand_sizes[self.constrained_players[i]], bounds):
+            weight: int = self.count_ways(
+                i + 1, tuple(size - taken for size, taken in zip(sizes_left, option))
+            )
+            if weight == 0:
+                continue
+            for size, taken in zip(sizes_left, option):
+                weight *= math.comb(size, taken)
+            total += weight
+            options.append(option)
+            cumulative_weights.append(total)
+
+        self.ways[i][sizes_left] = total
+        self.choices[i][sizes_left] = (options, cumulative_weights)
+        return total
+
+    def sample(self, rng: random.Random = random) -> list[int]:
+        """:return: CardSet mask of every hand, in the same order as hand_sizes"""
+        if self.num_constrained_deals == 0:
+            raise ValueError("no deal is consistent with the known missing suits")
+
+        # Number of cards each constrained player gets from each class
+        sizes_left: tuple[int, ...] = self.class_sizes
+        taken_by_player: list[tuple[int, ...]] = []
+        for i in range(len(self.constrained_players)):
+            options, cumulative_weights = self.choices[i][sizes_left]
+            pick: int = rng.randrange(cumulative_weights[-1])
+            lo: int = 0
+            hi: int = len(cumulative_weights) - 1
+            while lo < hi:
+                mid: int = (lo + hi) // 2
+                if cumulative_weights[mid] > pick:
+                    hi = mid
+                else:
+                    lo = mid + 1
+            taken_by_player.append(options[lo])
+            sizes_left = tuple(
+                size - taken for size, taken in zip(sizes_left, options[lo])
+            )
+
+        hands: list[int] = [0] * len(self.hand_sizes)
+        free_cards: list[int] = []
+        for class_idx, cards in enumerate(self.class_cards):
+            cards = rng.sample(cards, len(cards))
+            start_idx: int = 0
+            for i, player in enumerate(self.constrained_players):
+                end_idx: int = start_idx + taken_by_player[i][class_idx]
+                for card_id in cards[start_idx:end_idx]:
+                    hands[player] |= CARD_MASKS[card_id]
+                start_idx = end_idx
+            free_cards.extend(cards[start_idx:])
+
+        free_cards = rng.sample(
+            free_cards,
+            sum(self.hand_sizes[player] for player in self.free_players),
+        )
+        start_idx = 0
+        for player in self.free_players:
+            end_idx = start_idx + self.hand_sizes[player]
+            for card_id in free_cards[start_idx:end_idx]:
+                hands[player] |= CARD_MASKS[card_id]
+            start_idx = end_idx
+        return hands
@@ -0,0 +1,95 @@
+from typing import Optional
+
+import numpy as np
+
+from WizardAI.Card import DECK
+from WizardAI.CardSet import CARD_MASKS, cards_in
+
+DECK_IDS: np.ndarray = np.array([card.id for card in DECK], dtype=np.int8)
+# Indexed by card id, like CARD_MASKS
+ID_MASKS: np.ndarray = np.array(CARD_MASKS, dtype=np.uint64)
+
+
+def pool_from_mask(mask: int) -> np.ndarray:
+    """:return: ids of the cards in the mask"""
+    return np.array([card.id for card in cards_in(mask)], dtype=np.int8)
+
+
+def shuffled_decks(
+    num_deals: int,
+    pool: np.ndarray = DECK_IDS,
+    rng: Optional[np.random.Generator] = None,
+) -> np.ndarray:
+    """
+    Fully shuffles the pool once per deal by sorting random keys
+
+    :param num_deals: number of shuffled decks to generate
+    :param pool: ids of the cards to shuffle, the full deck by default
+    :param rng: random generator to draw from
+    :return: array of shape (num_deals, len(pool)) with one shuffled deck per row
+    """
+    rng = np.random.default_rng() if rng is None else rng
+    keys: np.ndarray = rng.random((num_deals, len(pool)))
+    return pool[np.argsort(keys, axis=1)]
+
+
+def partial_shuffles(
+    num_deals: int,
+    num_cards: int,
+    pool: np.ndarray = DECK_IDS,
+    rng: Optional[np.random.Generator] = None,
+) -> np.ndarray:
+    """
+    Draws num_cards cards without replacement from the pool once per deal, running the first num_cards steps
+    of a Fisher-Yates shuffle on all the deals at once
+
+    :return: array of shape (num_deals, num_cards) with the cards drawn for each deal, in random order
+    """
+    rng = np.random.default_rng() if rng is None else rng
+    pool_size: int = len(pool)
+    assert num_cards <= pool_size, f"cannot draw {num_cards} cards from {pool_size}"
+
+    # Sorting random keys is cheaper once most of the pool has to be shuffled anyway
+    if 2 * num_cards > pool_size:
+        return shuffled_decks(num_deals, pool, rng)[:, :num_cards]
+
+    decks: np.ndarray = np.tile(pool, (num_deals, 1))
+    rows: np.ndarray = np.arange(num_deals)
+    for i in range(num_cards):
+        swap_idxs: np.ndarray = rng.integers(i, pool_size, size=num_deals)
+        drawn_cards: np.ndarray = decks[rows, swap_idxs]
+        decks[rows, swap_idxs] = decks[:, i]
+        decks[:, i] = drawn_cards
+
+    return decks[:, :num_cards]
+
+
+def deal_from_pool(
+    num_deals: int,
+    hand_sizes: list[int],
+    pool: np.ndarray = DECK_IDS,
+    rng: Optional[np.random.Generator] = None,
+) -> np.ndarray:
+    """
+    Deals hands of the given sizes from a pool of unseen cards
+
+    :return: array of shape (num_deals, sum(hand_sizes)). Hand i of a deal is made up of the
+             hand_sizes[i] consecutive cards after the cards of the previous hands
+    """
+    return partial_shuffles(num_deals, sum(hand_sizes), pool, rng)
+
+
+def hand_masks(deals: np.ndarray, hand_sizes: list[int]) -> np.ndarray:
+    """
+    :param deals: deals as returned by deal_from_pool
+    :param hand_sizes: sizes of the hands in each deal
+    :return: array of shape (num_deals, len(hand_sizes)) with the CardSet mask of every hand
+    """
+    masks: np.ndarray = np.zeros((len(deals), len(hand_sizes)), dtype=np.uint64)
+    start_idx: int = 0
+    for i, hand_size in enumerate(hand_sizes):
+        masks[:, i] = np.bitwise_or.reduce(
+            ID_MASKS[deals[:, start_idx : start_idx + hand_size]], axis=1
+        )
+        start_idx += hand_size
+    return masks
@@ -0,0 +1,412 @@
+import random
+from typing import Optional
+
+from WizardAI.Card import Suit, TRICK_STRENGTHS
+from WizardAI.CardSet import CARD_MASKS, JESTER_MASK, SUIT_MASKS, WIZARD_MASK, playable_mask
+from WizardAI.PlayoutEngine import CARD_SUITS, IS_WIZARD, NO_CARD, NO_PLAYER
+
+MAX_PLAYERS = 6
+# The table gets cleared once it grows past this number of positions, which takes about 10MB
+DEFAULT_MAX_TABLE_SIZE = 1 << 16
+
+_zobrist_rng: random.Random = random.Random(0)
+# Indexed by [seat][card id]: key of the card being in the hand of the player at that seat
+ZOBRIST_CARD_KEYS: tuple[tuple[int, ...], ...] = tuple(
+    tuple(_zobrist_rng.getrandbits(64) for card_id in range(len(CARD_MASKS)))
+    for seat in range(MAX_PLAYERS)
+)
+# Indexed by seat: key of the player at that seat leading the next trick
+ZOBRIST_LEADER_KEYS: tuple[int, ...] = tuple(
+    _zobrist_rng.getrandbits(64) for seat in range(MAX_PLAYERS)
+)
+# Indexed by number of tricks: key of the number of tricks still needed to make the bid
+ZOBRIST_NEEDED_KEYS: tuple[int, ...] = tuple(
+    _zobrist_rng.getrandbits(64) for tricks in range(len(CARD_MASKS))
+)
+
+
+def hands_key(hands: list[int]) -> int:
+    """:return: Zobrist key of the cards in every hand, indexed by seat"""
+    key: int = 0
+    for seat, hand in enumerate(hands):
+        card_keys: tuple[int, ...] = ZOBRIST_CARD_KEYS[seat]
+        while hand:
+            card_mask: int = hand & -hand
+            key ^= card_keys[card_mask.bit_length()]
+            hand ^= card_mask
+    return key
+
+
+class DoubleDummySolver:
+    """
+    Exact trick evaluation of deals where every hand is known. The solver is paranoid: the other players are
+    assumed to play together against the player at player_seat. Positions at the start of every trick are
+    stored in a transposition table under their Zobrist key, so the table can be shared by any number of
+    deals with the same trump and number of players
+    """
+
+    def __init__(
+        self,
+        num_players: int,
+        trump: Suit,
+        player_seat: int = 0,
+        max_table_size: int = DEFAULT_MAX_TABLE_SIZE,
+    ) -> None:
+        """
+        :param max_table_size: number of positions the transposition table holds before it gets cleared. A
+                               simulator keeps a solver for every trump, in every worker process
+        """
+        super().__init__()
+        assert num_players <= MAX_PLAYERS, f"at most {MAX_PLAYERS} players"
+        self.num_players: int = num_players
+        self.trump: Suit = trump
+        self.player_seat: int = player_seat
+        self.max_table_size: int = max_table_size
+        self.strength_tables: tuple[tuple[int, ...], ...] = TRICK_STRENGTHS[trump]
+        # Lower and upper bound on the tricks the player can still win, by position
+        self.trick_bounds: dict[int, tuple[int, int]] = dict()
+        # Whether the player can win exactly the tricks needed, by position and tricks needed
+        self.bid_results: dict[int, bool] = dict()
+        # Zobrist key of the hands of the position being searched
+        self.key: int = 0
+
+    def max_tricks(
+        self,
+        hands: list[int],
+        current_seat: int,
+        winner_seat: int = NO_PLAYER,
+        winning_card_id: int = NO_CARD,
+        suit_to_follow: Optional[Suit] = None,
+        trick_size: int = 0,
+    ) -> int:
+        """
+        :param hands: CardSet mask of every player's hand, indexed by seat. Restored before returning
+        :param current_seat: seat of the next player to play
+        :param winner_seat: seat of the player currently winning the trick, NO_PLAYER if nobody has played
+        :param winning_card_id: id of the card currently winning the trick, NO_CARD if nobody has played
+        :param suit_to_follow: suit to follow in the trick
+        :param trick_size: number of cards played in the current trick
+        :return: number of tricks the player is guaranteed to win from the position, whatever the others play
+        """
+        self.prepare(hands)
+        return self.search_tricks(
+            hands,
+            current_seat,
+            winner_seat,
+            winning_card_id,
+            suit_to_follow,
+            trick_size,
+            -1,
+            len(CARD_MASKS),
+        )
+
+    def can_make_bid(
+        self,
+        hands: list[int],
+        current_seat: int,
+        tricks_needed: int,
+        winner_seat: int = NO_PLAYER,
+        winning_card_id: int = NO_CARD,
+        suit_to_follow: Optional[Suit] = None,
+        trick_size: int = 0,
+    ) -> bool:
+        """
+        Same parameters as max_tricks
+
+        :param tricks_needed: number of tricks the player has to win from the position to make its bid
+        :return: True if the player can win exactly tricks_needed tricks, whatever the others play
+        """
+        self.prepare(hands)
+        return self.search_bid(
+            hands,
+            current_seat,
+            winner_seat,
+            winning_card_id,
+            suit_to_follow,
+            trick_size,
+            tricks_needed,
+        )
+
+    def prepare(self, hands: list[int]) -> None:
+        if len(self.trick_bounds) + len(self.bid_results) > self.max_table_size:
+            self.trick_bounds.clear()
+            self.bid_results.clear()
+        self.key = hands_key(hands)
+
+    def ordered_moves(
+        self,
+        hands: list[int],
+        seat: int,
+        winner_seat: int,
+        winning_card_id: int,
+        suit_to_follow: Optional[Suit],
+    ) -> list[int]:
+        """
+        :return: ids of the cards worth trying from the position, most promising first. Of the cards of a hand
+                 which are equivalent, because no other card left in play ranks between them, only the lowest
+                 one is returned
+        """
+        hand: int = hands[seat]
+        playable: int = playable_mask(hand, suit_to_follow)
+        cards_left: int = CARD_MASKS[winning_card_id]
+        for other_hand in hands:
+            cards_left |= other_hand
+
+        card_ids: list[int] = []
+        for special_cards in (playable & JESTER_MASK, playable & WIZARD_MASK):
+            if special_cards:
+                card_ids.append((special_cards & -special_cards).bit_length())
+        number_cards: int = playable & ~(JESTER_MASK | WIZARD_MASK)
+        while number_cards:
+            card_mask: int = number_cards & -number_cards
+            number_cards ^= card_mask
+            card_id: int = card_mask.bit_length()
+            lower_cards: int = cards_left & SUIT_MASKS[CARD_SUITS[card_id]] & (card_mask - 1)
+            if lower_cards == 0 or not hand & (1 << (lower_cards.bit_length() - 1)):
+                card_ids.append(card_id)
+
+        strengths: tuple[int, ...] = self.strength_tables[
+            Suit.NONE if suit_to_follow is None else suit_to_follow
+        ]
+        # The player tries to win the trick, the others to take it from the player, or failing that to keep
+        # their strong cards
+        dump_cards: bool = (
+            seat != self.player_seat
+            and winner_seat != NO_PLAYER
+            and winner_seat != self.player_seat
+        )
+        card_ids.sort(key=lambda card_id: strengths[card_id], reverse=not dump_cards)
+        return card_ids
+
+    def play_card(
+        self,
+        hands: list[int],
+        seat: int,
+        card_id: int,
+        winner_seat: int,
+        winning_card_id: int,
+        suit_to_follow: Optional[Suit],
+    ) -> tuple[int, int, Optional[Suit]]:
+        """
+        Removes the card from the player's hand
+
+        :return: new winner seat, winning card id and suit to follow of the trick
+        """
+        hands[seat] ^= CARD_MASKS[card_id]
+        self.key ^= ZOBRIST_CARD_KEYS[seat][card_id]
+        strengths: tuple[int, ...] = self.strength_tables[
+            Suit.NONE if suit_to_follow is None else suit_to_follow
+        ]
+        if strengths[card_id] > strengths[winning_card_id]:
+            # Equivalent to get_new_suit_to_follow
+            if IS_WIZARD[card_id]:
+                if suit_to_follow == Suit.NONE:
+                    suit_to_follow = None
+            elif (
+                suit_to_follow is None and winning_card_id == NO_CARD
+            ) or suit_to_follow == Suit.NONE:
+                suit_to_follow = CARD_SUITS[card_id]
+            return seat, card_id, suit_to_follow
+        return winner_seat, winning_card_id, suit_to_follow
+
+    def undo_card(self, hands: list[int], seat: int, card_id: int) -> None:
+        hands[seat] ^= CARD_MASKS[card_id]
+        self.key ^= ZOBRIST_CARD_KEYS[seat][card_id]
+
+    def search_tricks(
+        self,
+        hands: list[int],
+        seat: int,
+        winner_seat: int,
+        winning_card_id: int,
+        suit_to_follow: Optional[Suit],
+        trick_size: int,
+        alpha: int,
+        beta: int,
+    ) -> int:
+        """Alpha-beta search for max_tricks, exact if the result is strictly between alpha and beta"""
+        if trick_size == self.num_players:
+            trick_won: int = 1 if winner_seat == self.player_seat else 0
+            if hands[winner_seat] == 0:
+                return trick_won
+            return trick_won + self.search_trick_start(
+                hands, winner_seat, alpha - trick_won, beta - trick_won
+            )
+        if trick_size == 0:
+            return self.search_trick_start(hands, seat, alpha, beta)
+        return self.search_moves(
+            hands, seat, winner_seat, winning_card_id, suit_to_follow, trick_size, alpha, beta
+        )
+
+    def search_trick_start(
+        self, hands: list[int], leader: int, alpha: int, beta: int
+    ) -> int:
+        key: int = self.key ^ ZOBRIST_LEADER_KEYS[leader]
+        lower, upper = self.trick_bounds.get(key, (0, hands[leader].bit_count()))
+        if lower >= beta or lower == upper:
+            return lower
+        if upper <= alpha:
+            return upper
+
+        value: int = self.search_moves(
+            hands, leader, NO_PLAYER, NO_CARD, None, 0, alpha, beta
+        )
+        if value <= alpha:
+            upper = min(upper, value)
+        elif value >= beta:
+            lower = max(lower, value)
+        else:
+            lower = upper = value
+        self.trick_bounds[key] = (lower, upper)
+        return value
+
+    def search_moves(
+        self,
+        hands: list[int],
+        seat: int,
+        winner_seat: int,
+        winning_card_id: int,
+        suit_to_follow: Optional[Suit],
+        trick_size: int,
+        alpha: int,
+        beta: int,
+    ) -> int:
+        maximizing: bool = seat == self.player_seat
+        best_value: int = -1 if maximizing else len(CARD_MASKS)
+        next_seat: int = (seat + 1) % self.num_players
+        for card_id in self.ordered_moves(
+            hands, seat, winner_seat, winning_card_id, suit_to_follow
+        ):
+            value: int = self.search_tricks(
+                hands,
+                next_seat,
+                *self.play_card(
+                    hands, seat, card_id, winner_seat, winning_card_id, suit_to_follow
+                ),
+                trick_size + 1,
+                alpha,
+                beta,
+            )
+            self.undo_card(hands, seat, card_id)
+            if maximizing:
+                best_value = max(best_value, value)
+                alpha = max(alpha, best_value)
+            else:
+                best_value = min(best_value, value)
+                beta = min(beta, best_value)
+            if alpha >= beta:
+                break
+        return best_value
+
+    def search_bid(
+        self,
+        hands: list[int],
+        seat: int,
+        winner_seat: int,
+        winning_card_id: int,
+        suit_to_follow: Optional[Suit],
+        trick_size: int,
+        tricks_needed: int,
+    ) -> bool:
+        if trick_size == self.num_players:
+            if winner_seat == self.player_seat:
+                tricks_needed -= 1
+            seat = winner_seat
+            winner_seat = NO_PLAYER
+            winning_card_id = NO_CARD
+            suit_to_follow = None
+            trick_size = 0
+
+        if trick_size == 0:
+            tricks_left: int = hands[seat].bit_count()
+            if tricks_needed < 0 or tricks_needed > tricks_left:
+                return False
+            if tricks_left == 0:
+                return True
+
+            key: int = (
+                self.key ^ ZOBRIST_LEADER_KEYS[seat] ^ ZOBRIST_NEEDED_KEYS[tricks_needed]
+            )
+            result: Optional[bool] = self.bid_results.get(key)
+            if result is None:
+                result = self.search_bid_moves(
+                    hands, seat, NO_PLAYER, NO_CARD, None, 0, tricks_needed
+                )
+                self.bid_results[key] = result
+            return result
+
+        return self.search_bid_moves(
+            hands, seat, winner_seat, winning_card_id, suit_to_follow, trick_size, tricks_needed
+        )
+
+    def search_bid_moves(
+        self,
+        hands: list[int],
+        seat: int,
+        winner_seat: int,
+        winning_card_id: int,
+        suit_to_follow: Optional[Suit],
+        trick_size: int,
+        tricks_needed: int,
+    ) -> bool:
+        # The player needs one card which makes the bid, the others one which breaks it
+        maximizing: bool = seat == self.player_seat
+        next_seat: int = (seat + 1) % self.num_players
+        for card_id in self.ordered_moves(
+            hands, seat, winner_seat, winning_card_id, suit_to_follow
+        ):
+            result: bool = self.search_bid(
+                hands,
+                next_seat,
+                *self.play_card(
+                    hands, seat, card_id, winner_seat, winning_card_id, suit_to_follow
+                ),
+                trick_size + 1,
+                tricks_needed,
+            )
+            self.undo_card(hands, seat, card_id)
+            if result == maximizing:
+                return result
+        return not maximizing
+
+
+def max_tricks(
+    trump: Suit,
+    hands: list[int],
+    player_seat: int,
+    current_seat: int,
+    winner_seat: int = NO_PLAYER,
+    winning_card_id: int = NO_CARD,
+    suit_to_follow: Optional[Suit] = None,
+    trick_size: int = 0,
+) -> int:
+    """:return: number of tricks the player at player_seat can win, see DoubleDummySolver.max_tricks"""
+    return DoubleDummySolver(len(hands), trump, player_seat).max_tricks(
+        hands, current_seat, winner_seat, winning_card_id, suit_to_follow, trick_size
+    )
+
+
+def can_make_bid(
+    trump: Suit,
+    hands: list[int],
+    player_seat: int,
+    current_seat: int,
+    tricks_needed: int,
+    winner_seat: int = NO_PLAYER,
+    winning_card_id: int = NO_CARD,
+    suit_to_follow: Optional[Suit] = None,
+    trick_size: int = 0,
+) -> bool:
+    """
+    :return: True if the player at player_seat can win exactly tricks_needed more tricks, see
+             DoubleDummySolver.can_make_bid
+    """
+    return DoubleDummySolver(len(hands), trump, player_seat).can_make_bid(
+        hands,
+        current_seat,
+        tricks_needed,
+        winner_seat,
+        winning_card_id,
+        suit_to_follow,
+        trick_size,
+    )
@@ -1,18 +1,26 @@
-import random
 from typing import Optional
 
 from WizardAI.Card import build_shuffled_deck
 from WizardAI.Board import Board
 from WizardAI.Card import Card, CardType, Suit
 from WizardAI.Player import Player
+from WizardAI.Rng import Rng
 from WizardAI.Trick import Trick
 
 CARDS_IN_DECK = 60
 
 
 class Game:
-    def __init__(self, players: list[Player]) -> None:
+    def __init__(self, players: list[Player], seed: Optional[int] = None) -> None:
+        """
+        :param seed: root seed of the game. If given, the players get their random streams split from it
+                     too, so that the whole game can be replayed from it
+        """
         super().__init__()
+        self.rng: Rng = Rng(seed)
+        if seed is not None:
+            for player, player_rng in zip(players, self.rng.spawn(len(players))):
+                player.rng = player_rng
         assert len(players) > 2, "Cannot play Wizard with less than 2 people"
         self.board: Optional[Board] = None
         self.players: dict[str, Player] = {player.name: player for player in players}
@@ -22,11 +30,13 @@ class Game:
             player.name: players[(i + 1) % len(players)].name
             for i, player in enumerate(players)
         }
+        for player in players:
+            player.join_game(self.next_player_lookup)
         self.tricks: list[Trick] = list()
 
     def play_round(self, num_cards: int) -> None:
         # shuffle
-        deck: list[Card] = build_shuffled_deck()
+        deck: list[Card] = build_shuffled_deck(self.rng.random)
         first_player = self.next_player_lookup[self.dealer]
 
         print(f"Dealer = {self.dealer}, First player = {first_player}")
@@ -6,12 +6,13 @@ from WizardAI.Card import (
     suit_from_string,
     InvalidSuitException,
 )
+from WizardAI.CardSet import CardSet
 from WizardAI.Player import Player
 from WizardAI.Trick import Trick
 
 
 class HumanPlayer(Player):
-    def select_card(self, trick: Trick, cards_to_play: list[Card]) -> Card:
+    def select_card(self, trick: Trick, cards_to_play: CardSet) -> Card:
         while True:
             print(
                 f"Player {self.name} hand: {self.hand}, playable cards: {cards_to_play}"
@@ -0,0 +1,341 @@
+import math
+from array import array
+from typing import Optional
+
+from WizardAI.Board import Board
+from WizardAI.Card import Card, Suit, CARDS_BY_ID, TRICK_STRENGTHS
+from WizardAI.CardSet import CardSet, CARD_MASKS, playable_mask
+from WizardAI.MonteCarloPlayer import MonteCarloPlayer, MonteCarloSimulator
+from WizardAI.PlayoutEngine import CARD_SUITS, IS_WIZARD, NO_CARD, NO_PLAYER
+from WizardAI.Rng import Rng
+from WizardAI.SimulatorPool import SimulatorPool
+from WizardAI.Trick import Trick
+
+DEFAULT_MAX_NODES = 200000
+EXPLORATION = 0.7
+
+NO_NODE = -1
+ROOT = 0
+
+
+class SearchTree:
+    """
+    Search tree stored in preallocated arrays, so that its memory use is fixed by max_nodes. The children of a
+    node are kept in a linked list, and every node records the card played to reach it and the seat of the
+    player who played it
+    """
+
+    def __init__(self, max_nodes: int = DEFAULT_MAX_NODES) -> None:
+        super().__init__()
+        self.max_nodes: int = max_nodes
+        self.move: array = array("b", bytes(max_nodes))
+        self.seat: array = array("b", bytes(max_nodes))
+        self.first_child: array = array("i", [NO_NODE]) * max_nodes
+        self.next_sibling: array = array("i", [NO_NODE]) * max_nodes
+        self.visits: array = array("i", [0]) * max_nodes
+        # Number of times the node's move was playable when its parent was visited
+        self.availability: array = array("i", [0]) * max_nodes
+        self.reward: array = array("d", [0.0]) * max_nodes
+        self.size: int = 0
+        self.reset()
+
+    def reset(self) -> None:
+        """Removes every node but a fresh root"""
+        self.size = 0
+        self.add_node(NO_CARD, NO_PLAYER)
+
+    def add_node(self, move: int, seat: int) -> int:
+        """:return: index of the new node, NO_NODE if the tree is full"""
+        if self.size == self.max_nodes:
+            return NO_NODE
+        node: int = self.size
+        self.size += 1
+        self.move[node] = move
+        self.seat[node] = seat
+        self.first_child[node] = NO_NODE
+        self.next_sibling[node] = NO_NODE
+        self.visits[node] = 0
+        self.availability[node] = 0
+        self.reward[node] = 0.0
+        return node
+
+    def add_child(self, node: int, move: int, seat: int) -> int:
+        """:return: index of the new child of node, NO_NODE if the tree is full"""
+        child: int = self.add_node(move, seat)
+        if child != NO_NODE:
+            self.next_sibling[child] = self.first_child[node]
+            self.first_child[node] = child
+        return child
+
+    def child(self, node: int, move: int) -> int:
+        """:return: child of node reached by playing move, NO_NODE if there is none"""
+        child: int = self.first_child[node]
+        while child != NO_NODE and self.move[child] != move:
+            child = self.next_sibling[child]
+        return child
+
+    def children(self, node: int) -> list[int]:
+        children: list[int] = []
+        child: int = self.first_child[node]
+        while child != NO_NODE:
+            children.append(child)
+            child = self.next_sibling[child]
+        return children
+
+    def compact(self, root: int) -> int:
+        """
+        Moves the subtree of root to the start of the arrays and drops every other node, so that the space
+        taken by the parts of the tree which can no longer be reached gets reused
+
+        :return: new index of root, which is always ROOT
+        """
+        # Breadth first, so that every node gets a lower index than its children
+        old_nodes: list[int] = [root]
+        new_parents: list[int] = [NO_NODE]
+        i: int = 0
+        while i < len(old_nodes):
+            old_children: list[int] = self.children(old_nodes[i])
+            old_nodes.extend(old_children)
+            new_parents.extend([i] * len(old_children))
+            i += 1
+
+        # Copy the values out first, as the old nodes can be anywhere in the arrays
+        arrays: tuple[array, ...] = (
+            self.move,
+            self.seat,
+            self.visits,
+            self.availability,
+            self.reward,
+        )
+        old_values: list[list] = [
+            [values[old_node] for old_node in old_nodes] for values in arrays
+        ]
+        self.size = len(old_nodes)
+        for node, parent in enumerate(new_parents):
+            for values, node_values in zip(arrays, old_values):
+                values[node] = node_values[node]
+            self.first_child[node] = NO_NODE
+            self.next_sibling[node] = NO_NODE
+            if parent != NO_NODE:
+                self.next_sibling[node] = self.first_child[parent]
+                self.first_child[parent] = node
+
+        return ROOT
+
+
+class ISMCTSPlayer(MonteCarloPlayer):
+    """
+    Plays cards with Information Set Monte Carlo Tree Search: every iteration samples the other players' hands
+    and descends a single tree, shared by all the samples, which is indexed by the cards played. The tree is
+    kept for the whole round, and after every decision its root moves down to the position reached by the
+    cards played since, so that the statistics gathered earlier in the round are reused. Bids and trumps are
+    chosen with MonteCarloSimulator
+    """
+
+    def __init__(
+        self,
+        name: str,
+        num_players: int,
+        branch_factor: int,
+        num_iterations: int,
+        search_iterations: int = 1000,
+        max_nodes: int = DEFAULT_MAX_NODES,
+        exploration: float = EXPLORATION,
+        batch_playouts: bool = False,
+        pool: Optional[SimulatorPool] = None,
+        rng: Optional[Rng] = None,
+    ) -> None:
+        super().__init__(
+            name,
+            num_players,
+            branch_factor,
+            num_iterations,
+            batch_playouts=batch_playouts,
+            pool=pool,
+            rng=rng,
+        )
+        self.search_iterations: int = search_iterations
+        self.exploration: float = exploration
+        self.tree: SearchTree = SearchTree(max_nodes)
+        self.root: int = ROOT
+        # Ids of the cards played in the round, in order, up to the end of the last trick
+        self.round_plays: list[int] = []
+        # Number of cards played in the round which the root of the tree accounts for
+        self.plays_descended: int = 0
+
+    def set_board(self, board: Board) -> None:
+        super().set_board(board)
+        self.tree.reset()
+        self.root = ROOT
+        self.round_plays = []
+        self.plays_descended = 0
+
+    def trick_outcome(self, trick: Trick) -> None:
+        super().trick_outcome(trick)
+        self.round_plays.extend(card.id for card in trick.cards.values())
+
+    def select_card(self, trick: Trick, cards_to_play: CardSet) -> Card:
+        self.descend(self.round_plays + [card.id for card in trick.cards.values()])
+
+        # The round's simulator knows the unseen cards, the hand sizes and the missing suits
+        simulator: MonteCarloSimulator = self.simulator
+        seats: dict[str, int] = simulator.seats
+        bids: list[int] = [
+            self.board.player_bids.get(player, -1) for player in simulator.players
+        ]
+        for i in range(self.search_iterations):
+            self.search(
+                simulator.generate_hands_with_constraints(),
+                simulator.tricks_won,
+                bids,
+                NO_PLAYER if trick.winner_player is None else seats[trick.winner_player],
+                NO_CARD if trick.winner_card is None else trick.winner_card.id,
+                trick.suit_to_follow,
+                len(trick.cards),
+            )
+
+        best_card: Optional[Card] = None
+        max_visits: int = -1
+        for child in self.tree.children(self.root):
+            card: Card = CARDS_BY_ID[self.tree.move[child]]
+            if card in cards_to_play and self.tree.visits[child] > max_visits:
+                best_card = card
+                max_visits = self.tree.visits[child]
+
+        if best_card is None:
+            best_card = self.rng.random.choice(list(cards_to_play))
+        return best_card
+
+    def descend(self, plays: list[int]) -> None:
+        """Moves the root of the tree down to the position reached after the given plays of the round"""
+        if 2 * self.tree.size > self.tree.max_nodes:
+            self.root = self.tree.compact(self.root)
+
+        for card_id in plays[self.plays_descended :]:
+            child: int = self.tree.child(self.root, card_id)
+            if child == NO_NODE:
+                child = self.tree.add_child(self.root, card_id, NO_PLAYER)
+            if child == NO_NODE:
+                # Full tree, start again from the current position
+                self.tree.reset()
+                child = ROOT
+            self.root = child
+        self.plays_descended = len(plays)
+
+    def search(
+        self,
+        hands: list[int],
+        tricks_won: list[int],
+        bids: list[int],
+        winner_seat: int,
+        winning_card_id: int,
+        suit_to_follow: Optional[Suit],
+        trick_size: int,
+    ) -> None:
+        """
+        Runs one iteration of the search from the root on a sample of the other players' hands: selects
+        children with UCB1 among the moves which are playable in the sample, expands one new move, plays the
+        rest of the round at random and backs up whether every player made its bid
+
+        :param hands: CardSet mask of every player's hand, indexed by seat. Gets modified
+        :param tricks_won: tricks won so far by every player, indexed by seat
+        :param bids: bid of every player, indexed by seat
+        :param trick_size: number of cards played in the current trick
+        """
+        tree: SearchTree = self.tree
+        num_players: int = len(hands)
+        strength_tables: tuple[tuple[int, ...], ...] = TRICK_STRENGTHS[self.board.trump]
+        tricks_won = list(tricks_won)
+        seat: int = 0
+        node: int = self.root
+        path: list[int] = [node]
+        in_tree: bool = True
+
+        while True:
+            if trick_size == num_players:
+                tricks_won[winner_seat] += 1
+                seat = winner_seat
+                winner_seat = NO_PLAYER
+                winning_card_id = NO_CARD
+                suit_to_follow = None
+                trick_size = 0
+            if hands[seat] == 0:
+                break
+
+            playable: int = playable_mask(hands[seat], suit_to_follow)
+            card_id: int = NO_CARD
+            if in_tree:
+                card_id, node = self.select(node, playable, seat)
+                if node == NO_NODE:
+                    in_tree = False
+                else:
+                    path.append(node)
+                    # Stop descending once a new node has been added
+                    in_tree = tree.visits[node] > 0
+
+            if card_id == NO_CARD:
+                # Random rollout
+                for i in range(self.rng.random.randrange(playable.bit_count())):
+                    playable &= playable - 1
+                card_id = (playable & -playable).bit_length()
+
+            hands[seat] ^= CARD_MASKS[card_id]
+            strengths: tuple[int, ...] = strength_tables[
+                Suit.NONE if suit_to_follow is None else suit_to_follow
+            ]
+            if strengths[card_id] > strengths[winning_card_id]:
+                # Equivalent to get_new_suit_to_follow
+                if IS_WIZARD[card_id]:
+                    if suit_to_follow == Suit.NONE:
+                        suit_to_follow = None
+                elif (
+                    suit_to_follow is None and winning_card_id == NO_CARD
+                ) or suit_to_follow == Suit.NONE:
+                    suit_to_follow = CARD_SUITS[card_id]
+                winner_seat = seat
+                winning_card_id = card_id
+            trick_size += 1
+            seat = (seat + 1) % num_players
+
+        for node in path[1:]:
+            tree.visits[node] += 1
+            if tricks_won[tree.seat[node]] == bids[tree.seat[node]]:
+                tree.reward[node] += 1.0
+
+    def select(self, node: int, playable: int, seat: int) -> tuple[int, int]:
+        """
+        :return: card to play from node and the child reached by playing it: a new child for a playable card
+                 which has not been tried yet, otherwise the playable child with the highest UCB1 score. The
+                 child is NO_NODE if the tree is full and there is no playable child
+        """
+        tree: SearchTree = self.tree
+        untried: int = playable
+        best_child: int = NO_NODE
+        best_score: float = -1.0
+        child: int = tree.first_child[node]
+        while child != NO_NODE:
+            card_mask: int = CARD_MASKS[tree.move[child]]
+            if playable & card_mask:
+                untried ^= card_mask
+                tree.availability[child] += 1
+                visits: int = tree.visits[child]
+                score: float = tree.reward[child] / visits + self.exploration * math.sqrt(
+                    math.log(tree.availability[child]) / visits
+                )
+                if score > best_score:
+                    best_child = child
+                    best_score = score
+            child = tree.next_sibling[child]
+
+        if untried:
+            for i in range(self.rng.random.randrange(untried.bit_count())):
+                untried &= untried - 1
+            card_id: int = (untried & -untried).bit_length()
+            new_child: int = tree.add_child(node, card_id, seat)
+            if new_child != NO_NODE:
+                tree.availability[new_child] = 1
+                return card_id, new_child
+
+        if best_child == NO_NODE:
+            return NO_CARD, NO_NODE
+        return tree.move[best_child], best_child
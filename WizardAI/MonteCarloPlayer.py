@@ -1,20 +1,43 @@
 import math
-import random
-from typing import Optional
+import time
+from typing import TYPE_CHECKING, Callable, Iterable, Optional
+
+import numpy as np
 
 from WizardAI.Card import (
     Card,
     Suit,
-    compare_cards,
     CardType,
-    build_shuffled_deck,
-    build_deck,
-    playable_cards,
+    DECK,
+    wins_trick,
+)
+from WizardAI.BatchPlayout import batch_playouts, hands_from_deals
+from WizardAI.CardSet import (
+    CardSet,
+    CARD_MASKS,
+    FULL_DECK_MASK,
+    mask_of,
 )
+from WizardAI.DealSampler import DealSampler
+from WizardAI.Dealer import deal_from_pool, hand_masks, pool_from_mask
+from WizardAI.DoubleDummySolver import DoubleDummySolver
+from WizardAI.Board import Board
 from WizardAI.Player import Player
+from WizardAI.PlayoutEngine import PlayoutEngine, NO_CARD, NO_PLAYER
+from WizardAI.Rng import Rng
+from WizardAI.RolloutPolicy import NO_BID, RolloutPolicy
+from WizardAI.SimulatorPool import SimulatorPool, merge_histograms
 from WizardAI.Trick import Trick
 
-MAX_BRANCH_FACTOR = 3
+if TYPE_CHECKING:
+    from WizardAI.BidBook import BidBook
+
+# Size of the first round of playouts when running on a time budget
+MIN_ROUND_PLAYOUTS = 4
+# Number of rounds num_iterations gets split into when allocating playouts adaptively
+ADAPTIVE_ROUNDS = 8
+# Number of standard deviations a decision has to be ahead by to be settled
+CONFIDENCE_Z = 2.5
 
 
 def get_new_suit_to_follow(
@@ -37,108 +60,183 @@ def get_new_suit_to_follow(
     return current_suit_to_follow
 
 
+def most_frequent_outcome(winning_freq: dict[int, int]) -> int:
+    max_freq: int = -1
+    best_estimate: int = 0
+    for tricks_won, freq in winning_freq.items():
+        if max_freq < freq:
+            max_freq = freq
+            best_estimate = tricks_won
+    return best_estimate
+
+
+def is_settled(freqs: Iterable[int], z: float = CONFIDENCE_Z) -> bool:
+    """
+    :param freqs: frequencies of the outcomes of equally sampled alternatives
+    :return: True if the most frequent outcome is ahead of the runner-up by more than z standard deviations
+    """
+    top_freqs: list[int] = sorted(freqs, reverse=True)[:2] + [0, 0]
+    return top_freqs[0] - top_freqs[1] > z * math.sqrt(top_freqs[0] + top_freqs[1])
+
+
+def hit_rate_bounds(
+    winning_freq: dict[int, int], target: int, z: float = CONFIDENCE_Z
+) -> tuple[float, float]:
+    """:return: confidence interval for the probability of winning target tricks"""
+    num_playouts: int = sum(winning_freq.values())
+    if num_playouts == 0:
+        return 0.0, 1.0
+    hit_rate: float = winning_freq.get(target, 0) / num_playouts
+    # Bound the variance by its maximum, 1/4, so that cards which never hit the target still get explored
+    half_width: float = z * math.sqrt(0.25 / num_playouts)
+    return hit_rate - half_width, hit_rate + half_width
+
+
 class MonteCarloPlayer(Player):
     def __init__(
-        self, name: str, num_players: int, branch_factor: int, num_iterations: int
+        self,
+        name: str,
+        num_players: int,
+        branch_factor: int,
+        num_iterations: int,
+        batch_playouts: bool = False,
+        pool: Optional[SimulatorPool] = None,
+        common_random_numbers: bool = False,
+        time_budget_ms: Optional[int] = None,
+        adaptive: bool = False,
+        double_dummy_threshold: int = 0,
+        bid_book: Optional["BidBook"] = None,
+        rng: Optional[Rng] = None,
+        rollout_policy: Optional[RolloutPolicy] = None,
     ) -> None:
-        super().__init__(name, num_players)
+        super().__init__(name, num_players, rng)
         self.branch_factor: int = branch_factor
         self.num_iterations: int = num_iterations
-        self.missing_suits: dict[str, set[Suit]] = dict()
+        self.batch_playouts: bool = batch_playouts
+        self.pool: Optional[SimulatorPool] = pool
+        self.common_random_numbers: bool = common_random_numbers
+        self.time_budget_ms: Optional[int] = time_budget_ms
+        self.adaptive: bool = adaptive
+        self.double_dummy_threshold: int = double_dummy_threshold
+        # Precomputed bids for the first rounds, which are looked up instead of played out
+        self.bid_book: Optional["BidBook"] = bid_book
+        # Chooses the moves of the playouts which are not batched
+        self.rollout_policy: Optional[RolloutPolicy] = rollout_policy
+        # Playouts run for the last decision
+        self.last_playouts: int = 0
         self.wins_estimate: int = -1
+        # Simulator for the current round, kept up to date with the cards played
+        self.simulator: Optional[MonteCarloSimulator] = None
+        # Histograms of the tricks won with every trump suit, when the player chose the trump of the round
+        self.trump_histograms: Optional[dict[Suit, dict[int, int]]] = None
 
-    def select_card(self, trick: Trick, cards_to_play: list[Card]) -> Card:
-        trump_suit: Suit = (
-            self.board.trump_card.suit
-            if self.board.trump_card is not None
-            else Suit.NONE
-        )
-        simulator: MonteCarloSimulator = MonteCarloSimulator(
+    def create_simulator(
+        self,
+        trump_suit: Suit,
+        trump_card: Optional[Card],
+        starting_player: str,
+        player_bids: dict[str, int],
+    ) -> "MonteCarloSimulator":
+        """:return: simulator for a round which has not started yet"""
+        return MonteCarloSimulator(
             self.name,
             self.hand,
-            self.board.player_tricks_won,
-            trump_suit,
-            self.board.trump_card,
-            trick.winner_card,
-            trick.winner_player,
-            trick.suit_to_follow,
-            self.board.starting_player,
-            dict(),
             dict(),
-            self.board.next_player_lookup,
-            self.branch_factor,
-            self.num_iterations,
-            self.wins_estimate,
-        )
-        return simulator.choose_card(cards_to_play)
-
-    def choose_trump(self) -> Suit:
-        trump_suit: Suit = (
-            self.board.trump_card.suit
-            if self.board.trump_card is not None
-            else Suit.NONE
-        )
-        simulator: MonteCarloSimulator = MonteCarloSimulator(
-            self.name,
-            self.hand,
-            self.board.player_tricks_won,
             trump_suit,
-            self.board.trump_card,
+            trump_card,
             None,
             None,
             None,
-            self.board.turn,
+            starting_player,
             dict(),
             dict(),
-            self.board.next_player_lookup,
+            self.next_player_lookup,
             self.branch_factor,
             self.num_iterations,
             None,
+            batch_playouts=self.batch_playouts,
+            pool=self.pool,
+            common_random_numbers=self.common_random_numbers,
+            time_budget_ms=self.time_budget_ms,
+            adaptive=self.adaptive,
+            double_dummy_threshold=self.double_dummy_threshold,
+            rng=self.rng.spawn_one(),
+            rollout_policy=self.rollout_policy,
+            player_bids=player_bids,
         )
-        return simulator.choose_trump()
 
-    def select_bid(self, bids: dict[str, int]) -> int:
-        trump_suit: Suit = (
-            self.board.trump_card.suit
-            if self.board.trump_card is not None
-            else Suit.NONE
+    def set_board(self, board: Board) -> None:
+        super().set_board(board)
+        self.simulator = self.create_simulator(
+            board.trump, board.trump_card, board.starting_player, board.player_bids
         )
-        simulator: MonteCarloSimulator = MonteCarloSimulator(
-            self.name,
-            self.hand,
-            self.board.player_tricks_won,
-            trump_suit,
-            self.board.trump_card,
-            None,
-            None,
-            None,
-            self.board.turn,
-            dict(),
+        self.simulator.start_round()
+        board.card_played_listeners.append(self.simulator.card_played)
+
+    def select_card(self, trick: Trick, cards_to_play: CardSet) -> Card:
+        playouts_completed: int = self.simulator.playouts_completed
+        card: Card = self.simulator.choose_card(cards_to_play)
+        self.last_playouts = self.simulator.playouts_completed - playouts_completed
+        return card
+
+    def choose_trump(self) -> Suit:
+        # Gets called before the board of the round is set, so the round's simulator does not exist yet and
+        # self.board is the last round's, or None in the first round. The trump card is a wizard, and every
+        # wizard the player does not hold is as good as the actual one. The player deals, so the next player
+        # leads
+        trump_card: Card = next(
+            card
+            for card in DECK
+            if card.card_type == CardType.WIZARD and card not in self.hand
+        )
+        simulator: MonteCarloSimulator = self.create_simulator(
+            Suit.NONE,
+            trump_card,
+            self.next_player_lookup[self.name],
             dict(),
-            self.board.next_player_lookup,
-            self.branch_factor,
-            self.num_iterations,
-            self.wins_estimate,
         )
+        trump, self.trump_histograms = simulator.choose_trump()
+        self.last_playouts = simulator.playouts_completed
+        return trump
 
-        self.wins_estimate = simulator.estimate_winnings()
+    def select_bid(self, bids: dict[str, int]) -> int:
+        if self.trump_histograms is not None:
+            # The playouts run to choose the trump were for this same position
+            self.wins_estimate = self.simulator.wins_estimate = most_frequent_outcome(
+                self.trump_histograms[self.simulator.trump_suit]
+            )
+            self.trump_histograms = None
+            self.last_playouts = 0
+            return self.wins_estimate
+
+        if self.bid_book is not None:
+            simulator: MonteCarloSimulator = self.simulator
+            num_players: int = len(simulator.players)
+            book_bid: Optional[int] = self.bid_book.bid(
+                simulator.hand.mask,
+                simulator.trump_suit,
+                num_players,
+                (num_players - simulator.seats[simulator.starting_player]) % num_players,
+            )
+            if book_bid is not None:
+                self.wins_estimate = simulator.wins_estimate = book_bid
+                self.last_playouts = 0
+                return book_bid
+
+        playouts_completed: int = self.simulator.playouts_completed
+        self.wins_estimate = self.simulator.estimate_winnings()
+        self.last_playouts = self.simulator.playouts_completed - playouts_completed
         return self.wins_estimate
 
     def trick_outcome(self, trick: Trick) -> None:
-        for player, card in trick.cards.items():
-            if (
-                trick.suit_to_follow is not None
-                and card.suit != Suit.NONE
-                and card.suit != trick.suit_to_follow
-            ):
-                self.missing_suits.setdefault(player, set()).add(trick.suit_to_follow)
+        self.simulator.trick_won(trick.winner_player)
 
 
 class MonteCarloSimulator:
     def __init__(
         self,
         name: str,
-        hand: list[Card],
+        hand: Iterable[Card],
         tricks_won: dict[str, int],
         trump_suit: Suit,
         trump_card: Optional[Card],
@@ -152,10 +250,19 @@ class MonteCarloSimulator:
         branch_factor: int,
         num_iterations: int,
         wins_estimate: Optional[int] = None,
+        batch_playouts: bool = False,
+        pool: Optional[SimulatorPool] = None,
+        common_random_numbers: bool = False,
+        time_budget_ms: Optional[int] = None,
+        adaptive: bool = False,
+        double_dummy_threshold: int = 0,
+        rng: Optional[Rng] = None,
+        rollout_policy: Optional[RolloutPolicy] = None,
+        player_bids: Optional[dict[str, int]] = None,
     ) -> None:
         super().__init__()
         self.current_winner: Optional[str] = current_winner
-        self.hand: list[Card] = hand
+        self.hand: CardSet = CardSet(hand)
         # Player order
         self.next_player_lookup: dict[str, str] = next_player_lookup
         # If trump_card.card_type == CardType.WIZARD, need to set trump suit manually for simulations
@@ -167,209 +274,556 @@ class MonteCarloSimulator:
         self.name: str = name
         self.branch_factor: int = branch_factor
         self.num_iterations: int = num_iterations
+        # Play out all the deals of a decision at once with random moves, instead of one at a time
+        self.batch_playouts: bool = batch_playouts
+        # Worker processes to run the playouts on, if any
+        self.pool: Optional[SimulatorPool] = pool
+        # Evaluate every candidate card on the same deals when choosing a card
+        self.common_random_numbers: bool = common_random_numbers
+        # If set, decisions run playouts until the time budget runs out instead of num_iterations playouts
+        self.time_budget_ms: Optional[int] = time_budget_ms
+        # Stop playing out candidate cards which are clearly worse, and stop decisions once they are settled
+        self.adaptive: bool = adaptive
+        # Solve the end of the round exactly once the hands have at most this many cards, assuming the other
+        # players play together against the player, see PlayoutEngine.run. Only used by the playouts of the
+        # cards, which know the bid, and not by the batched ones
+        self.double_dummy_threshold: int = double_dummy_threshold
+        # Double dummy solvers by trump, created when first needed
+        self.solvers: dict[Suit, DoubleDummySolver] = dict()
+        # Playouts run for the decisions made so far. A playout deals the other players' hands once, and
+        # plays out every candidate card or trump suit on the deal
+        self.playouts_completed: int = 0
         self.starting_player: str = starting_player
         self.played_cards: dict[str, list[Card]] = played_cards
-        self.all_played_cards: set[Card] = {
+        self.all_played_cards: int = mask_of(
             card for player_cards in played_cards.values() for card in player_cards
-        }
+        )
+        # Cards which might be in the other players' hands
+        self.unseen_cards: int = FULL_DECK_MASK & ~(
+            self.hand.mask | self.all_played_cards
+        )
+        if trump_card is not None:
+            self.unseen_cards &= ~CARD_MASKS[trump_card.id]
+        # Ids of the unseen cards, rebuilt from unseen_cards when needed, see get_unseen_pool
+        self.unseen_pool: Optional[np.ndarray] = None
+        self.rng: Rng = Rng() if rng is None else rng
         self.missing_suits: dict[str, set[Suit]] = missing_suits
+        # Samplers of deals which honour the missing suits, by size of the other players' hands
+        self.deal_samplers: dict[tuple[int, ...], DealSampler] = dict()
         self.wins_estimate: Optional[int] = wins_estimate
-        self.tricks_won: dict[str, int] = dict(tricks_won)
+        # Bids made so far in the round, for the rollout policy
+        self.player_bids: dict[str, int] = dict() if player_bids is None else player_bids
+        # Seats follow the order of play, starting with the simulated player
+        self.players: list[str] = [name]
+        while len(self.players) < len(next_player_lookup):
+            self.players.append(next_player_lookup[self.players[-1]])
+        self.seats: dict[str, int] = {
+            player: seat for seat, player in enumerate(self.players)
+        }
+        self.tricks_won: list[int] = [
+            tricks_won.get(player, 0) for player in self.players
+        ]
+        self.playout_engine: PlayoutEngine = PlayoutEngine(
+            len(self.players),
+            0,
+            double_dummy_threshold=double_dummy_threshold,
+            rng=self.rng.random,
+            policy=rollout_policy,
+        )
+        self.branch_prob: int = self.get_branch_prob()
+        self.hand_sizes: dict[str, int] = self.compute_hand_sizes()
+        # Number of cards played in the current trick
+        self.trick_size: int = self.get_cards_played(self.hand_sizes)
+
+    def get_branch_prob(self) -> int:
+        hand_size: int = len(self.hand)
+        return max(1, len(self.players) * hand_size // 5 * max(hand_size // 4, 1))
+
+    def start_round(self) -> None:
+        """Sets the state to the start of the round, before starting_player plays the first card"""
+        self.hand_sizes = self.get_starting_hand_sizes()
+        self.trick_size = 0
+
+    def card_played(self, player: str, card: Card) -> None:
+        """
+        Keeps the state of the round up to date with a card played by any player, the simulated one included.
+        Meant to be registered as a listener of Board.card_played
+        """
+        card_mask: int = CARD_MASKS[card.id]
+        if player == self.name:
+            self.hand.discard(card)
+            self.branch_prob = self.get_branch_prob()
+        else:
+            self.unseen_cards &= ~card_mask
+            self.unseen_pool = None
+            if (
+                self.suit_to_follow is not None
+                and self.suit_to_follow != Suit.NONE
+                and card.suit != Suit.NONE
+                and card.suit != self.suit_to_follow
+            ):
+                self.missing_suits.setdefault(player, set()).add(self.suit_to_follow)
+            # The samplers were built for the previous unseen cards
+            self.deal_samplers.clear()
+
+        self.all_played_cards |= card_mask
+        self.played_cards.setdefault(player, []).append(card)
+        self.hand_sizes[player] -= 1
+        (
+            self.current_winner,
+            self.current_winning_card,
+            self.suit_to_follow,
+        ) = self.trick_after_card(card, player)
+        self.trick_size += 1
+
+    def trick_won(self, player: str) -> None:
+        """Ends the current trick, won by player"""
+        self.tricks_won[self.seats[player]] += 1
+        self.current_winner = None
+        self.current_winning_card = None
+        self.suit_to_follow = None
+        self.trick_size = 0
 
     def simulate_number_of_wins_with_starting_hands(
         self,
         current_player: str,
-        tricks_won: dict[str, int],
-        player_hands: dict[str, list[Card]],
+        tricks_won: list[int],
+        player_hands: list[int],
         current_winner: Optional[str],
         winning_card: Optional[Card],
         suit_to_follow: Optional[Suit],
         winning_freq: dict[int, int],
         cards_played: int,
+        bid: Optional[int] = None,
+        trump: Optional[Suit] = None,
     ) -> None:
-        reset_tricks_won: bool = False
-        prev_winner: str = current_winner
-        if cards_played > 0 and cards_played % len(player_hands) == 0:
-            # print(f"Current player: {current_player} - end of trick: {player_hands}")
-
-            tricks_won.setdefault(current_winner, 0)
-            tricks_won[current_winner] += 1
-            current_player = current_winner
-            current_winner = None
-            winning_card = None
-            suit_to_follow = None
-            reset_tricks_won = True
-
-            if len(player_hands[current_player]) == 0:
-                tricks_won_by_player: int = tricks_won.setdefault(self.name, 0)
-                winning_freq.setdefault(tricks_won_by_player, 0)
-                winning_freq[tricks_won_by_player] += 1
-                tricks_won[prev_winner] -= 1
-                # print(
-                #     f"Current player: {current_player} - before returning: {player_hands}"
-                # )
-
-                return
-
-        player_hand: list[Card] = player_hands[current_player]
-        cards: list[Card] = playable_cards(player_hand, suit_to_follow)
-        next_player: str = self.next_player_lookup[current_player]
-        prob = max(
-            1, len(player_hands) * len(self.hand) // 5 * max(len(self.hand) // 4, 1)
+        """
+        Plays out the round from the given position, see PlayoutEngine.run
+
+        :param tricks_won: tricks won so far by every player, indexed by seat
+        :param player_hands: CardSet mask of every player's hand, indexed by seat
+        :param bid: number of tricks bid by the player, if known
+        :param trump: trump suit to play with, the simulator's by default
+        """
+        trump = self.trump_suit if trump is None else trump
+        self.playout_engine.run(
+            trump,
+            player_hands,
+            tricks_won,
+            self.seats[current_player],
+            NO_PLAYER if current_winner is None else self.seats[current_winner],
+            NO_CARD if winning_card is None else winning_card.id,
+            suit_to_follow,
+            cards_played,
+            self.branch_prob,
+            winning_freq,
+            self.get_solver(trump),
+            bid,
+            self.get_bids(),
         )
 
-        if random.randint(1, prob) == 1:
-            branch_factor: int = min(MAX_BRANCH_FACTOR, len(cards))
-        else:
-            branch_factor: int = 1
-
-        for i in range(branch_factor):
-            card: Card = cards[i]
-            new_hand: list[Card] = [c for c in player_hand if c != card]
-            # print(
-            #     f"Current player: {current_player} - before: {player_hands}, {player_hand}"
-            # )
-            player_hands[current_player] = new_hand
-            # print(f"Current player: {current_player} - after: {player_hands}")
-            if compare_cards(winning_card, card, self.trump_suit) < 0:
-                next_suit_to_follow: Optional[Suit] = get_new_suit_to_follow(
-                    card, winning_card, suit_to_follow
+    def get_bids(self) -> list[int]:
+        """:return: bid of every player, indexed by seat, NO_BID for the bids which have not been made"""
+        bids: list[int] = [
+            self.player_bids.get(player, NO_BID) for player in self.players
+        ]
+        if bids[0] == NO_BID and self.wins_estimate is not None:
+            bids[0] = self.wins_estimate
+        return bids
+
+    def get_solver(self, trump: Optional[Suit] = None) -> Optional[DoubleDummySolver]:
+        """
+        :param trump: trump suit to solve for, the simulator's by default
+        :return: double dummy solver for the trump, None if the playouts should not use one
+        """
+        if self.double_dummy_threshold <= 0:
+            return None
+        trump = self.trump_suit if trump is None else trump
+        if trump not in self.solvers:
+            self.solvers[trump] = DoubleDummySolver(len(self.players), trump)
+        return self.solvers[trump]
+
+    def set_rng(self, rng: Rng) -> None:
+        """Switches the simulator to another random stream, such as one spawned for a worker"""
+        self.rng = rng
+        self.playout_engine.rng = rng.random
+
+    def __getstate__(self) -> dict:
+        # The pool stays in the process which owns it, and the workers build their own transposition tables
+        state: dict = dict(self.__dict__)
+        state["pool"] = None
+        state["solvers"] = dict()
+        return state
+
+    def run_bid_playouts(self, num_playouts: int) -> dict[int, int]:
+        """bid_histogram, run on the worker pool if there is one"""
+        if self.pool is not None:
+            return self.pool.bid_histogram(self, num_playouts)
+        return self.bid_histogram(num_playouts)
+
+    def run_trump_playouts(self, num_playouts: int) -> dict[Suit, dict[int, int]]:
+        """trump_histograms, run on the worker pool if there is one"""
+        if self.pool is not None:
+            return self.pool.trump_histograms(self, num_playouts)
+        return self.trump_histograms(num_playouts)
+
+    def run_card_playouts(
+        self, cards: list[Card], num_playouts: int
+    ) -> dict[Card, dict[int, int]]:
+        """
+        card_histogram for every card, or common_card_histograms when using common random numbers, run on the
+        worker pool if there is one
+        """
+        if self.common_random_numbers:
+            if self.pool is not None:
+                return self.pool.common_card_histograms(self, cards, num_playouts)
+            return self.common_card_histograms(cards, num_playouts)
+
+        if self.pool is not None:
+            return self.pool.card_histograms(self, cards, num_playouts)
+        return {card: self.card_histogram(card, num_playouts) for card in cards}
+
+    def bid_histogram(self, num_playouts: int) -> dict[int, int]:
+        """:return: histogram of the tricks won by the player over num_playouts playouts of the whole round"""
+        hand_sizes: dict[str, int] = self.get_starting_hand_sizes()
+        if self.batch_playouts:
+            return self.simulate_batch(
+                self.generate_batch(hand_sizes, num_playouts),
+                [0] * len(self.players),
+                self.starting_player,
+                None,
+                None,
+                None,
+                0,
+            )
+
+        winning_freq: dict[int, int] = dict()
+        for hands in self.generate_consistent_deals(hand_sizes, num_playouts):
+            self.simulate_number_of_wins_with_starting_hands(
+                self.starting_player,
+                [0] * len(self.players),
+                hands,
+                None,
+                None,
+                None,
+                winning_freq,
+                0,
+            )
+        return winning_freq
+
+    def trump_histograms(self, num_playouts: int) -> dict[Suit, dict[int, int]]:
+        """
+        Like bid_histogram with every suit as the trump, but all the suits are played out on the same
+        num_playouts deals, as the deals do not depend on the trump. The differences between the histograms
+        then come from the trump rather than from the sampled deals
+        """
+        hand_sizes: dict[str, int] = self.get_starting_hand_sizes()
+        if self.batch_playouts:
+            hands: np.ndarray = self.generate_batch(hand_sizes, num_playouts)
+            return {
+                suit: self.simulate_batch(
+                    hands.copy(),
+                    [0] * len(self.players),
+                    self.starting_player,
+                    None,
+                    None,
+                    None,
+                    0,
+                    trump=suit,
                 )
+                for suit in Suit.all_suits
+            }
+
+        deals: list[list[int]] = self.generate_consistent_deals(hand_sizes, num_playouts)
+        histograms: dict[Suit, dict[int, int]] = dict()
+        for suit in Suit.all_suits:
+            winning_freq: dict[int, int] = dict()
+            for hands in deals:
                 self.simulate_number_of_wins_with_starting_hands(
-                    next_player,
-                    tricks_won,
-                    player_hands,
-                    current_player,
-                    card,
-                    next_suit_to_follow,
+                    self.starting_player,
+                    [0] * len(self.players),
+                    hands,
+                    None,
+                    None,
+                    None,
                     winning_freq,
-                    cards_played + 1,
+                    0,
+                    trump=suit,
                 )
-            else:
-                self.simulate_number_of_wins_with_starting_hands(
-                    next_player,
-                    tricks_won,
-                    player_hands,
-                    current_winner,
-                    winning_card,
-                    suit_to_follow,
-                    winning_freq,
-                    cards_played + 1,
+            histograms[suit] = winning_freq
+        return histograms
+
+    def card_histogram(self, card: Card, num_playouts: int) -> dict[int, int]:
+        """
+        Assumes it is the simulated player's turn
+
+        :return: histogram of the tricks won by the player over num_playouts playouts of the rest of the round
+                 after playing card
+        """
+        if self.batch_playouts:
+            return self.card_histogram_on_batch(
+                card,
+                self.generate_batch(self.get_hand_sizes(), num_playouts),
+                self.rng.generator,
+            )
+
+        return self.card_histogram_on_deals(
+            card, self.generate_consistent_deals(self.get_hand_sizes(), num_playouts)
+        )
+
+    def common_card_histograms(
+        self, cards: list[Card], num_playouts: int
+    ) -> dict[Card, dict[int, int]]:
+        """
+        Like card_histogram for every card, but all the cards are played out on the same num_playouts deals
+        (and, for batch playouts, the same random moves), so that the differences between their histograms
+        come from the cards rather than from the sampled deals
+        """
+        if self.batch_playouts:
+            hands: np.ndarray = self.generate_batch(self.get_hand_sizes(), num_playouts)
+            seed: int = int(self.rng.generator.integers(2**63))
+            return {
+                card: self.card_histogram_on_batch(
+                    card, hands.copy(), np.random.default_rng(seed)
                 )
+                for card in cards
+            }
 
-        # print(
-        #     f"Current player: {current_player} - restoring before: {player_hands}, {player_hand}"
-        # )
-        player_hands[current_player] = player_hand
-        # print(
-        #     f"Current player: {current_player} - restoring after: {player_hands}, {player_hand}"
-        # )
-        if reset_tricks_won:
-            tricks_won[prev_winner] -= 1
+        deals: list[list[int]] = self.generate_consistent_deals(
+            self.get_hand_sizes(), num_playouts
+        )
+        return {card: self.card_histogram_on_deals(card, deals) for card in cards}
+
+    def trick_after_card(
+        self, card: Card, player: Optional[str] = None
+    ) -> tuple[Optional[str], Optional[Card], Optional[Suit]]:
+        """
+        :param player: player who plays the card, the simulated one by default
+        :return: winner, winning card and suit to follow of the current trick once the player plays card
+        """
+        if wins_trick(
+            card, self.current_winning_card, self.trump_suit, self.suit_to_follow
+        ):
+            return (
+                self.name if player is None else player,
+                card,
+                get_new_suit_to_follow(
+                    card, self.current_winning_card, self.suit_to_follow
+                ),
+            )
 
-    def estimate_winnings(self) -> int:
+        return self.current_winner, self.current_winning_card, self.suit_to_follow
+
+    def card_histogram_on_deals(
+        self, card: Card, deals: Iterable[list[int]]
+    ) -> dict[int, int]:
+        """
+        :param card: card played by the player
+        :param deals: hands of every deal, indexed by seat. The player's hand gets replaced
+        :return: histogram of the tricks won by the player over the playouts of the deals after playing card
+        """
+        # Count card which is about to be played
+        cards_played: int = self.trick_size + 1
+        next_player: str = self.next_player_lookup[self.name]
+        winner, winning_card, suit_to_follow = self.trick_after_card(card)
+
+        new_hand: int = self.hand.mask ^ CARD_MASKS[card.id]
         winning_freq: dict[int, int] = dict()
-        for i in range(self.num_iterations):
-            hands: dict[str, list[Card]] = self.generate_hands_without_constraints(
-                self.get_starting_hand_sizes()
-            )
+        for hands in deals:
+            hands[0] = new_hand
             self.simulate_number_of_wins_with_starting_hands(
-                self.starting_player, dict(), hands, None, None, None, winning_freq, 0
+                next_player,
+                self.tricks_won,
+                hands,
+                winner,
+                winning_card,
+                suit_to_follow,
+                winning_freq,
+                cards_played,
+                self.wins_estimate,
             )
+        return winning_freq
 
-        max_freq: int = -1
-        best_estimate: int = 0
-        for tricks_won, freq in winning_freq.items():
-            if max_freq < freq:
-                max_freq = freq
-                best_estimate = tricks_won
+    def card_histogram_on_batch(
+        self, card: Card, hands: np.ndarray, rng: np.random.Generator
+    ) -> dict[int, int]:
+        """Batch version of card_histogram_on_deals. The card gets removed from the player's hands"""
+        # Count card which is about to be played
+        cards_played: int = self.trick_size + 1
+        next_player: str = self.next_player_lookup[self.name]
+        winner, winning_card, suit_to_follow = self.trick_after_card(card)
+
+        hands[:, 0, card.id] = False
+        return self.simulate_batch(
+            hands,
+            self.tricks_won,
+            next_player,
+            winner,
+            winning_card,
+            suit_to_follow,
+            cards_played,
+            rng,
+        )
+
+    def run_rounds(self, run_round: Callable[[int], bool]) -> None:
+        """
+        Calls run_round with the number of playouts to run: once with num_iterations, or, on a time budget,
+        repeatedly until the budget runs out. The rounds are sized from the time the previous ones took, so
+        that the last one ends close to the deadline. When allocating adaptively, num_iterations is split
+        into several rounds, and no more rounds are run once run_round returns True. The playouts asked for
+        are added to playouts_completed
+        """
+        if self.time_budget_ms is None:
+            if not self.adaptive:
+                run_round(self.num_iterations)
+                self.playouts_completed += self.num_iterations
+                return
+
+            round_size: int = max(
+                MIN_ROUND_PLAYOUTS, -(-self.num_iterations // ADAPTIVE_ROUNDS)
+            )
+            playouts_run: int = 0
+            while playouts_run < self.num_iterations:
+                round_playouts: int = min(
+                    round_size, self.num_iterations - playouts_run
+                )
+                playouts_run += round_playouts
+                settled: bool = run_round(round_playouts)
+                self.playouts_completed += round_playouts
+                if settled:
+                    return
+            return
+
+        start_time: float = time.perf_counter()
+        deadline: float = start_time + self.time_budget_ms / 1000
+        round_playouts: int = MIN_ROUND_PLAYOUTS
+        playouts_run: int = 0
+        while True:
+            settled: bool = run_round(round_playouts)
+            self.playouts_completed += round_playouts
+            if settled:
+                return
+            playouts_run += round_playouts
+
+            current_time: float = time.perf_counter()
+            if current_time >= deadline:
+                return
+            time_per_playout: float = (current_time - start_time) / playouts_run
+            round_playouts = max(
+                1,
+                min(
+                    2 * round_playouts,
+                    int((deadline - current_time) / time_per_playout),
+                ),
+            )
+
+    def decision_bid_histogram(self) -> dict[int, int]:
+        """run_bid_playouts for a decision, see run_rounds"""
+        histogram: dict[int, int] = dict()
+
+        def run_round(num_playouts: int) -> bool:
+            nonlocal histogram
+            histogram = merge_histograms(
+                (histogram, self.run_bid_playouts(num_playouts))
+            )
+            return self.adaptive and is_settled(histogram.values())
+
+        self.run_rounds(run_round)
+        return histogram
+
+    def estimate_winnings(self) -> int:
+        best_estimate: int = most_frequent_outcome(self.decision_bid_histogram())
 
         # Set wins estimate
         self.wins_estimate = best_estimate
         return best_estimate
 
-    def choose_trump(self) -> Suit:
-        best_suit: Suit = Suit.NONE
-        max_freq: int = -1
-        for suit in Suit.all_suits:
-            win_frequencies: dict[int, int] = dict()
-            for i in range(self.num_iterations):
-                hands: dict[str, list[Card]] = self.generate_hands_without_constraints(
-                    self.get_starting_hand_sizes()
-                )
+    def choose_trump(self) -> tuple[Suit, dict[Suit, dict[int, int]]]:
+        """
+        :return: best trump suit, and the histogram of the tricks won by the player with every suit as the trump,
+                 see trump_histograms
+        """
+        suit_histograms: dict[Suit, dict[int, int]] = {
+            suit: dict() for suit in Suit.all_suits
+        }
 
-                # Set the chosen trump suit
-                self.trump_suit = suit
-                self.simulate_number_of_wins_with_starting_hands(
-                    self.starting_player,
-                    dict(),
-                    hands,
-                    None,
-                    None,
-                    None,
-                    win_frequencies,
-                    0,
+        def run_round(num_playouts: int) -> bool:
+            for suit, histogram in self.run_trump_playouts(num_playouts).items():
+                suit_histograms[suit] = merge_histograms(
+                    (suit_histograms[suit], histogram)
                 )
+            # Settled once the best suit's most frequent outcome beats the other suits' ones
+            return self.adaptive and is_settled(
+                max(histogram.values()) for histogram in suit_histograms.values()
+            )
 
+        self.run_rounds(run_round)
+
+        best_suit: Suit = Suit.NONE
+        max_freq: int = -1
+        for suit, win_frequencies in suit_histograms.items():
             # TODO: Revise - should this be in terms of max score or just max freq
             for tricks_won, freq in win_frequencies.items():
                 if max_freq < freq:
                     max_freq = freq
                     best_suit = Suit(suit)
+        return best_suit, suit_histograms
 
-        # Set the trump suit for the simulation
-        self.trump_suit = best_suit
-        return best_suit
+    def choose_card(self, cards_to_play: CardSet) -> Card:
+        cards: list[Card] = list(cards_to_play)
+        card_histograms: dict[Card, dict[int, int]] = {card: dict() for card in cards}
 
-    def choose_card(self, cards_to_play: list[Card]) -> Card:
-        # Assume it is simulated player's turn
-        hand_sizes: dict[str, int] = self.get_hand_sizes()
-        # Count card which is about to be played
-        cards_played: int = self.get_cards_played(hand_sizes) + 1
-        next_player: str = self.next_player_lookup[self.name]
+        def run_round(num_playouts: int) -> bool:
+            nonlocal cards
+            for card, histogram in self.run_card_playouts(cards, num_playouts).items():
+                card_histograms[card] = merge_histograms(
+                    (card_histograms[card], histogram)
+                )
+            if not self.adaptive:
+                return False
+            cards = self.surviving_cards(
+                {card: card_histograms[card] for card in cards}
+            )
+            return len(cards) == 1
+
+        self.run_rounds(run_round)
+        # The cards which are still candidates have all been played out the same number of times
+        return self.choose_card_from_histograms(
+            {card: card_histograms[card] for card in cards}
+        )
+
+    def surviving_cards(self, card_histograms: dict[Card, dict[int, int]]) -> list[Card]:
+        """
+        :return: cards whose chance of winning the estimated number of tricks might still be the highest, given
+                 their histograms so far
+        """
+        assert (
+            self.wins_estimate is not None
+        ), "we should have calculated a wins estimate before starting to play!"
+
+        bounds: dict[Card, tuple[float, float]] = {
+            card: hit_rate_bounds(winning_freq, self.wins_estimate)
+            for card, winning_freq in card_histograms.items()
+        }
+        best_lower_bound: float = max(lower for lower, upper in bounds.values())
+        return [card for card, (lower, upper) in bounds.items() if upper >= best_lower_bound]
+
+    def choose_card_from_histograms(
+        self, card_histograms: dict[Card, dict[int, int]]
+    ) -> Card:
+        """
+        :param card_histograms: histogram of the tricks won by the player after playing each of the cards
+        :return: card whose playouts most often end with the player winning the estimated number of tricks,
+                 or the closest number of tricks to it
+        """
+        assert (
+            self.wins_estimate is not None
+        ), "we should have calculated a wins estimate before starting to play!"
 
         best_outcome: int = -1000
         best_frequency: int = -1
-        chosen_card: Card = cards_to_play[0]
-        for card in cards_to_play:
-            new_hand: list[Card] = [c for c in self.hand if c != card]
-            winning_freq: dict[int, int] = dict()
-            for i in range(self.num_iterations):
-                hands: dict[str, list[Card]] = self.generate_hands_with_constraints(
-                    max_tries=10
-                )
-                hands[self.name] = new_hand
-                if compare_cards(self.current_winning_card, card, self.trump_suit) < 0:
-                    next_suit_to_follow: Optional[Suit] = get_new_suit_to_follow(
-                        card, self.current_winning_card, self.suit_to_follow
-                    )
-
-                    self.simulate_number_of_wins_with_starting_hands(
-                        next_player,
-                        self.tricks_won,
-                        hands,
-                        self.name,
-                        card,
-                        next_suit_to_follow,
-                        winning_freq,
-                        cards_played,
-                    )
-                else:
-                    self.simulate_number_of_wins_with_starting_hands(
-                        next_player,
-                        self.tricks_won,
-                        hands,
-                        self.current_winner,
-                        self.current_winning_card,
-                        self.suit_to_follow,
-                        winning_freq,
-                        cards_played,
-                    )
-
-            assert (
-                self.wins_estimate is not None
-            ), "we should have calculated a wins estimate before starting to play!"
-
+        chosen_card: Card = next(iter(card_histograms))
+        for card, winning_freq in card_histograms.items():
             if self.wins_estimate in winning_freq:
                 estimated_freq: int = winning_freq[self.wins_estimate]
                 if best_outcome != self.wins_estimate:
@@ -394,69 +848,139 @@ class MonteCarloSimulator:
 
         return chosen_card
 
-    def generate_hands_without_constraints(
-        self, hand_sizes: dict[str, int]
-    ) -> dict[str, list[Card]]:
-        all_cards: list[Card] = [
-            card
-            for card in build_shuffled_deck()
-            if card not in self.hand
-            and card != self.trump_card
-            and card not in self.all_played_cards
+    def generate_batch(self, hand_sizes: dict[str, int], num_deals: int) -> np.ndarray:
+        """
+        Deals num_deals sets of hands for the other players from the unseen cards, honouring the missing suits
+
+        :return: hands of every deal in the format used by BatchPlayout
+        """
+        sampler: Optional[DealSampler] = self.get_deal_sampler(hand_sizes)
+        if sampler is not None:
+            masks: np.ndarray = np.array(
+                [sampler.sample(self.rng.random) for i in range(num_deals)], dtype=np.uint64
+            ).reshape(num_deals, len(self.players) - 1)
+            hands: np.ndarray = np.zeros(
+                (num_deals, len(self.players), len(CARD_MASKS)), dtype=bool
+            )
+            hands[:, 1:, 1:] = (
+                masks[:, :, None] >> np.arange(len(CARD_MASKS) - 1, dtype=np.uint64)
+            ) & np.uint64(1) == 1
+            hands[:, 0, [card.id for card in self.hand]] = True
+            return hands
+
+        player_hand_sizes: list[int] = [
+            hand_sizes[player] for player in self.players[1:]
         ]
-
-        start_idx = 0
-        hands: dict[str, list[Card]] = dict()
-        for player in self.next_player_lookup.keys():
-            if player != self.name:
-                hand_size: int = hand_sizes[player]
-                hand: list[Card] = all_cards[start_idx : start_idx + hand_size]
-                start_idx += hand_size
-                hands[player] = hand
-
-        hands[self.name] = self.hand
+        hands: np.ndarray = hands_from_deals(
+            deal_from_pool(num_deals, player_hand_sizes, self.get_unseen_pool(), self.rng.generator),
+            player_hand_sizes,
+            len(self.players),
+            first_seat=1,
+        )
+        hands[:, 0, [card.id for card in self.hand]] = True
         return hands
 
-    def generate_hands_with_constraints(self, max_tries=10):
-        hand_sizes: dict[str, int] = self.get_hand_sizes()
-        tries: int = 0
-        success: bool = False
-        while tries < max_tries:
-            tries += 1
-            all_cards: set[Card] = {
-                card
-                for card in build_deck()
-                if card not in self.hand
-                and card != self.trump_card
-                and card not in self.all_played_cards
-            }
-
-            hands: dict[str, list[Card]] = dict()
+    def simulate_batch(
+        self,
+        hands: np.ndarray,
+        tricks_won: list[int],
+        current_player: str,
+        current_winner: Optional[str],
+        winning_card: Optional[Card],
+        suit_to_follow: Optional[Suit],
+        cards_played: int,
+        rng: Optional[np.random.Generator] = None,
+        trump: Optional[Suit] = None,
+    ) -> dict[int, int]:
+        """
+        Plays out all the deals in hands at once, see BatchPlayout.batch_playouts
+
+        :param trump: trump suit to play with, the simulator's by default
+        """
+        histogram: np.ndarray = batch_playouts(
+            self.trump_suit if trump is None else trump,
+            hands,
+            tricks_won,
+            self.seats[current_player],
+            NO_PLAYER if current_winner is None else self.seats[current_winner],
+            NO_CARD if winning_card is None else winning_card.id,
+            suit_to_follow,
+            cards_played,
+            0,
+            self.rng.generator if rng is None else rng,
+        )
+        return {
+            tricks_won: int(freq) for tricks_won, freq in enumerate(histogram) if freq
+        }
 
-            for player in self.next_player_lookup.keys():
-                if player != self.name:
-                    hand_size: int = hand_sizes[player]
-                    possible_cards: set[Card] = {
-                        card
-                        for card in all_cards
-                        if player not in self.missing_suits
-                        or card.suit not in self.missing_suits[player]
-                    }
-                    if len(possible_cards) < hand_sizes[player]:
-                        break
+    def generate_deals(
+        self, hand_sizes: dict[str, int], num_deals: int
+    ) -> list[list[int]]:
+        """
+        Deals num_deals sets of hands for the other players from the unseen cards in a single batch
 
-                    hand: list[Card] = [possible_cards.pop() for _ in range(hand_size)]
-                    all_cards.difference_update(hand)
+        :return: CardSet masks of the hands of every deal, indexed by seat
+        """
+        player_hand_sizes: list[int] = [
+            hand_sizes[player] for player in self.players[1:]
+        ]
+        masks: list[list[int]] = hand_masks(
+            deal_from_pool(num_deals, player_hand_sizes, self.get_unseen_pool(), self.rng.generator),
+            player_hand_sizes,
+        ).tolist()
 
-                    hands[player] = hand
+        for hands in masks:
+            hands.insert(0, self.hand.mask)
+        return masks
 
-            if success:
-                hands[self.name] = self.hand
-                return hands
+    def generate_hands_without_constraints(
+        self, hand_sizes: dict[str, int]
+    ) -> list[int]:
+        return self.generate_deals(hand_sizes, 1)[0]
+
+    def get_deal_sampler(self, hand_sizes: dict[str, int]) -> Optional[DealSampler]:
+        """
+        :return: sampler of the other players' hands which honours the missing suits, None if no missing suits
+                 are known, or if they cannot all be honoured
+        """
+        if not any(self.missing_suits.get(player) for player in self.players[1:]):
+            return None
 
-        return self.generate_hands_without_constraints(hand_sizes)
+        player_hand_sizes: tuple[int, ...] = tuple(
+            hand_sizes[player] for player in self.players[1:]
+        )
+        if player_hand_sizes not in self.deal_samplers:
+            self.deal_samplers[player_hand_sizes] = DealSampler(
+                self.unseen_cards,
+                list(player_hand_sizes),
+                [self.missing_suits.get(player, ()) for player in self.players[1:]],
+            )
+        sampler: DealSampler = self.deal_samplers[player_hand_sizes]
+        return sampler if sampler.num_constrained_deals > 0 else None
+
+    def generate_consistent_deals(
+        self, hand_sizes: dict[str, int], num_deals: int
+    ) -> list[list[int]]:
+        """Same as generate_deals, but honouring the missing suits"""
+        sampler: Optional[DealSampler] = self.get_deal_sampler(hand_sizes)
+        if sampler is None:
+            return self.generate_deals(hand_sizes, num_deals)
+        return [[self.hand.mask] + sampler.sample(self.rng.random) for i in range(num_deals)]
+
+    def generate_hands_with_constraints(self) -> list[int]:
+        """:return: CardSet masks of the hands of a deal which honours the missing suits, indexed by seat"""
+        return self.generate_consistent_deals(self.get_hand_sizes(), 1)[0]
 
     def get_hand_sizes(self) -> dict[str, int]:
+        return self.hand_sizes
+
+    def get_unseen_pool(self) -> np.ndarray:
+        if self.unseen_pool is None:
+            self.unseen_pool = pool_from_mask(self.unseen_cards)
+        return self.unseen_pool
+
+    def compute_hand_sizes(self) -> dict[str, int]:
+        """:return: size of every player's hand, assuming that the trick was started by starting_player"""
         hand_size: int = len(self.hand) - 1
         current_player: str = self.starting_player
         hand_sizes: dict[str, int] = dict()
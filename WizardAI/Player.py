@@ -1,24 +1,31 @@
 from abc import ABC, abstractmethod
-from typing import Optional
+from typing import Iterable, Optional
 
 from WizardAI.Board import Board
-from WizardAI.Card import Card, Suit, playable_cards
+from WizardAI.Card import Card, Suit
+from WizardAI.CardSet import CardSet, playable_cards
+from WizardAI.Rng import Rng
 from WizardAI.Trick import Trick
 
 
 class Player(ABC):
-    def __init__(self, name: str, num_players: int) -> None:
+    def __init__(
+        self, name: str, num_players: int, rng: Optional[Rng] = None
+    ) -> None:
         super().__init__()
-        self.hand: list[Card] = []
+        self.rng: Rng = Rng() if rng is None else rng
+        self.hand: CardSet = CardSet()
         self.board: Optional[Board] = None
         self.name: str = name
         self.num_players: int = num_players
+        # Player after every player at the table, known from the start of the game
+        self.next_player_lookup: Optional[dict[str, str]] = None
 
     @abstractmethod
     def select_card(
         self,
         trick: Trick,
-        cards_to_play: list[Card],
+        cards_to_play: CardSet,
     ) -> Card:
         raise Exception("Unimplemented")
 
@@ -34,17 +41,22 @@ class Player(ABC):
     def trick_outcome(self, trick: Trick) -> None:
         raise Exception("Unimplemented")
 
-    def deal_hand(self, hand: list[Card]) -> None:
-        self.hand = hand
+    def deal_hand(self, hand: Iterable[Card]) -> None:
+        self.hand = CardSet(hand)
+
+    def join_game(self, next_player_lookup: dict[str, str]) -> None:
+        """Called by the game before the first round, with the seating of the players"""
+        self.next_player_lookup = next_player_lookup
 
     def set_board(self, board: Board) -> None:
         self.board = board
+        self.next_player_lookup = board.next_player_lookup
 
     def choose_card(self, trick: Trick) -> Card:
-        valid_cards: list[Card] = playable_cards(self.hand, trick.suit_to_follow)
+        valid_cards: CardSet = playable_cards(self.hand, trick.suit_to_follow)
 
         card: Card = self.select_card(trick, valid_cards)
-        self.hand = [c for c in self.hand if card != c]
+        self.hand.remove(card)
         return card
 
     def calculate_bid(self, bids: dict[str, int]) -> int:
@@ -0,0 +1,287 @@
+import random
+from typing import TYPE_CHECKING, Optional
+
+from WizardAI.Card import CardType, Suit, CARDS_BY_ID, NUM_CARDS, TRICK_STRENGTHS
+from WizardAI.CardSet import JESTER_MASK, WIZARD_MASK, playable_mask
+from WizardAI.RolloutPolicy import LowestIdPolicy, NO_BID, RolloutPolicy
+
+if TYPE_CHECKING:
+    from WizardAI.DoubleDummySolver import DoubleDummySolver
+
+MAX_BRANCH_FACTOR = 3
+
+NO_PLAYER = -1
+NO_CARD = 0
+# Returned by PlayoutEngine.settled_tricks while the player's tricks still depend on the cards played
+NOT_SETTLED = -1
+
+# Indexed by card id
+CARD_SUITS: tuple[Optional[Suit], ...] = tuple(
+    None if card is None else card.suit for card in CARDS_BY_ID
+)
+IS_WIZARD: tuple[bool, ...] = tuple(
+    card is not None and card.card_type == CardType.WIZARD for card in CARDS_BY_ID
+)
+
+
+class PlayoutEngine:
+    """
+    Plays out a round from a given position without recursion. The players are identified by their seat, and
+    each move is made on a flat state which gets restored from an explicit stack once all the branches of the
+    move have been explored
+    """
+
+    def __init__(
+        self,
+        num_players: int,
+        player_seat: int,
+        max_branch_factor: int = MAX_BRANCH_FACTOR,
+        double_dummy_threshold: int = 0,
+        rng: random.Random = random,
+        policy: Optional[RolloutPolicy] = None,
+        stop_settled: bool = True,
+    ) -> None:
+        """
+        :param stop_settled: whether playouts stop as soon as the player's tricks are settled, see
+                             settled_tricks. Otherwise they get played to the end, without branching
+        """
+        super().__init__()
+        self.num_players: int = num_players
+        # Decides which moves get branched on
+        self.rng: random.Random = rng
+        # Chooses the card played at every position, the other branches are the lowest playable cards
+        self.policy: RolloutPolicy = LowestIdPolicy() if policy is None else policy
+        # Seat of the player whose tricks are counted
+        self.player_seat: int = player_seat
+        self.max_branch_factor: int = max_branch_factor
+        # Hand size from which the rest of the round gets solved exactly instead of played out at random, in
+        # the playouts which know the player's bid
+        self.double_dummy_threshold: int = double_dummy_threshold
+        self.stop_settled: bool = stop_settled
+
+        # One stack entry per card played, plus one for the end of the round
+        max_depth: int = NUM_CARDS + 1
+        self.seat_stack: list[int] = [0] * max_depth
+        self.hand_stack: list[int] = [0] * max_depth
+        self.winner_stack: list[int] = [NO_PLAYER] * max_depth
+        self.winning_card_stack: list[int] = [NO_CARD] * max_depth
+        self.suit_stack: list[Optional[Suit]] = [None] * max_depth
+        self.cards_played_stack: list[int] = [0] * max_depth
+        # Cards which are still to be tried at each branching point
+        self.branches_stack: list[int] = [0] * max_depth
+        # Player who was awarded a trick when the position was entered, so that it can be undone
+        self.trick_winner_stack: list[int] = [NO_PLAYER] * max_depth
+        # Whether the player's tricks were settled when the position was entered
+        self.settled_stack: list[bool] = [False] * max_depth
+
+    def run(
+        self,
+        trump: Suit,
+        hands: list[int],
+        tricks_won: list[int],
+        current_seat: int,
+        winner_seat: int,
+        winning_card_id: int,
+        suit_to_follow: Optional[Suit],
+        cards_played: int,
+        branch_prob: int,
+        winning_freq: dict[int, int],
+        solver: Optional["DoubleDummySolver"] = None,
+        bid: Optional[int] = None,
+        bids: Optional[list[int]] = None,
+    ) -> None:
+        """
+        Plays out the round, adding the number of tricks won by the player at the end of every playout to
+        winning_freq. At every position the card chosen by the rollout policy gets played, and there is a 1 in
+        branch_prob chance of also exploring the lowest playable cards, up to max_branch_factor cards in total.
+        hands and tricks_won are restored before returning. Given a solver and the bid, a playout stops at the
+        first trick where the hands have at most double_dummy_threshold cards, and counts the bid if the player
+        can make it from there, or else the most tricks the player can win. The solver assumes the other
+        players play together against the player, so this changes the histogram, not just its noise: the
+        tricks counted are the ones the player can secure, rather than the ones it wins on average. It is only
+        worth it for choosing cards against a known bid, and the solver is not used without one. Once the player's tricks are settled, see
+        settled_tricks, a playout stops branching, as every branch would end the same, so it ends in a single
+        leaf whether it stops there or not
+
+        :param trump: trump suit for the round
+        :param hands: CardSet mask of every player's hand, indexed by seat
+        :param tricks_won: tricks won so far by every player, indexed by seat
+        :param current_seat: seat of the next player to play
+        :param winner_seat: seat of the player currently winning the trick, NO_PLAYER if nobody has played
+        :param winning_card_id: id of the card currently winning the trick, NO_CARD if nobody has played
+        :param suit_to_follow: suit to follow in the trick
+        :param cards_played: number of cards played in the round so far
+        :param branch_prob: inverse probability of branching at a position
+        :param winning_freq: histogram of the number of tricks won by the player
+        :param solver: double dummy solver for the trump and the player's seat
+        :param bid: number of tricks bid by the player, if known. The solver is only used if it is
+        :param bids: bid of every player for the rollout policy, indexed by seat, NO_BID if it is not known
+        """
+        num_players: int = self.num_players
+        player_seat: int = self.player_seat
+        max_branch_factor: int = self.max_branch_factor
+        policy: RolloutPolicy = self.policy
+        bids = [NO_BID] * num_players if bids is None else bids
+        solver_threshold: int = (
+            self.double_dummy_threshold if solver is not None and bid is not None else 0
+        )
+        strength_tables: tuple[tuple[int, ...], ...] = TRICK_STRENGTHS[trump]
+        seat_stack: list[int] = self.seat_stack
+        hand_stack: list[int] = self.hand_stack
+        winner_stack: list[int] = self.winner_stack
+        winning_card_stack: list[int] = self.winning_card_stack
+        suit_stack: list[Optional[Suit]] = self.suit_stack
+        cards_played_stack: list[int] = self.cards_played_stack
+        branches_stack: list[int] = self.branches_stack
+        trick_winner_stack: list[int] = self.trick_winner_stack
+        settled_stack: list[bool] = self.settled_stack
+        stop_settled: bool = self.stop_settled
+
+        depth: int = -1
+        settled: bool = False
+        while True:
+            # Enter the position (current_seat, winner_seat, winning_card_id, suit_to_follow, cards_played)
+            trick_winner: int = NO_PLAYER
+            round_over: bool = False
+            if cards_played > 0 and cards_played % num_players == 0:
+                trick_winner = winner_seat
+                tricks_won[trick_winner] += 1
+                current_seat = trick_winner
+                winner_seat = NO_PLAYER
+                winning_card_id = NO_CARD
+                suit_to_follow = None
+
+                cards_left: int = hands[current_seat].bit_count()
+                tricks_won_by_player: int = NOT_SETTLED
+                if cards_left <= solver_threshold:
+                    tricks_won_by_player = tricks_won[player_seat]
+                    if cards_left > 0:
+                        if solver.can_make_bid(
+                            hands, current_seat, bid - tricks_won_by_player
+                        ):
+                            tricks_won_by_player = bid
+                        else:
+                            tricks_won_by_player += solver.max_tricks(
+                                hands, current_seat
+                            )
+                elif not settled:
+                    tricks_won_by_player = self.settled_tricks(
+                        hands, tricks_won, current_seat, cards_left
+                    )
+                    if tricks_won_by_player != NOT_SETTLED and not stop_settled:
+                        settled = True
+                        tricks_won_by_player = NOT_SETTLED
+                if tricks_won_by_player != NOT_SETTLED:
+                    winning_freq[tricks_won_by_player] = (
+                        winning_freq.get(tricks_won_by_player, 0) + 1
+                    )
+                    tricks_won[trick_winner] -= 1
+                    round_over = True
+
+            if not round_over:
+                playable: int = playable_mask(hands[current_seat], suit_to_follow)
+                branches: int = policy.choose(
+                    playable,
+                    current_seat,
+                    strength_tables[
+                        Suit.NONE if suit_to_follow is None else suit_to_follow
+                    ],
+                    winning_card_id,
+                    tricks_won,
+                    bids,
+                )
+                if not settled and self.rng.randint(1, branch_prob) == 1:
+                    playable ^= branches
+                    for i in range(max_branch_factor - 1):
+                        if playable == 0:
+                            break
+                        low: int = playable & -playable
+                        branches |= low
+                        playable ^= low
+
+                depth += 1
+                seat_stack[depth] = current_seat
+                hand_stack[depth] = hands[current_seat]
+                winner_stack[depth] = winner_seat
+                winning_card_stack[depth] = winning_card_id
+                suit_stack[depth] = suit_to_follow
+                cards_played_stack[depth] = cards_played
+                branches_stack[depth] = branches
+                trick_winner_stack[depth] = trick_winner
+                settled_stack[depth] = settled
+
+            # Find the next card to play, undoing every position whose branches have all been explored
+            while depth >= 0 and branches_stack[depth] == 0:
+                hands[seat_stack[depth]] = hand_stack[depth]
+                if trick_winner_stack[depth] != NO_PLAYER:
+                    tricks_won[trick_winner_stack[depth]] -= 1
+                depth -= 1
+
+            if depth < 0:
+                return
+
+            # Play the next card of the position on top of the stack
+            branches: int = branches_stack[depth]
+            card_mask: int = branches & -branches
+            branches_stack[depth] = branches ^ card_mask
+            card_id: int = card_mask.bit_length()
+
+            current_seat = seat_stack[depth]
+            hands[current_seat] = hand_stack[depth] ^ card_mask
+            winner_seat = winner_stack[depth]
+            winning_card_id = winning_card_stack[depth]
+            suit_to_follow = suit_stack[depth]
+            cards_played = cards_played_stack[depth] + 1
+            settled = settled_stack[depth]
+
+            strengths: tuple[int, ...] = strength_tables[
+                Suit.NONE if suit_to_follow is None else suit_to_follow
+            ]
+            if strengths[card_id] > strengths[winning_card_id]:
+                # Equivalent to get_new_suit_to_follow
+                if IS_WIZARD[card_id]:
+                    if suit_to_follow == Suit.NONE:
+                        suit_to_follow = None
+                elif (
+                    suit_to_follow is None and winning_card_id == NO_CARD
+                ) or suit_to_follow == Suit.NONE:
+                    suit_to_follow = CARD_SUITS[card_id]
+                winner_seat = current_seat
+                winning_card_id = card_id
+
+            current_seat = (current_seat + 1) % num_players
+
+    def settled_tricks(
+        self, hands: list[int], tricks_won: list[int], leader_seat: int, cards_left: int
+    ) -> int:
+        """
+        Checks, at the start of a trick, for hands which settle the number of tricks the player ends the round
+        with whatever gets played:
+        - every card left is a jester, so the leader wins every trick
+        - the player only has jesters, and the others have too few of them for a trick of jesters only
+        - the player only has wizards, and the others have none
+
+        :param hands: CardSet mask of every player's hand, indexed by seat
+        :param tricks_won: tricks won so far by every player, indexed by seat
+        :param leader_seat: seat of the player who leads the trick
+        :param cards_left: number of cards left in every hand
+        :return: number of tricks the player ends the round with, NOT_SETTLED if it is not settled yet
+        """
+        player_hand: int = hands[self.player_seat]
+        only_jesters: bool = player_hand & ~JESTER_MASK == 0
+        if not only_jesters and player_hand & ~WIZARD_MASK:
+            return NOT_SETTLED
+
+        other_cards: int = 0
+        for seat, hand in enumerate(hands):
+            if seat != self.player_seat:
+                other_cards |= hand
+        tricks: int = tricks_won[self.player_seat]
+        if only_jesters:
+            if other_cards & ~JESTER_MASK == 0:
+                return tricks + cards_left if leader_seat == self.player_seat else tricks
+            if (other_cards & JESTER_MASK).bit_count() < self.num_players - 1:
+                return tricks
+        elif other_cards & WIZARD_MASK == 0:
+            return tricks + cards_left
+        return NOT_SETTLED
@@ -0,0 +1,37 @@
+import random
+from typing import Union
+
+import numpy as np
+
+
+class Rng:
+    """
+    Random streams of a game, player or simulator: a random.Random for the code which works on one deal at a
+    time and a NumPy Generator for the batched code. Both come from one SeedSequence, which spawn splits into
+    independent child streams, so that a whole run, worker processes included, can be replayed from its root
+    seed
+    """
+
+    def __init__(self, seed: Union[None, int, np.random.SeedSequence] = None) -> None:
+        """
+        :param seed: root seed or SeedSequence of the streams. Fresh entropy from the OS if None
+        """
+        super().__init__()
+        self.seed_sequence: np.random.SeedSequence = (
+            seed
+            if isinstance(seed, np.random.SeedSequence)
+            else np.random.SeedSequence(seed)
+        )
+        scalar_sequence, array_sequence = self.seed_sequence.spawn(2)
+        self.random: random.Random = random.Random(
+            int.from_bytes(scalar_sequence.generate_state(4).tobytes(), "little")
+        )
+        self.generator: np.random.Generator = np.random.default_rng(array_sequence)
+
+    def spawn(self, n: int) -> list["Rng"]:
+        """:return: n new streams, independent of this one and of each other"""
+        return [Rng(child) for child in self.seed_sequence.spawn(n)]
+
+    def spawn_one(self) -> "Rng":
+        return self.spawn(1)[0]
+
@@ -0,0 +1,154 @@
+from abc import ABC, abstractmethod
+from typing import Optional
+
+from WizardAI.Card import NO_CARD_STRENGTH
+
+NO_BID = -1
+
+
+def weakest_card(
+    playable: int, strengths: tuple[int, ...], above: int = NO_CARD_STRENGTH
+) -> int:
+    """
+    :param playable: CardSet mask of the cards to choose from
+    :param strengths: strength of every card in the trick, indexed by card id
+    :param above: only cards stronger than this are considered
+    :return: CardSet mask of the weakest card stronger than above, 0 if there is none. Ties go to the card with
+             the lowest id
+    """
+    best_mask: int = 0
+    best_strength: int = 0
+    while playable:
+        card_mask: int = playable & -playable
+        playable ^= card_mask
+        strength: int = strengths[card_mask.bit_length()]
+        if strength > above and (best_mask == 0 or strength < best_strength):
+            best_mask = card_mask
+            best_strength = strength
+    return best_mask
+
+
+def strongest_card(playable: int, strengths: tuple[int, ...]) -> int:
+    """:return: CardSet mask of the strongest card in a non-empty mask. Ties go to the card with the lowest id"""
+    best_mask: int = 0
+    best_strength: int = NO_CARD_STRENGTH
+    while playable:
+        card_mask: int = playable & -playable
+        playable ^= card_mask
+        strength: int = strengths[card_mask.bit_length()]
+        if strength > best_strength:
+            best_mask = card_mask
+            best_strength = strength
+    return best_mask
+
+
+class RolloutPolicy(ABC):
+    """Chooses the card a player plays at a position of a playout"""
+
+    @abstractmethod
+    def choose(
+        self,
+        playable: int,
+        seat: int,
+        strengths: tuple[int, ...],
+        winning_card_id: int,
+        tricks_won: list[int],
+        bids: list[int],
+    ) -> int:
+        """
+        :param playable: CardSet mask of the cards the player can play, not empty
+        :param seat: seat of the player
+        :param strengths: strength of every card in the trick, indexed by card id, see Card.TRICK_STRENGTHS
+        :param winning_card_id: id of the card currently winning the trick, NO_CARD if nobody has played
+        :param tricks_won: tricks won so far by every player, indexed by seat
+        :param bids: bid of every player, indexed by seat, NO_BID if it is not known
+        :return: CardSet mask of the card to play
+        """
+        raise Exception("Unimplemented")
+
+
+class LowestIdPolicy(RolloutPolicy):
+    """Plays the playable card with the lowest id, whatever the trick"""
+
+    def choose(
+        self,
+        playable: int,
+        seat: int,
+        strengths: tuple[int, ...],
+        winning_card_id: int,
+        tricks_won: list[int],
+        bids: list[int],
+    ) -> int:
+        return playable & -playable
+
+
+class WinCheaplyPolicy(RolloutPolicy):
+    """
+    Wins the trick with the weakest card which beats the current winner, or else throws the weakest card. Leads
+    the strongest card
+    """
+
+    def choose(
+        self,
+        playable: int,
+        seat: int,
+        strengths: tuple[int, ...],
+        winning_card_id: int,
+        tricks_won: list[int],
+        bids: list[int],
+    ) -> int:
+        winning_strength: int = strengths[winning_card_id]
+        if winning_strength == NO_CARD_STRENGTH:
+            return strongest_card(playable, strengths)
+        return weakest_card(playable, strengths, winning_strength) or weakest_card(
+            playable, strengths
+        )
+
+
+class DuckLowestPolicy(RolloutPolicy):
+    """Throws the weakest card, which loses the trick whenever any card would"""
+
+    def choose(
+        self,
+        playable: int,
+        seat: int,
+        strengths: tuple[int, ...],
+        winning_card_id: int,
+        tricks_won: list[int],
+        bids: list[int],
+    ) -> int:
+        return weakest_card(playable, strengths)
+
+
+class PlayToBidPolicy(RolloutPolicy):
+    """
+    Wins tricks cheaply while the player still needs tricks to make its bid, and ducks once it has made it.
+    Players whose bid is not known play as the fallback policy says
+    """
+
+    def __init__(self, fallback: Optional[RolloutPolicy] = None) -> None:
+        super().__init__()
+        self.fallback: RolloutPolicy = (
+            WinCheaplyPolicy() if fallback is None else fallback
+        )
+        self.win_cheaply: RolloutPolicy = WinCheaplyPolicy()
+        self.duck_lowest: RolloutPolicy = DuckLowestPolicy()
+
+    def choose(
+        self,
+        playable: int,
+        seat: int,
+        strengths: tuple[int, ...],
+        winning_card_id: int,
+        tricks_won: list[int],
+        bids: list[int],
+    ) -> int:
+        if bids[seat] == NO_BID:
+            policy: RolloutPolicy = self.fallback
+        elif tricks_won[seat] < bids[seat]:
+            policy = self.win_cheaply
+        else:
+            policy = self.duck_lowest
+        return policy.choose(
+            playable, seat, strengths, winning_card_id, tricks_won, bids
+        )
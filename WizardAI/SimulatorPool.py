@@ -0,0 +1,166 @@
+import os
+from concurrent.futures import Future, ProcessPoolExecutor
+from typing import TYPE_CHECKING, Iterable, Optional
+
+from WizardAI.Card import Card, Suit
+from WizardAI.Rng import Rng
+
+if TYPE_CHECKING:
+    from WizardAI.MonteCarloPlayer import MonteCarloSimulator
+
+
+def merge_histograms(histograms: Iterable[dict[int, int]]) -> dict[int, int]:
+    merged: dict[int, int] = dict()
+    for histogram in histograms:
+        for tricks_won, freq in histogram.items():
+            merged[tricks_won] = merged.get(tricks_won, 0) + freq
+    return merged
+
+
+def split_playouts(num_playouts: int, num_chunks: int) -> list[int]:
+    """:return: sizes of at most num_chunks non-empty chunks adding up to num_playouts"""
+    num_chunks = max(1, min(num_chunks, num_playouts))
+    return [
+        num_playouts // num_chunks + (1 if i < num_playouts % num_chunks else 0)
+        for i in range(num_chunks)
+    ]
+
+
+def _init_worker() -> None:
+    # Build the card, strength and mask tables once per worker instead of on its first task
+    import WizardAI.MonteCarloPlayer
+
+
+def _bid_histogram_task(
+    simulator: "MonteCarloSimulator", num_playouts: int, rng: Rng
+) -> dict[int, int]:
+    simulator.set_rng(rng)
+    return simulator.bid_histogram(num_playouts)
+
+
+def _card_histogram_task(
+    simulator: "MonteCarloSimulator", card: Card, num_playouts: int, rng: Rng
+) -> dict[int, int]:
+    simulator.set_rng(rng)
+    return simulator.card_histogram(card, num_playouts)
+
+
+def _common_card_histograms_task(
+    simulator: "MonteCarloSimulator", cards: list[Card], num_playouts: int, rng: Rng
+) -> dict[Card, dict[int, int]]:
+    simulator.set_rng(rng)
+    return simulator.common_card_histograms(cards, num_playouts)
+
+
+def _trump_histograms_task(
+    simulator: "MonteCarloSimulator", num_playouts: int, rng: Rng
+) -> dict[Suit, dict[int, int]]:
+    simulator.set_rng(rng)
+    return simulator.trump_histograms(num_playouts)
+
+
+class SimulatorPool:
+    """
+    Pool of worker processes which stays alive across decisions and games. The playouts of a decision are
+    split across the workers and the histograms they return are merged
+    """
+
+    def __init__(self, num_workers: Optional[int] = None) -> None:
+        super().__init__()
+        self.num_workers: int = (
+            num_workers if num_workers is not None else os.cpu_count() or 1
+        )
+        self.executor: ProcessPoolExecutor = ProcessPoolExecutor(
+            max_workers=self.num_workers, initializer=_init_worker
+        )
+
+    def bid_histogram(
+        self, simulator: "MonteCarloSimulator", num_playouts: int
+    ) -> dict[int, int]:
+        """Parallel version of MonteCarloSimulator.bid_histogram"""
+        chunk_sizes: list[int] = split_playouts(num_playouts, self.num_workers)
+        futures: list[Future] = [
+            self.executor.submit(_bid_histogram_task, simulator, chunk_size, rng)
+            for chunk_size, rng in zip(
+                chunk_sizes, simulator.rng.spawn(len(chunk_sizes))
+            )
+        ]
+        return merge_histograms(future.result() for future in futures)
+
+    def trump_histograms(
+        self, simulator: "MonteCarloSimulator", num_playouts: int
+    ) -> dict[Suit, dict[int, int]]:
+        """
+        Parallel version of MonteCarloSimulator.trump_histograms. Every worker evaluates all the suits on its
+        own share of the deals
+        """
+        chunk_sizes: list[int] = split_playouts(num_playouts, self.num_workers)
+        futures: list[Future] = [
+            self.executor.submit(_trump_histograms_task, simulator, chunk_size, rng)
+            for chunk_size, rng in zip(
+                chunk_sizes, simulator.rng.spawn(len(chunk_sizes))
+            )
+        ]
+        chunk_histograms: list[dict[Suit, dict[int, int]]] = [
+            future.result() for future in futures
+        ]
+        return {
+            suit: merge_histograms(histograms[suit] for histograms in chunk_histograms)
+            for suit in Suit.all_suits
+        }
+
+    def card_histograms(
+        self, simulator: "MonteCarloSimulator", cards: list[Card], num_playouts: int
+    ) -> dict[Card, dict[int, int]]:
+        """Parallel version of MonteCarloSimulator.card_histogram, for every card in cards"""
+        # Split each card's playouts so that every worker has something to do, even with few cards
+        num_chunks: int = -(-self.num_workers // max(1, len(cards)))
+        chunk_sizes: list[int] = split_playouts(num_playouts, num_chunks)
+        futures: dict[Card, list[Future]] = {
+            card: [
+                self.executor.submit(
+                    _card_histogram_task, simulator, card, chunk_size, rng
+                )
+                for chunk_size, rng in zip(
+                    chunk_sizes, simulator.rng.spawn(len(chunk_sizes))
+                )
+            ]
+            for card in cards
+        }
+        return {
+            card: merge_histograms(future.result() for future in card_futures)
+            for card, card_futures in futures.items()
+        }
+
+    def common_card_histograms(
+        self, simulator: "MonteCarloSimulator", cards: list[Card], num_playouts: int
+    ) -> dict[Card, dict[int, int]]:
+        """
+        Parallel version of MonteCarloSimulator.common_card_histograms. Every worker evaluates all the cards
+        on its own share of the deals
+        """
+        chunk_sizes: list[int] = split_playouts(num_playouts, self.num_workers)
+        futures: list[Future] = [
+            self.executor.submit(
+                _common_card_histograms_task, simulator, cards, chunk_size, rng
+            )
+            for chunk_size, rng in zip(
+                chunk_sizes, simulator.rng.spawn(len(chunk_sizes))
+            )
+        ]
+        chunk_histograms: list[dict[Card, dict[int, int]]] = [
+            future.result() for future in futures
+        ]
+        return {
+            card: merge_histograms(histograms[card] for histograms in chunk_histograms)
+            for card in cards
+        }
+
+    def shutdown(self) -> None:
+        self.executor.shutdown()
+
+    def __enter__(self) -> "SimulatorPool":
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb) -> None:
+        self.shutdown()
@@ -0,0 +1,113 @@
+from typing import Iterable
+
+from WizardAI.Card import Suit
+from WizardAI.CardSet import SUIT_MASKS
+
+SUIT_SIZE = 13
+SUIT_CHUNK = (1 << SUIT_SIZE) - 1
+NUM_SUITED_IDS = SUIT_SIZE * len(Suit.all_suits)
+
+# Relabelling of the suits: permutation[suit] is the suit that suit becomes. Wizards and jesters are left alone
+Permutation = tuple[int, ...]
+
+# Key of a position, see canonicalize: hand, trump, seen cards and the ids of the cards in the trick
+PositionKey = tuple[int, Suit, int, tuple[int, ...]]
+
+
+def inverse(permutation: Permutation) -> Permutation:
+    inverse_permutation: list[int] = [0] * len(permutation)
+    for suit, new_suit in enumerate(permutation):
+        inverse_permutation[new_suit] = suit
+    return tuple(inverse_permutation)
+
+
+def permute_mask(mask: int, permutation: Permutation) -> int:
+    """:return: CardSet mask with the cards of every suit moved to the same ranks of the suit it maps to"""
+    permuted: int = mask & SUIT_MASKS[Suit.NONE]
+    for suit, new_suit in enumerate(permutation):
+        permuted |= ((mask >> (SUIT_SIZE * suit)) & SUIT_CHUNK) << (SUIT_SIZE * new_suit)
+    return permuted
+
+
+def permute_suit(suit: Suit, permutation: Permutation) -> Suit:
+    if suit == Suit.NONE:
+        return suit
+    return Suit(permutation[suit])
+
+
+def permute_card_id(card_id: int, permutation: Permutation) -> int:
+    """Wizards and jesters, which have no suit, keep their id"""
+    if card_id > NUM_SUITED_IDS:
+        return card_id
+    suit, rank_idx = divmod(card_id - 1, SUIT_SIZE)
+    return permutation[suit] * SUIT_SIZE + rank_idx + 1
+
+
+def canonical_permutation(
+    hand: int, trump: Suit, seen: int = 0, trick: Iterable[int] = ()
+) -> Permutation:
+    """
+    :return: permutation which maps the trump suit to blue, and the other suits (all of them without trumps)
+             to the remaining ones in decreasing order of their cards in the hand, the seen cards and the trick.
+             Suits which tie are interchangeable, so the order they get is irrelevant
+    """
+    trick = tuple(trick)
+
+    def signature(suit: int) -> tuple[int, int, tuple[tuple[int, int], ...]]:
+        return (
+            (hand >> (SUIT_SIZE * suit)) & SUIT_CHUNK,
+            (seen >> (SUIT_SIZE * suit)) & SUIT_CHUNK,
+            tuple(
+                (position, card_id)
+                for position, card_id in enumerate(trick)
+                if card_id <= NUM_SUITED_IDS and (card_id - 1) // SUIT_SIZE == suit
+            ),
+        )
+
+    free_suits: list[int] = [suit for suit in Suit.all_suits if suit != trump]
+    free_suits.sort(key=signature, reverse=True)
+    permutation: list[int] = [0] * len(Suit.all_suits)
+    new_suits: list[int] = list(Suit.all_suits)
+    if trump != Suit.NONE:
+        permutation[trump] = Suit.BLUE
+        new_suits.remove(Suit.BLUE)
+    for suit, new_suit in zip(free_suits, new_suits):
+        permutation[suit] = new_suit
+    return tuple(permutation)
+
+
+def canonicalize(
+    hand: int, trump: Suit, seen: int = 0, trick: Iterable[int] = ()
+) -> tuple[PositionKey, Permutation]:
+    """
+    Maps a position to the same key as every position which only differs from it by relabelling the suits
+
+    :param hand: CardSet mask of the hand
+    :param trump: trump suit, Suit.NONE if there is none
+    :param seen: CardSet mask of the cards which are known not to be in the other players' hands
+    :param trick: ids of the cards played in the current trick, in order
+    :return: key of the position, and the permutation it was built with. Cards and suits chosen for the key's
+             position map back to the original one with restore_card_id and restore_suit
+    """
+    trick = tuple(trick)
+    permutation: Permutation = canonical_permutation(hand, trump, seen, trick)
+    key: PositionKey = (
+        permute_mask(hand, permutation),
+        permute_suit(trump, permutation),
+        permute_mask(seen, permutation),
+        tuple(permute_card_id(card_id, permutation) for card_id in trick),
+    )
+    return key, permutation
+
+
+def restore_card_id(card_id: int, permutation: Permutation) -> int:
+    """:return: id of the card in the original position of a card in the canonical one"""
+    return permute_card_id(card_id, inverse(permutation))
+
+
+def restore_mask(mask: int, permutation: Permutation) -> int:
+    return permute_mask(mask, inverse(permutation))
+
+
+def restore_suit(suit: Suit, permutation: Permutation) -> Suit:
+    return permute_suit(suit, inverse(permutation))
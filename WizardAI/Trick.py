@@ -1,6 +1,6 @@
 from typing import Optional
 
-from WizardGame.Card import Card, CardType, Suit, compare_cards
+from WizardAI.Card import Card, CardType, Suit, wins_trick
 
 
 class Trick:
@@ -23,7 +23,7 @@ class Trick:
                     self.suit_to_follow = card.suit
 
             else:
-                if compare_cards(self.winner_card, card, self.trump) < 0:
+                if wins_trick(card, self.winner_card, self.trump, self.suit_to_follow):
                     if card.card_type == CardType.WIZARD:
                         self.is_wizard_played = True
                         if self.suit_to_follow == Suit.NONE:
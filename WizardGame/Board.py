@@ -1,7 +1,9 @@
-from typing import Optional
+from typing import Callable, Optional
 
 from WizardGame.Card import Card, Suit
+from WizardGame.Constants import NUM_CARDS
 from WizardGame.PlayerBid import PlayerBid
+from WizardGame.SeenCards import SeenCards
 
 
 class Board:
@@ -18,6 +20,8 @@ class Board:
     ) -> None:
         super().__init__()
         self.played_cards: set[int] = set() if trump_card is None else {hash(trump_card)}
+        # Same cards as played_cards, with their counts by suit and rank
+        self.seen_cards: SeenCards = SeenCards(() if trump_card is None else (trump_card,))
         self.player_played_cards: dict[str, set[Card]] = dict()
         self.player_bids: dict[str, PlayerBid] = player_bids
         self.player_scores: dict[str, int] = player_scores
@@ -26,14 +30,18 @@ class Board:
         self.next_player_lookup: dict[str, str] = next_player_lookup
         self.trump = trump
         self.num_players = len(self.player_scores)
+        # Called with the player and the card every time a card is played
+        self.card_played_listeners: list[Callable[[str, Card], None]] = []
 
     def card_played(self, player: str, card: Card) -> None:
         self.played_cards.add(hash(card))
-        invalid_cards = [c for c in self.played_cards if c > 60]
-        if len(invalid_cards):
+        if hash(card) > NUM_CARDS:
             print("error!!")
+        self.seen_cards.add(card)
         self.player_played_cards.setdefault(player, set()).add(card)
         self.turn = self.next_player_lookup[player]
+        for listener in self.card_played_listeners:
+            listener(player, card)
 
     def trick_won(self, player: str) -> None:
         self.player_bids[player].trick_won()
@@ -0,0 +1,68 @@
+from typing import Iterable
+
+import numpy as np
+
+from WizardGame.Card import Card, CardType, Suit
+from WizardGame.Constants import CARDS_PER_SUIT
+from WizardGame.SeenCards import SeenCards
+
+RANKS = np.arange(CARDS_PER_SUIT + 2)
+
+
+def unseen_count_arrays(cards_seen: SeenCards) -> tuple[np.ndarray, np.ndarray]:
+    """
+    :return: number of unseen cards of every suit, indexed by suit, with 0 for Suit.NONE, and number of unseen
+             cards of every suit below every rank, indexed by suit and rank, see SeenCards.unseen_below
+    """
+    unseen_in_suit: np.ndarray = np.zeros(len(Suit.values), dtype=np.int64)
+    unseen_in_suit[: len(Suit.all_suits)] = CARDS_PER_SUIT - np.array(
+        cards_seen.suit_counts[: len(Suit.all_suits)]
+    )
+    unseen_below: np.ndarray = RANKS - 1 - np.array(cards_seen.seen_below)
+    return unseen_in_suit, unseen_below
+
+
+def win_probabilities(
+    hand: list[Card],
+    cards_seen: SeenCards,
+    num_players: int,
+    trumps: Iterable[Suit] = Suit.all_suits,
+) -> np.ndarray:
+    """
+    Probability of every card in the hand winning a trick it leads, under every trump, as worked out by
+    ProbabilisticAIPlayer.uniform_probability_of_card_winning: a card wins if every other player plays one of
+    the unseen cards which lose against it
+
+    :param hand: cards to calculate probabilities for
+    :param cards_seen: cards seen so far in the round. Includes own hand + trump
+    :param num_players: number of players in the game
+    :param trumps: trump suits to calculate probabilities for, Suit.NONE for no trumps
+    :return: array of probabilities, with one row per card and one column per trump
+    """
+    trumps: np.ndarray = np.array(list(trumps), dtype=np.int64)
+    suits: np.ndarray = np.array([card.suit for card in hand], dtype=np.int64)
+    ranks: np.ndarray = np.array([card.card_type for card in hand], dtype=np.int64)
+    unseen_in_suit, unseen_below = unseen_count_arrays(cards_seen)
+
+    suited: np.ndarray = suits != Suit.NONE
+    # Lower cards of the same suit, and every card of the suits which are neither the card's nor the trump
+    losing_cards: np.ndarray = np.zeros(len(hand), dtype=np.int64)
+    losing_cards[suited] = unseen_below[suits[suited], ranks[suited]]
+    losing_cards = (
+        losing_cards[:, None]
+        + unseen_in_suit.sum()
+        - unseen_in_suit[suits][:, None]
+        - unseen_in_suit[trumps][None, :] * (trumps[None, :] != suits[:, None])
+        + cards_seen.unseen_jesters()
+    )
+
+    # Chance of the other players all drawing losing cards, one after the other
+    draws: np.ndarray = np.arange(num_players - 1)
+    cards_left: np.ndarray = np.maximum(cards_seen.unseen() - draws, 1)
+    probabilities: np.ndarray = np.prod(
+        np.maximum(losing_cards[:, :, None] - draws, 0) / cards_left, axis=2
+    )
+
+    probabilities[ranks == CardType.WIZARD] = 1.0
+    probabilities[ranks == CardType.JESTER] = 0.0
+    return probabilities
@@ -0,0 +1,52 @@
+from collections import OrderedDict
+from typing import Hashable, Optional
+
+DEFAULT_MAX_SIZE = 4096
+
+
+class ProbabilityCache:
+    """Bounded cache of probabilities, which evicts the least recently used entry once it is full"""
+
+    def __init__(self, max_size: int = DEFAULT_MAX_SIZE) -> None:
+        super().__init__()
+        self.max_size: int = max_size
+        self.entries: OrderedDict[Hashable, float] = OrderedDict()
+        self.hits: int = 0
+        self.misses: int = 0
+
+    def get(self, key: Hashable) -> Optional[float]:
+        """:return: probability stored for key, None if there is none"""
+        probability: Optional[float] = self.entries.get(key)
+        if probability is None:
+            self.misses += 1
+        else:
+            self.hits += 1
+            self.entries.move_to_end(key)
+        return probability
+
+    def put(self, key: Hashable, probability: float) -> None:
+        self.entries[key] = probability
+        self.entries.move_to_end(key)
+        if len(self.entries) > self.max_size:
+            self.entries.popitem(last=False)
+
+    def clear(self) -> None:
+        """Drops every entry and resets the statistics"""
+        self.entries.clear()
+        self.hits = 0
+        self.misses = 0
+
+    def lookups(self) -> int:
+        return self.hits + self.misses
+
+    def hit_rate(self) -> float:
+        """:return: fraction of the lookups which found a probability, 0 if there were none"""
+        if self.lookups() == 0:
+            return 0.0
+        return self.hits / self.lookups()
+
+    def __str__(self) -> str:
+        return (
+            f"{len(self.entries)} entries, {self.hits}/{self.lookups()} hits "
+            f"({self.hit_rate():.1%})"
+        )
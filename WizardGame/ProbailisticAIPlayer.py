@@ -1,29 +1,75 @@
+import math
 import random
+from functools import lru_cache
 from typing import Iterable, Optional, FrozenSet
 
+import numpy as np
+
 from WizardGame.Board import Board
-from WizardGame.Card import Suit, Card, CardType, compare_cards, build_deck
-from WizardGame.Constants import CARDS_PER_SUIT, NUM_CARDS, NUM_JESTERS
+from WizardGame.Card import Suit, Card, CardType, compare_cards
+from WizardGame.HandEvaluator import win_probabilities
 from WizardGame.Player import Player
 from WizardGame.PlayerBid import PlayerBid
+from WizardGame.ProbabilityCache import DEFAULT_MAX_SIZE, ProbabilityCache
+from WizardGame.SeenCards import SeenCards
 from WizardGame.Trick import Trick
 
 TRICK_WIN_THRESHOLD: float = 0.5
 
 
+@lru_cache(maxsize=None)
+def binomial(n: int, k: int) -> int:
+    """Number of ways of choosing k cards out of n, 0 if k > n"""
+    return math.comb(n, k)
+
+
+def unseen_losing_cards(
+    card_to_beat: Card, suit: Suit, trump: Suit, cards_seen: SeenCards
+) -> int:
+    """:return: number of unseen cards of a suit which lose against card_to_beat if it is played first"""
+    if card_to_beat.card_type == CardType.WIZARD:
+        return cards_seen.unseen_in_suit(suit)
+    if card_to_beat.card_type == CardType.JESTER:
+        return 0
+    if suit == card_to_beat.suit:
+        return cards_seen.unseen_below(suit, card_to_beat.card_type + 1)
+    if card_to_beat.suit == trump or suit != trump:
+        return cards_seen.unseen_in_suit(suit)
+    return 0
+
+
+def suits_mask(suits: Iterable[Suit]) -> int:
+    mask: int = 0
+    for suit in suits:
+        mask |= 1 << suit
+    return mask
+
+
 # TODO: Possibilities to consider
 # All/only jesters round
 class ProbabilisticAIPlayer(Player):
-    def __init__(self, name: str, num_players: int) -> None:
+    def __init__(
+        self,
+        name: str,
+        num_players: int,
+        cache_size: int = DEFAULT_MAX_SIZE,
+        use_player_info: bool = False,
+    ) -> None:
+        """
+        :param use_player_info: whether to track which suits every player has run out of, from every card
+                                played in the round, and, once some player has, work out the chance of winning
+                                a trick with probability_of_card_winning_with_player_info
+        """
         super().__init__(name, num_players)
         self.player_suits_left: dict[str, set[Suit]] = dict()
         self.player_suit_exhausted: bool = False
-
-    def any_suit_exhausted(self) -> bool:
-        for suits_left in self.player_suits_left.values():
-            if len(suits_left) < len(Suit.all_suits):
-                return True
-        return False
+        self.use_player_info: bool = use_player_info
+        # Own hand, trump card and cards played in the round
+        self.cards_seen: SeenCards = SeenCards()
+        # Trick being played, rebuilt from the cards played to know the suit every card had to follow
+        self.current_trick: Trick = Trick(Suit.NONE)
+        # Probabilities worked out in the current round
+        self.probability_cache: ProbabilityCache = ProbabilityCache(cache_size)
 
     def set_board(self, board: Board) -> None:
         super().set_board(board)
@@ -32,37 +78,49 @@ class ProbabilisticAIPlayer(Player):
             for player in board.player_scores
         }
         self.player_suit_exhausted = False
-
-    def update_player_suits_left(self, trick: Trick) -> None:
-        for player, card in trick.cards.items():
-            if (
-                trick.suit_to_follow in Suit.all_suits
-                and card.suit != Suit.NONE
-                and card.suit != trick.suit_to_follow
-            ):
-                if trick.suit_to_follow in self.player_suits_left[player]:
-                    self.player_suits_left[player].remove(trick.suit_to_follow)
+        self.current_trick = Trick(board.trump)
+        self.cards_seen = board.seen_cards.copy()
+        for card in self.hand:
+            self.cards_seen.add(card)
+        board.card_played_listeners.append(self.card_played)
+        if self.probability_cache.lookups() > 0:
+            print(f"{self.name}: probability cache - {self.probability_cache}")
+        self.probability_cache.clear()
+
+    def card_played(self, player: str, card: Card) -> None:
+        """Meant to be registered as a listener of Board.card_played"""
+        self.cards_seen.add(card)
+        if self.use_player_info:
+            self.update_player_suits_left(player, card, self.current_trick.suit_to_follow)
+        self.current_trick.play_card(player, card)
+        if len(self.current_trick.cards) == self.board.num_players:
+            self.current_trick = Trick(self.board.trump)
+
+    def update_player_suits_left(
+        self, player: str, card: Card, suit_to_follow: Optional[Suit]
+    ) -> None:
+        """A player who plays a card of another suit than the one to follow has run out of it"""
+        if (
+            suit_to_follow in Suit.all_suits
+            and card.suit != Suit.NONE
+            and card.suit != suit_to_follow
+            and suit_to_follow in self.player_suits_left[player]
+        ):
+            self.player_suits_left[player].remove(suit_to_follow)
+            self.player_suit_exhausted = True
 
     def select_card(self, trick: Trick, cards_to_play: set[Card]) -> Card:
-        self.player_suit_exhausted = self.any_suit_exhausted()
-        if self.player_suit_exhausted:
-            self.update_player_suits_left(trick)
-
         bid: PlayerBid = self.board.player_bids[self.name]
         tricks_left_to_win: int = min(
             len(self.hand), max(0, bid.expected_wins - bid.wins)
         )
-        all_cards_seen: set[int] = self.board.played_cards | set(
-            hash(card) for card in self.hand
-        )
-
         card_chances: list[(Card, float)] = [
             (
                 card,
                 self.probability_of_winning_trick(
                     card,
                     trick,
-                    all_cards_seen,
+                    self.cards_seen,
                 ),
             )
             for card in cards_to_play
@@ -77,7 +135,7 @@ class ProbabilisticAIPlayer(Player):
                     self.probability_of_winning_trick(
                         card,
                         Trick(trick.trump),
-                        all_cards_seen,
+                        self.cards_seen,
                     ),
                 )
                 for card in cards_to_play
@@ -117,85 +175,47 @@ class ProbabilisticAIPlayer(Player):
         return max_card
 
     def select_bid(self, bids: dict[str, PlayerBid]) -> int:
-        num_bids: int = 0
         print(f"player {self.name} hand win probabilities:")
-        all_cards_seen: set[int] = (
-            set(hash(card) for card in self.hand) | self.board.played_cards
-        )
-        # TODO:
-        cards_left_per_suit: dict[Suit, int] = dict()
-        for suit in Suit.all_suits:
-            s: Suit = Suit(suit)
-            for card_type in CardType.numbers:
-                if Card.index(CardType(card_type), s, 0, 0) not in all_cards_seen:
-                    cards_left_per_suit[s] = cards_left_per_suit.setdefault(s, 0) + 1
-
-        cards_remaining: float = float(NUM_CARDS - len(all_cards_seen))
-
-        for card in self.hand:
-            probability: float = self.uniform_probability_of_card_winning(
-                card, None, self.board.trump, all_cards_seen, 0
-            )
+        hand: list[Card] = list(self.hand)
+        probabilities: np.ndarray = win_probabilities(
+            hand, self.cards_seen, self.num_players, (self.board.trump,)
+        )[:, 0]
+        for card, probability in zip(hand, probabilities):
             print(f"{card} => {probability}")
-            if probability > TRICK_WIN_THRESHOLD:
-                num_bids += 1
-        return num_bids
+        return int(np.count_nonzero(probabilities > TRICK_WIN_THRESHOLD))
 
     def choose_trump(self) -> Suit:
-        expected_card_wins_by_suit: dict[Suit, int] = dict()
-        card_win_chances_by_suit: dict[Suit, float] = dict()
-
-        max_wins: int = -1
-        max_winning_chances: float = 0.0
-
         # beginning of round - trump card must be a wizard and
         random_wizard: Card = Card(
             CardType.WIZARD, Suit.NONE, wizard_index=0, jester_index=0
         )
 
-        all_cards_seen: set[int] = set(hash(card) for card in self.hand).union(
-            {hash(random_wizard)}
+        cards_seen: SeenCards = SeenCards(self.hand)
+        cards_seen.add(random_wizard)
+        # One row per card, one column per suit
+        probabilities: np.ndarray = win_probabilities(
+            list(self.hand), cards_seen, self.num_players, Suit.all_suits
         )
-        for suit in Suit.all_suits:
-            trump_suit: Suit = Suit(suit)
-            expected_card_wins_by_suit[trump_suit] = 0
-            card_win_chances_by_suit[trump_suit] = 0.0
-            for card in self.hand:
-                winning_chance: float = self.uniform_probability_of_card_winning(
-                    card, None, trump_suit, all_cards_seen, 0
-                )
-                if winning_chance > TRICK_WIN_THRESHOLD:
-                    expected_card_wins_by_suit[trump_suit] += 1
-                card_win_chances_by_suit[trump_suit] += winning_chance
-
-            max_wins = max(max_wins, expected_card_wins_by_suit[trump_suit])
-            max_winning_chances = max(
-                max_winning_chances, card_win_chances_by_suit[trump_suit]
-            )
+        expected_card_wins_by_suit: np.ndarray = np.count_nonzero(
+            probabilities > TRICK_WIN_THRESHOLD, axis=0
+        )
+        card_win_chances_by_suit: np.ndarray = probabilities.sum(axis=0)
 
-        winning_suits: list[Suit] = [
-            suit
-            for suit, expected_wins in expected_card_wins_by_suit.items()
-            if expected_wins == max_wins
-        ]
+        winning_suits: np.ndarray = np.flatnonzero(
+            expected_card_wins_by_suit == expected_card_wins_by_suit.max()
+        )
 
         if len(winning_suits) == 1:
-            return winning_suits[0]
-
-        winning_suit: list[Suit] = [
-            suit
-            for suit, winning_chance in card_win_chances_by_suit.items()
-            if winning_chance == max_winning_chances
-        ]
+            return Suit(int(winning_suits[0]))
 
-        return winning_suit[0]
+        return Suit(int(np.argmax(card_win_chances_by_suit)))
 
     def uniform_probability_of_card_winning(
         self,
         card: Card,
         winning_card: Optional[Card],
         trump_suit: Suit,
-        cards_seen: set[int],
+        cards_seen: SeenCards,
         cards_played_in_trick: int,
     ) -> float:
         """
@@ -204,10 +224,35 @@ class ProbabilisticAIPlayer(Player):
         :param card: card to calculate probability for
         :param winning_card: current winning card in the trick
         :param trump_suit: suit of the trump card / chosen by the dealer if trump card is a wizard
-        :param cards_seen: set of indices of cards seen so far in the round. Includes own hand + trump
+        :param cards_seen: cards seen so far in the round. Includes own hand + trump
         :param cards_played_in_trick: number of cards played in the trick so far
                                       (assumes current player hasn't played yet)
         """
+        # These probabilities do not depend on the opponents' suits, which are left out of the key
+        key: tuple = (
+            hash(card),
+            trump_suit,
+            cards_seen.mask,
+            None,
+            (0 if winning_card is None else hash(winning_card), cards_played_in_trick),
+        )
+        probability: Optional[float] = self.probability_cache.get(key)
+        if probability is None:
+            probability = self.compute_uniform_probability_of_card_winning(
+                card, winning_card, trump_suit, cards_seen, cards_played_in_trick
+            )
+            self.probability_cache.put(key, probability)
+        return probability
+
+    def compute_uniform_probability_of_card_winning(
+        self,
+        card: Card,
+        winning_card: Optional[Card],
+        trump_suit: Suit,
+        cards_seen: SeenCards,
+        cards_played_in_trick: int,
+    ) -> float:
+        """Uncached uniform_probability_of_card_winning, which has the same parameters"""
         # card loses against current best
         if (
             winning_card is not None
@@ -222,7 +267,6 @@ class ProbabilisticAIPlayer(Player):
             # Not real probability, does not account for all jokers case
             return 0.0
 
-        cards_which_lose: int = 0
         suits_which_lose: Iterable[Suit] = (
             Suit(suit)
             for suit in Suit.all_suits
@@ -230,32 +274,19 @@ class ProbabilisticAIPlayer(Player):
         )
 
         # same suit
-        card_index: int = Card.index(
-            CardType.ONE, card.suit, jester_index=0, wizard_index=0
-        )
-        for i in range(card.card_type - 1):
-            if card_index + i not in cards_seen:
-                cards_which_lose += 1
+        cards_which_lose: int = cards_seen.unseen_below(card.suit, card.card_type)
 
         # non-same suit
         for suit in suits_which_lose:
-            card_index = Card.index(CardType.ONE, suit, jester_index=0, wizard_index=0)
-            for i in range(CARDS_PER_SUIT):
-                if card_index + i not in cards_seen:
-                    cards_which_lose += 1
+            cards_which_lose += cards_seen.unseen_in_suit(suit)
 
         # jester
-        for i in range(NUM_JESTERS):
-            card_index = Card.index(
-                CardType.JESTER, Suit.NONE, jester_index=i, wizard_index=0
-            )
-            if card_index + i not in cards_seen:
-                cards_which_lose += 1
+        cards_which_lose += cards_seen.unseen_jesters()
 
         if cards_which_lose == 0:
             return 0.0
 
-        cards_left: int = NUM_CARDS - len(cards_seen)
+        cards_left: int = cards_seen.unseen()
 
         probability: float = 1.0
         cards_left_in_trick: int = self.num_players - cards_played_in_trick - 1
@@ -271,16 +302,44 @@ class ProbabilisticAIPlayer(Player):
         return probability
 
     def probability_of_winning_trick(
-        self, card: Card, trick: Trick, cards_seen: set[int]
+        self, card: Card, trick: Trick, cards_seen: SeenCards
     ) -> float:
-        # if self.player_suit_exhausted:
-        #     return self.probability_of_card_winning_with_player_info(
-        #         card,
-        #         trick,
-        #         cards_seen,
-        #         len(trick.cards),
-        #     )
-        #
+        # Players who have not played yet only matter through the suits they have left, and the estimate
+        # changes once the player info gets used
+        suits_left_key: tuple[int, ...] = (
+            self.use_player_info and self.player_suit_exhausted,
+        ) + tuple(
+            sorted(
+                suits_mask(self.player_suits_left[player])
+                for player in self.board.player_scores
+                if player not in trick.cards and player != self.name
+            )
+        )
+        key: tuple = (
+            hash(card),
+            trick.trump,
+            cards_seen.mask,
+            suits_left_key,
+            tuple(hash(played_card) for played_card in trick.cards.values()),
+        )
+        probability: Optional[float] = self.probability_cache.get(key)
+        if probability is None:
+            probability = self.compute_probability_of_winning_trick(
+                card, trick, cards_seen
+            )
+            self.probability_cache.put(key, probability)
+        return probability
+
+    def compute_probability_of_winning_trick(
+        self, card: Card, trick: Trick, cards_seen: SeenCards
+    ) -> float:
+        if self.use_player_info and self.player_suit_exhausted:
+            return self.probability_of_card_winning_with_player_info(
+                card,
+                trick,
+                cards_seen,
+                len(trick.cards),
+            )
         return self.estimate_probability_of_winning_with_card(card, trick, cards_seen)
 
     # TODO: Remove duplication
@@ -288,7 +347,7 @@ class ProbabilisticAIPlayer(Player):
         self,
         card: Card,
         trick: Trick,
-        cards_seen: set[int],
+        cards_seen: SeenCards,
         cards_played_in_trick: int,
     ) -> float:
         if (
@@ -311,29 +370,17 @@ class ProbabilisticAIPlayer(Player):
         ):
             return 0.0
 
-        cards_which_lose: int = 0
-
         cards_which_lose_per_suit: dict[Suit, int] = {
             Suit(suit): 0 for suit in Suit.values
         }
 
         # same suit
-        card_index: int = Card.index(
-            CardType.ONE, card.suit, jester_index=0, wizard_index=0
+        cards_which_lose_per_suit[card.suit] = cards_seen.unseen_below(
+            card.suit, card.card_type
         )
-        for i in range(card.card_type - 1):
-            if card_index + i not in cards_seen:
-                cards_which_lose_per_suit[card.suit] += 1
-                cards_which_lose += 1
 
         # jester
-        for i in range(NUM_JESTERS):
-            card_index = Card.index(
-                CardType.JESTER, Suit.NONE, jester_index=i, wizard_index=0
-            )
-            if card_index + i not in cards_seen:
-                cards_which_lose_per_suit[Suit.NONE] += 1
-                cards_which_lose += 1
+        cards_which_lose_per_suit[Suit.NONE] = cards_seen.unseen_jesters()
 
         suits_which_lose: Iterable[Suit] = (
             Suit(suit)
@@ -343,16 +390,13 @@ class ProbabilisticAIPlayer(Player):
 
         # non-same suit
         for suit in suits_which_lose:
-            card_index = Card.index(CardType.ONE, suit, jester_index=0, wizard_index=0)
-            for i in range(CARDS_PER_SUIT):
-                if card_index + i not in cards_seen:
-                    cards_which_lose_per_suit[suit] += 1
-                    cards_which_lose += 1
+            cards_which_lose_per_suit[suit] = cards_seen.unseen_in_suit(suit)
 
+        cards_which_lose: int = sum(cards_which_lose_per_suit.values())
         if cards_which_lose == 0:
             return 0.0
 
-        cards_left: int = NUM_CARDS - len(cards_seen)
+        cards_left: int = cards_seen.unseen()
 
         cards_left_in_trick: int = self.num_players - cards_played_in_trick - 1
 
@@ -379,35 +423,51 @@ class ProbabilisticAIPlayer(Player):
         cards_left: int,
         probability: float,
     ) -> float:
-        if len(players_left) == 0:
-            return probability
-
-        player: str = players_left.pop()
-        can_play_losing_cards = False
-        player_probability: float = 0.0
-        for suit, num_cards in tuple(losing_cards_per_suit.items()):
-            if suit in self.player_suits_left[player] and num_cards > 0:
-                can_play_losing_cards = True
-                losing_cards_per_suit[suit] -= 1
-
-                player_probability += (
-                    float(num_cards)
-                    / float(cards_left)
-                    * self.probability_of_players_having_losing_cards(
-                        losing_cards_per_suit, players_left, cards_left - 1, 1.0
-                    )
-                )
-
-                losing_cards_per_suit[suit] += 1
-
-        if not can_play_losing_cards:
-            return 0.0
-
-        players_left.add(player)
-        return probability * player_probability
+        """
+        Probability of every player left drawing a losing card of a suit it still has, one player after the
+        other, out of cards_left cards. Which player draws first does not change the result, so the players
+        are taken in a fixed order and the probability of the players after the i-th one only depends on i
+        and on the losing cards left in every suit. Memoizing it on those takes polynomial time in the number
+        of players, instead of branching over every suit for every player
+
+        :param losing_cards_per_suit: number of unseen losing cards in every suit. Not modified
+        :param players_left: players who have not played in the trick yet. Not modified
+        :param cards_left: number of unseen cards
+        :param probability: probability the result gets multiplied by
+        """
+        suits: tuple[Suit, ...] = tuple(losing_cards_per_suit)
+        player_suits: tuple[set[Suit], ...] = tuple(
+            self.player_suits_left[player] for player in players_left
+        )
+        memo: dict[tuple[tuple[int, ...], int], float] = dict()
+
+        def players_probability(losing_cards: tuple[int, ...], player: int) -> float:
+            """:return: probability of the players from the given index onwards drawing losing cards"""
+            if player == len(player_suits):
+                return 1.0
+            key: tuple[tuple[int, ...], int] = (losing_cards, player)
+            if key not in memo:
+                player_probability: float = 0.0
+                for i, suit in enumerate(suits):
+                    num_cards: int = losing_cards[i]
+                    if suit in player_suits[player] and num_cards > 0:
+                        player_probability += (
+                            float(num_cards)
+                            / float(cards_left - player)
+                            * players_probability(
+                                losing_cards[:i] + (num_cards - 1,) + losing_cards[i + 1 :],
+                                player + 1,
+                            )
+                        )
+                memo[key] = player_probability
+            return memo[key]
+
+        return probability * players_probability(
+            tuple(losing_cards_per_suit.values()), 0
+        )
 
     def estimate_probability_of_winning_with_card(
-        self, card: Card, trick: Trick, cards_seen: set[int]
+        self, card: Card, trick: Trick, cards_seen: SeenCards
     ) -> float:
         players_left: set[str] = {
             player
@@ -437,7 +497,6 @@ class ProbabilisticAIPlayer(Player):
                         len(self.hand),
                         trick,
                         cards_seen,
-                        iterations=1000,
                     )
                 )
             probability *= player_losing_probability
@@ -449,27 +508,21 @@ class ProbabilisticAIPlayer(Player):
         card_to_beat: Card,
         num_cards: int,
         trick: Trick,
-        cards_seen: set[int],
-        iterations: int = 1000,
+        cards_seen: SeenCards,
     ) -> float:
-        deck: list[Card] = [
-            card
-            for card in build_deck()
-            if hash(card) not in cards_seen and card.suit in suits_left
-        ]
-        for i in range(NUM_JESTERS):
-            wizard: Card = Card(CardType.WIZARD, Suit.NONE, wizard_index=i)
-            if hash(wizard) not in cards_seen:
-                deck.append(wizard)
-            jester: Card = Card(CardType.JESTER, Suit.NONE, jester_index=i)
-            if hash(jester) not in cards_seen:
-                deck.append(jester)
-
-        if len(deck) < num_cards:
-            return 0.0
-
-        num_hands: int = 0
-        probability_of_winning: float = 0.0
+        """
+        Probability of a player losing against card_to_beat, if it holds num_cards cards drawn at random from
+        the unseen cards of the suits it has left (plus the unseen wizards and jesters), and plays one of its
+        playable cards at random. The hand only matters through how many of its cards are special, follow suit
+        or not, and lose or not, so the expectation over every hand is worked out in closed form from binomial
+        coefficients instead of by dealing hands
+
+        :param suits_left: suits the player might still hold
+        :param card_to_beat: card the player has to beat
+        :param num_cards: number of cards in the player's hand
+        :param trick: trick being played
+        :param cards_seen: cards seen so far in the round
+        """
         can_play_anything = (
             trick.is_wizard_played
             or (trick.suit_to_follow == Suit.NONE or trick.suit_to_follow is None)
@@ -483,35 +536,68 @@ class ProbabilisticAIPlayer(Player):
                 if trick.suit_to_follow == Suit.NONE or trick.suit_to_follow is None
                 else {trick.suit_to_follow, Suit.NONE}
             )
-        for i in range(iterations):
-            random.shuffle(deck)
-            for j in range(len(deck) // num_cards):
-                num_hands += 1
-                special_playable_cards: int = 0
-                playable_cards: int = 0
-                losing_cards: int = 0
-                losing_cards_in_hand: int = 0
-                for k in range(num_cards):
-                    card: Card = deck[j * num_cards + k]
-                    if card.suit in suits_to_play:
-                        playable_cards += 1
-
-                    if card.suit == Suit.NONE:
-                        special_playable_cards += 1
-
-                    if compare_cards(card_to_beat, card, trick.trump) > 0:
-                        losing_cards_in_hand += 1
-                        if card.suit in suits_to_play:
-                            losing_cards += 1
-
-                if playable_cards == special_playable_cards:
-                    playable_cards = num_cards
-                    losing_cards = losing_cards_in_hand
-
-                # Uniform probability
-                probability_of_winning += float(losing_cards) / float(playable_cards)
-
-        return float(probability_of_winning) / float(num_hands)
+
+        # Cards in the deck which are special (wizards and jesters), follow suit or neither, and how many of
+        # each lose against card_to_beat
+        # Jesters always lose, and wizards only lose against a wizard
+        special_cards: int = cards_seen.unseen_jesters() + cards_seen.unseen_wizards()
+        special_losing_cards: int = cards_seen.unseen_jesters()
+        if card_to_beat.card_type == CardType.WIZARD:
+            special_losing_cards += cards_seen.unseen_wizards()
+        follow_cards: int = 0
+        follow_losing_cards: int = 0
+        other_cards: int = 0
+        other_losing_cards: int = 0
+        for suit in Suit.all_suits:
+            if suit not in suits_left:
+                continue
+            if suit in suits_to_play:
+                follow_cards += cards_seen.unseen_in_suit(suit)
+                follow_losing_cards += unseen_losing_cards(
+                    card_to_beat, suit, trick.trump, cards_seen
+                )
+            else:
+                other_cards += cards_seen.unseen_in_suit(suit)
+                other_losing_cards += unseen_losing_cards(
+                    card_to_beat, suit, trick.trump, cards_seen
+                )
+
+        deck_size: int = special_cards + follow_cards + other_cards
+        if deck_size < num_cards:
+            return 0.0
+
+        # A hand with some cards which follow suit plays one of its special or follow suit cards. Given how
+        # many of those k > 0 the hand holds, they are a uniform sample of the deck's, so the chance of
+        # playing a losing one is the fraction of losing cards among them. Hands whose k cards are all special
+        # are then taken away, and together with the hands with no cards which follow suit, which play any
+        # card, their chance is the fraction of losing cards among the special and other cards. Vandermonde's
+        # identity turns the sums over k into single binomial coefficients
+        playable_cards: int = special_cards + follow_cards
+        not_follow_cards: int = special_cards + other_cards
+        hands: int = binomial(deck_size, num_cards)
+        hands_without_playable: int = binomial(other_cards, num_cards)
+        hands_without_follow: int = binomial(not_follow_cards, num_cards)
+
+        probability: float = 0.0
+        if playable_cards > 0:
+            probability += (
+                (special_losing_cards + follow_losing_cards)
+                / playable_cards
+                * (hands - hands_without_playable)
+            )
+        if special_cards > 0:
+            probability -= (
+                special_losing_cards
+                / special_cards
+                * (hands_without_follow - hands_without_playable)
+            )
+        if not_follow_cards > 0:
+            probability += (
+                (special_losing_cards + other_losing_cards)
+                / not_follow_cards
+                * hands_without_follow
+            )
+        return probability / hands
 
     # def simulate_probability_of_remaining_players_losing(
     #     self,
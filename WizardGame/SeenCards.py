@@ -0,0 +1,77 @@
+from typing import Iterable
+
+from WizardGame.Card import Card, CardType, Suit
+from WizardGame.Constants import CARDS_PER_SUIT, NUM_CARDS, NUM_JESTERS, NUM_WIZARDS
+
+
+class SeenCards:
+    """
+    Cards seen in a round, as a bitmask with bit i - 1 set for the card with index i, together with the number
+    of cards seen in every suit and below every rank of it. They are updated as cards get added, so the number
+    of unseen cards of a suit in a range of ranks is known without going through the cards
+    """
+
+    def __init__(self, cards: Iterable[Card] = ()) -> None:
+        super().__init__()
+        self.mask: int = 0
+        self.num_seen: int = 0
+        # Indexed by suit, Suit.NONE counts the wizards and jesters
+        self.suit_counts: list[int] = [0] * len(Suit.values)
+        # Number of cards of every suit seen with a rank lower than the index, from 0 to CARDS_PER_SUIT + 1
+        self.seen_below: list[list[int]] = [
+            [0] * (CARDS_PER_SUIT + 2) for _ in Suit.all_suits
+        ]
+        self.jesters: int = 0
+        self.wizards: int = 0
+        for card in cards:
+            self.add(card)
+
+    def add(self, card: Card) -> bool:
+        """:return: whether the card had not been seen yet"""
+        card_bit: int = 1 << (hash(card) - 1)
+        if self.mask & card_bit:
+            return False
+        self.mask |= card_bit
+        self.num_seen += 1
+        self.suit_counts[card.suit] += 1
+        if card.card_type == CardType.JESTER:
+            self.jesters += 1
+        elif card.card_type == CardType.WIZARD:
+            self.wizards += 1
+        else:
+            seen_below: list[int] = self.seen_below[card.suit]
+            for rank in range(card.card_type + 1, len(seen_below)):
+                seen_below[rank] += 1
+        return True
+
+    def copy(self) -> "SeenCards":
+        seen_cards: SeenCards = SeenCards()
+        seen_cards.mask = self.mask
+        seen_cards.num_seen = self.num_seen
+        seen_cards.suit_counts = list(self.suit_counts)
+        seen_cards.seen_below = [list(seen_below) for seen_below in self.seen_below]
+        seen_cards.jesters = self.jesters
+        seen_cards.wizards = self.wizards
+        return seen_cards
+
+    def __contains__(self, card_index: int) -> bool:
+        return (self.mask >> (card_index - 1)) & 1 == 1
+
+    def __len__(self) -> int:
+        return self.num_seen
+
+    def unseen(self) -> int:
+        return NUM_CARDS - self.num_seen
+
+    def unseen_in_suit(self, suit: Suit) -> int:
+        return CARDS_PER_SUIT - self.suit_counts[suit]
+
+    def unseen_below(self, suit: Suit, rank: int) -> int:
+        """:return: number of unseen cards of the suit with a rank lower than the given one, from 1 to 14"""
+        return rank - 1 - self.seen_below[suit][rank]
+
+    def unseen_jesters(self) -> int:
+        return NUM_JESTERS - self.jesters
+
+    def unseen_wizards(self) -> int:
+        return NUM_WIZARDS - self.wizards
@@ -0,0 +1,75 @@
+import tempfile
+import unittest
+
+from WizardAI.BidBook import BidBook, canonical_hand, canonical_hands, write_book
+from WizardAI.Board import Board
+from WizardAI.Card import Card, CardType, Suit
+from WizardAI.CardSet import mask_of
+from WizardAI.MonteCarloPlayer import MonteCarloPlayer
+
+
+class BidBookTests(unittest.TestCase):
+    def test_canonical_hand(self):
+        hand = mask_of(
+            [
+                Card(CardType.FIVE, Suit.RED),
+                Card(CardType.TWO, Suit.BLUE),
+                Card(CardType.WIZARD, Suit.NONE, wizard_index=3),
+            ]
+        )
+        equivalent = mask_of(
+            [
+                Card(CardType.FIVE, Suit.BLUE),
+                Card(CardType.TWO, Suit.RED),
+                Card(CardType.WIZARD, Suit.NONE, wizard_index=0),
+            ]
+        )
+        self.assertEqual(
+            canonical_hand(equivalent, Suit.BLUE), canonical_hand(hand, Suit.RED)
+        )
+        self.assertEqual(
+            canonical_hand(hand, Suit.RED),
+            canonical_hand(canonical_hand(hand, Suit.RED), Suit.BLUE),
+        )
+        # Without trumps every suit can be relabelled
+        self.assertEqual(
+            canonical_hand(equivalent, Suit.NONE), canonical_hand(hand, Suit.NONE)
+        )
+
+        for trump in (Suit.BLUE, Suit.NONE):
+            hands = list(canonical_hands(2, trump))
+            self.assertEqual(len(hands), len(set(hands)))
+            for hand in hands:
+                self.assertEqual(hand, canonical_hand(hand, trump))
+
+    def test_book_lookup(self):
+        with tempfile.TemporaryDirectory() as directory:
+            write_book(directory, [3], max_cards=1, num_playouts=50)
+            book = BidBook(directory)
+            wizard = mask_of([Card(CardType.WIZARD, Suit.NONE, wizard_index=2)])
+            jester = mask_of([Card(CardType.JESTER, Suit.NONE)])
+            for seat in range(3):
+                self.assertEqual(1, book.bid(wizard, Suit.GREEN, 3, seat))
+                self.assertEqual(0, book.bid(jester, Suit.NONE, 3, seat))
+            seven = mask_of([Card(CardType.SEVEN, Suit.RED)])
+            self.assertAlmostEqual(
+                1.0, float(book.distribution(seven, Suit.RED, 3, 1).sum())
+            )
+            # Not in the book
+            self.assertIsNone(book.bid(wizard, Suit.GREEN, 4, 0))
+            self.assertIsNone(book.bid(wizard | jester, Suit.GREEN, 3, 0))
+
+            player = MonteCarloPlayer("CPU2", 3, 1, 100, bid_book=book)
+            player.deal_hand([Card(CardType.WIZARD, Suit.NONE, wizard_index=1)])
+            player.set_board(
+                Board(
+                    Card(CardType.TWO, Suit.YELLOW),
+                    Suit.YELLOW,
+                    dict(),
+                    {"P1": 0, "CPU2": 0, "P3": 0},
+                    {"P1": "CPU2", "CPU2": "P3", "P3": "P1"},
+                    "P1",
+                )
+            )
+            self.assertEqual(1, player.select_bid(dict()))
+            self.assertEqual(0, player.last_playouts)
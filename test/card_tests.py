@@ -2,6 +2,7 @@ import unittest
 
 from WizardGame.Card import build_deck, Card, CardType, Suit
 from WizardGame.ProbailisticAIPlayer import ProbabilisticAIPlayer
+from WizardGame.SeenCards import SeenCards
 
 
 class CardTests(unittest.TestCase):
@@ -92,16 +93,17 @@ class CardTests(unittest.TestCase):
             Card(CardType.ONE, Suit.RED),
             Card(CardType.WIZARD, Suit.NONE),
         }
-        cards_seen_hashes = {hash(card) for card in cards_seen}
         player = ProbabilisticAIPlayer("CPU4", 4)
-        print(
+        # 1Y-4Y, the other suits but 1R, and the four jesters lose: 46 of the 56 unseen cards
+        self.assertAlmostEqual(
+            46 / 56 * 45 / 55 * 44 / 54,
             player.uniform_probability_of_card_winning(
                 Card(CardType.FIVE, Suit.YELLOW),
+                None,
                 Suit.YELLOW,
-                cards_seen_hashes,
+                SeenCards(cards_seen),
                 0,
-                False,
-            )
+            ),
         )
 
 
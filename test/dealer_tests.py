@@ -0,0 +1,42 @@
+import unittest
+
+import numpy as np
+
+from WizardAI.CardSet import CARD_MASKS
+from WizardAI.Dealer import (
+    DECK_IDS,
+    deal_from_pool,
+    hand_masks,
+    partial_shuffles,
+    shuffled_decks,
+)
+
+
+class DealerTests(unittest.TestCase):
+    def test_shuffled_decks_are_permutations(self):
+        decks = shuffled_decks(100, rng=np.random.default_rng(0))
+        self.assertEqual((100, 60), decks.shape)
+        for deck in decks:
+            self.assertEqual(sorted(DECK_IDS.tolist()), sorted(deck.tolist()))
+
+    def test_partial_shuffles_are_uniform(self):
+        pool = np.arange(1, 11, dtype=np.int8)
+        draws = partial_shuffles(20000, 3, pool, np.random.default_rng(0))
+        for row in draws[:100]:
+            self.assertEqual(3, len(set(row.tolist())))
+        # Every card should end up in every position with probability 1/10
+        for position in range(3):
+            frequencies = np.bincount(draws[:, position], minlength=11)[1:] / 20000
+            self.assertTrue(np.all(np.abs(frequencies - 0.1) < 0.015), frequencies)
+
+    def test_hand_masks(self):
+        pool = np.array([1, 5, 9, 20, 33, 60], dtype=np.int8)
+        deals = deal_from_pool(50, [2, 3], pool, np.random.default_rng(1))
+        masks = hand_masks(deals, [2, 3]).tolist()
+        for deal, (mask1, mask2) in zip(deals.tolist(), masks):
+            self.assertEqual(sum(CARD_MASKS[card_id] for card_id in deal[:2]), mask1)
+            self.assertEqual(sum(CARD_MASKS[card_id] for card_id in deal[2:]), mask2)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,56 @@
+import itertools
+import random
+import unittest
+
+from WizardAI.Card import Card, CardType, Suit
+from WizardAI.CardSet import CARD_MASKS, SUIT_MASKS, mask_of
+from WizardAI.DealSampler import DealSampler, compositions
+
+
+class DealSamplerTests(unittest.TestCase):
+    def test_compositions(self):
+        self.assertEqual([(0, 2), (1, 1)], compositions(2, (1, 3)))
+        self.assertEqual([], compositions(3, (1, 1)))
+
+    def test_deals_are_uniform_and_consistent(self):
+        pool_cards = [
+            Card(CardType.ONE, Suit.BLUE),
+            Card(CardType.TWO, Suit.BLUE),
+            Card(CardType.ONE, Suit.GREEN),
+            Card(CardType.TWO, Suit.GREEN),
+            Card(CardType.JESTER, Suit.NONE),
+            Card(CardType.WIZARD, Suit.NONE),
+        ]
+        hand_sizes = [2, 2, 1]
+        missing_suits = [{Suit.BLUE}, set(), {Suit.GREEN}]
+
+        # Every consistent deal, leaving one card undealt
+        consistent_deals = set()
+        for order in itertools.permutations(pool_cards):
+            hands = (mask_of(order[0:2]), mask_of(order[2:4]), mask_of(order[4:5]))
+            if all(
+                hand & SUIT_MASKS[suit] == 0
+                for hand, suits in zip(hands, missing_suits)
+                for suit in suits
+            ):
+                consistent_deals.add(hands)
+
+        sampler = DealSampler(mask_of(pool_cards), hand_sizes, missing_suits)
+        self.assertEqual(len(consistent_deals), sampler.num_deals)
+
+        rng = random.Random(0)
+        num_samples = 300 * len(consistent_deals)
+        frequencies = dict()
+        for i in range(num_samples):
+            deal = tuple(sampler.sample(rng))
+            self.assertIn(deal, consistent_deals)
+            frequencies[deal] = frequencies.get(deal, 0) + 1
+        self.assertEqual(len(consistent_deals), len(frequencies))
+        for frequency in frequencies.values():
+            self.assertAlmostEqual(300, frequency, delta=75)
+
+    def test_impossible_voids(self):
+        pool = CARD_MASKS[1] | CARD_MASKS[2]
+        self.assertEqual(0, DealSampler(pool, [2], [{Suit.BLUE}]).num_deals)
+        with self.assertRaises(ValueError):
+            DealSampler(pool, [3])
@@ -0,0 +1,113 @@
+import random
+import unittest
+
+from WizardAI.Card import Card, CardType, Suit
+from WizardAI.CardSet import CARD_MASKS, cards_in, mask_of, playable_mask
+from WizardAI.DoubleDummySolver import DoubleDummySolver, can_make_bid, max_tricks
+from WizardAI.Trick import Trick
+
+
+def brute_force_tricks(
+    trump: Suit,
+    hands: list[int],
+    seat: int,
+    player_seat: int,
+    plays: list[tuple[int, Card]],
+    tricks_needed: int,
+) -> tuple[int, bool]:
+    """
+    :return: tricks the player can win against the other players, and whether it can win exactly
+             tricks_needed tricks, by trying every card at every turn
+    """
+    trick: Trick = Trick(trump)
+    for played_seat, card in plays:
+        trick.play_card(played_seat, card)
+
+    if len(plays) == len(hands):
+        won: int = 1 if trick.winner_player == player_seat else 0
+        if hands[trick.winner_player] == 0:
+            return won, won == tricks_needed
+        tricks, makes_bid = brute_force_tricks(
+            trump, hands, trick.winner_player, player_seat, [], tricks_needed - won
+        )
+        return won + tricks, makes_bid
+
+    results: list[tuple[int, bool]] = []
+    for card in cards_in(playable_mask(hands[seat], trick.suit_to_follow)):
+        new_hands: list[int] = list(hands)
+        new_hands[seat] ^= CARD_MASKS[card.id]
+        results.append(
+            brute_force_tricks(
+                trump,
+                new_hands,
+                (seat + 1) % len(hands),
+                player_seat,
+                plays + [(seat, card)],
+                tricks_needed,
+            )
+        )
+    if seat == player_seat:
+        return max(tricks for tricks, makes_bid in results), any(
+            makes_bid for tricks, makes_bid in results
+        )
+    return min(tricks for tricks, makes_bid in results), all(
+        makes_bid for tricks, makes_bid in results
+    )
+
+
+class DoubleDummySolverTests(unittest.TestCase):
+    def test_wizard_and_jester(self):
+        hands = [
+            mask_of([Card(CardType.WIZARD, Suit.NONE, wizard_index=0), Card(CardType.JESTER, Suit.NONE)]),
+            mask_of([Card(CardType.THIRTEEN, Suit.BLUE), Card(CardType.ONE, Suit.RED)]),
+            mask_of([Card(CardType.TWELVE, Suit.BLUE), Card(CardType.TWO, Suit.RED)]),
+        ]
+        # The wizard always wins a trick, and the jester can never win one
+        self.assertEqual(1, max_tricks(Suit.BLUE, list(hands), 0, 0))
+        self.assertTrue(can_make_bid(Suit.BLUE, list(hands), 0, 0, 1))
+        self.assertFalse(can_make_bid(Suit.BLUE, list(hands), 0, 0, 0))
+        self.assertFalse(can_make_bid(Suit.BLUE, list(hands), 0, 0, 2))
+
+    def test_agrees_with_brute_force(self):
+        rng = random.Random(0)
+        for i in range(150):
+            num_players = rng.choice([3, 4])
+            hand_size = rng.choice([1, 2, 3])
+            card_ids = rng.sample(range(1, 61), num_players * hand_size)
+            hands = [
+                sum(CARD_MASKS[card_id] for card_id in card_ids[seat * hand_size : (seat + 1) * hand_size])
+                for seat in range(num_players)
+            ]
+            trump = Suit(rng.randrange(len(Suit.values)))
+            player_seat = rng.randrange(num_players)
+            leader = rng.randrange(num_players)
+            solver = DoubleDummySolver(num_players, trump, player_seat)
+            for tricks_needed in range(hand_size + 1):
+                tricks, makes_bid = brute_force_tricks(
+                    trump, hands, leader, player_seat, [], tricks_needed
+                )
+                self.assertEqual(tricks, solver.max_tricks(hands, leader))
+                self.assertEqual(
+                    makes_bid, solver.can_make_bid(hands, leader, tricks_needed)
+                )
+
+    def test_table_is_cleared_past_its_size(self):
+        rng = random.Random(1)
+        solver = DoubleDummySolver(3, Suit.BLUE, 0, max_table_size=4)
+        clears = 0
+        for i in range(20):
+            card_ids = rng.sample(range(1, 61), 9)
+            hands = [
+                sum(CARD_MASKS[card_id] for card_id in card_ids[seat * 3 : (seat + 1) * 3])
+                for seat in range(3)
+            ]
+            full_table: bool = len(solver.trick_bounds) > 4
+            fresh_solver = DoubleDummySolver(3, Suit.BLUE, 0)
+            self.assertEqual(
+                fresh_solver.max_tricks(hands, 0), solver.max_tricks(hands, 0)
+            )
+            if full_table:
+                # Only the positions of the last search are left
+                self.assertEqual(fresh_solver.trick_bounds, solver.trick_bounds)
+                clears += 1
+        self.assertGreater(clears, 0)
@@ -0,0 +1,47 @@
+import random
+import unittest
+
+from WizardGame.Card import build_deck, Card, CardType, Suit
+from WizardGame.HandEvaluator import win_probabilities
+from WizardGame.ProbailisticAIPlayer import ProbabilisticAIPlayer
+from WizardGame.SeenCards import SeenCards
+
+
+class HandEvaluatorTests(unittest.TestCase):
+    def test_matches_uniform_probability_of_card_winning(self):
+        rng = random.Random(0)
+        for num_players in (3, 4, 6):
+            player = ProbabilisticAIPlayer("P0", num_players)
+            for i in range(20):
+                deck = build_deck()
+                rng.shuffle(deck)
+                hand = deck[:10]
+                cards_seen = SeenCards(deck[: rng.randrange(10, 40)])
+                probabilities = win_probabilities(
+                    hand, cards_seen, num_players, Suit.values
+                )
+                self.assertEqual((10, len(Suit.values)), probabilities.shape)
+                for j, card in enumerate(hand):
+                    for trump in Suit.values:
+                        self.assertAlmostEqual(
+                            player.compute_uniform_probability_of_card_winning(
+                                card, None, Suit(trump), cards_seen, 0
+                            ),
+                            probabilities[j, trump],
+                        )
+
+    def test_choose_trump(self):
+        player = ProbabilisticAIPlayer("P0", 4)
+        player.deal_hand(
+            {
+                Card(CardType.THIRTEEN, Suit.GREEN),
+                Card(CardType.TWELVE, Suit.GREEN),
+                Card(CardType.TWO, Suit.RED),
+                Card(CardType.JESTER, Suit.NONE),
+            }
+        )
+        self.assertEqual(Suit.GREEN, player.choose_trump())
+
+
+if __name__ == "__main__":
+    unittest.main()
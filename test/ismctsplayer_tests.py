@@ -0,0 +1,50 @@
+import unittest
+
+from WizardAI.Game import Game
+from WizardAI.ISMCTSPlayer import ISMCTSPlayer, SearchTree, NO_NODE, ROOT
+from WizardAI.RandomAIPlayer import RandomAIPlayer
+
+
+class ISMCTSTests(unittest.TestCase):
+    def test_search_tree(self):
+        tree = SearchTree(4)
+        first = tree.add_child(ROOT, 10, 0)
+        second = tree.add_child(ROOT, 20, 0)
+        grandchild = tree.add_child(first, 30, 1)
+        self.assertEqual(first, tree.child(ROOT, 10))
+        self.assertEqual(second, tree.child(ROOT, 20))
+        self.assertEqual(NO_NODE, tree.child(ROOT, 30))
+        self.assertEqual(grandchild, tree.child(first, 30))
+        # Full
+        self.assertEqual(NO_NODE, tree.add_child(second, 40, 1))
+
+    def test_compact_keeps_subtree(self):
+        tree = SearchTree(8)
+        dropped = tree.add_child(ROOT, 1, 0)
+        root = tree.add_child(ROOT, 2, 0)
+        tree.add_child(dropped, 3, 1)
+        first = tree.add_child(root, 4, 1)
+        second = tree.add_child(root, 5, 1)
+        tree.add_child(first, 6, 2)
+        tree.visits[second] = 7
+
+        root = tree.compact(root)
+        self.assertEqual(4, tree.size)
+        self.assertEqual(2, tree.move[root])
+        self.assertEqual([4, 5], sorted(tree.move[child] for child in tree.children(root)))
+        self.assertEqual(7, tree.visits[tree.child(root, 5)])
+        self.assertNotEqual(NO_NODE, tree.child(tree.child(root, 4), 6))
+        self.assertEqual(NO_NODE, tree.child(root, 1))
+
+    def test_plays_rounds_with_bounded_tree(self):
+        game = Game(
+            [
+                RandomAIPlayer("P1", 3),
+                ISMCTSPlayer("CPU2", 3, 1, 20, search_iterations=50, max_nodes=64),
+                RandomAIPlayer("P3", 3),
+            ],
+            seed=0,
+        )
+        for num_cards in range(2, 6):
+            game.play_round(num_cards)
+        self.assertLessEqual(game.players["CPU2"].tree.size, 64)
@@ -1,7 +1,39 @@
+import random
+import time
 import unittest
 
-from WizardAI.Card import Card, CardType, Suit
-from WizardAI.MonteCarloPlayer import MonteCarloPlayer, MonteCarloSimulator
+import numpy as np
+
+from WizardAI.Board import Board
+from WizardAI.Card import Card, CardType, Suit, DECK
+from WizardAI.BatchPlayout import batch_playouts, NUM_CARD_IDS
+from WizardAI.CardSet import SUIT_MASKS, mask_of
+from WizardAI.DoubleDummySolver import DoubleDummySolver
+from WizardAI.Game import Game
+from WizardAI.MonteCarloPlayer import (
+    MonteCarloPlayer,
+    MonteCarloSimulator,
+    hit_rate_bounds,
+    is_settled,
+    most_frequent_outcome,
+)
+from WizardAI.SimulatorPool import SimulatorPool
+from WizardAI.PlayoutEngine import NO_CARD, NO_PLAYER, NOT_SETTLED, PlayoutEngine
+from WizardAI.RandomAIPlayer import RandomAIPlayer
+from WizardAI.Rng import Rng
+
+
+class CountingPlayoutEngine(PlayoutEngine):
+    """Counts the positions found to be settled"""
+
+    settled_playouts: int = 0
+
+    def settled_tricks(
+        self, hands: list[int], tricks_won: list[int], leader_seat: int, cards_left: int
+    ) -> int:
+        tricks: int = super().settled_tricks(hands, tricks_won, leader_seat, cards_left)
+        self.settled_playouts += tricks != NOT_SETTLED
+        return tricks
 
 
 class MonteCarloTests(unittest.TestCase):
@@ -36,3 +68,453 @@ class MonteCarloTests(unittest.TestCase):
         assert (
             False
         ), "estimate was false 5 times in a row. This should be very unlikely"
+
+    def test_playout_engine_restores_state(self):
+        # Cards are played in id order: seat 0 wins 2B (trump) vs 13Y, then 4Y vs a jester
+        hands = [
+            mask_of([Card(CardType.FOUR, Suit.YELLOW), Card(CardType.TWO, Suit.BLUE)]),
+            mask_of(
+                [Card(CardType.THIRTEEN, Suit.YELLOW), Card(CardType.JESTER, Suit.NONE)]
+            ),
+        ]
+        tricks_won = [0, 0]
+        winning_freq = dict()
+        engine = PlayoutEngine(2, 1, max_branch_factor=1)
+        engine.run(
+            Suit.BLUE,
+            hands,
+            tricks_won,
+            0,
+            NO_PLAYER,
+            NO_CARD,
+            None,
+            0,
+            1,
+            winning_freq,
+        )
+        self.assertEqual({0: 1}, winning_freq)
+        self.assertEqual([0, 0], tricks_won)
+        self.assertEqual(
+            mask_of([Card(CardType.FOUR, Suit.YELLOW), Card(CardType.TWO, Suit.BLUE)]),
+            hands[0],
+        )
+
+    def test_playout_engine_double_dummy(self):
+        # Same hands, after a trick won by seat 0. Whatever seat 0 leads, seat 1 can win a trick with 13Y
+        hands = [
+            mask_of([Card(CardType.FOUR, Suit.YELLOW), Card(CardType.TWO, Suit.BLUE)]),
+            mask_of(
+                [Card(CardType.THIRTEEN, Suit.YELLOW), Card(CardType.JESTER, Suit.NONE)]
+            ),
+        ]
+        tricks_won = [0, 0]
+        winning_freq = dict()
+        engine = PlayoutEngine(2, 1, max_branch_factor=1, double_dummy_threshold=2)
+        solver = DoubleDummySolver(2, Suit.BLUE, 1)
+        engine.run(
+            Suit.BLUE,
+            hands,
+            tricks_won,
+            1,
+            0,
+            Card(CardType.FIVE, Suit.GREEN).id,
+            Suit.GREEN,
+            2,
+            1,
+            winning_freq,
+            solver,
+            1,
+        )
+        self.assertEqual({1: 1}, winning_freq)
+        self.assertEqual([0, 0], tricks_won)
+
+        # Without the bid the round gets played out, as the solver's paranoid count would bias the histogram
+        solver = DoubleDummySolver(2, Suit.BLUE, 1)
+        engine.run(
+            Suit.BLUE,
+            hands,
+            tricks_won,
+            1,
+            0,
+            Card(CardType.FIVE, Suit.GREEN).id,
+            Suit.GREEN,
+            2,
+            1,
+            dict(),
+            solver,
+        )
+        self.assertEqual({}, solver.trick_bounds)
+        self.assertEqual({}, solver.bid_results)
+
+    def test_playout_engine_stops_settled_playouts(self):
+        # After a trick won by seat 1, seat 0 only has jesters and nobody else has any, so every way of
+        # playing the last two tricks ends the same and counts once
+        jesters = [
+            Card(CardType.JESTER, Suit.NONE, jester_index=jester_index)
+            for jester_index in range(2)
+        ]
+        hands = [
+            mask_of(jesters),
+            mask_of([Card(CardType.FIVE, Suit.RED), Card(CardType.SEVEN, Suit.RED)]),
+            mask_of(
+                [Card(CardType.NINE, Suit.GREEN), Card(CardType.WIZARD, Suit.NONE)]
+            ),
+        ]
+        tricks_won = [0, 0, 0]
+        winning_freq = dict()
+        engine = PlayoutEngine(3, 0, max_branch_factor=3)
+        engine.run(
+            Suit.BLUE,
+            hands,
+            tricks_won,
+            2,
+            1,
+            Card(CardType.TEN, Suit.RED).id,
+            Suit.RED,
+            3,
+            1,
+            winning_freq,
+        )
+        self.assertEqual({0: 1}, winning_freq)
+        self.assertEqual([0, 0, 0], tricks_won)
+
+    def test_settled_playouts_keep_histogram(self):
+        # Deals with many wizards and jesters, so that playouts often get settled before the end
+        pool = [card for card in DECK if card.suit in (Suit.NONE, Suit.RED)]
+        rng = random.Random(0)
+        settled_playouts = 0
+        for i in range(50):
+            deal = rng.sample(pool, 12)
+            hands = [mask_of(deal[seat * 4 : (seat + 1) * 4]) for seat in range(3)]
+            histograms = []
+            for stop_settled in (True, False):
+                winning_freq = dict()
+                engine = CountingPlayoutEngine(
+                    3, 0, rng=random.Random(i), stop_settled=stop_settled
+                )
+                engine.run(
+                    Suit.RED,
+                    list(hands),
+                    [0, 0, 0],
+                    0,
+                    NO_PLAYER,
+                    NO_CARD,
+                    None,
+                    0,
+                    2,
+                    winning_freq,
+                )
+                histograms.append(winning_freq)
+                settled_playouts += engine.settled_playouts
+            self.assertEqual(histograms[1], histograms[0])
+        self.assertGreater(settled_playouts, 0)
+
+    def test_batch_playouts(self):
+        # Seat 1 always wins the trick where it plays its wizard, and also wins the second trick when seat 0 leads
+        # 5R, seat 1 answers with the wizard and then leads 1R against 2G, which happens a quarter of the time
+        hands = np.zeros((4000, 2, NUM_CARD_IDS), dtype=bool)
+        hands[:, 0, Card(CardType.FIVE, Suit.RED).id] = True
+        hands[:, 0, Card(CardType.TWO, Suit.GREEN).id] = True
+        hands[:, 1, Card(CardType.WIZARD, Suit.NONE).id] = True
+        hands[:, 1, Card(CardType.ONE, Suit.RED).id] = True
+        histogram = batch_playouts(
+            Suit.BLUE,
+            hands,
+            [0, 0],
+            0,
+            NO_PLAYER,
+            NO_CARD,
+            None,
+            0,
+            1,
+            np.random.default_rng(0),
+        )
+        self.assertFalse(hands.any())
+        self.assertEqual([0, 4000], [histogram[0], histogram.sum()])
+        self.assertAlmostEqual(0.25, histogram[2] / 4000, delta=0.03)
+
+    def test_pool_histograms_agree_with_single_process(self):
+        simulator: MonteCarloSimulator = MonteCarloSimulator(
+            "CPU4",
+            [
+                Card(CardType.FOUR, Suit.YELLOW),
+                Card(CardType.WIZARD, Suit.NONE, wizard_index=0),
+                Card(CardType.THREE, Suit.YELLOW),
+            ],
+            dict(),
+            Suit.BLUE,
+            Card(CardType.TEN, Suit.BLUE),
+            None,
+            None,
+            None,
+            "CPU2",
+            dict(),
+            dict(),
+            {"CPU2": "CPU3", "CPU3": "CPU4", "CPU4": "P1", "P1": "CPU2"},
+            1,
+            1,
+            None,
+            batch_playouts=True,
+        )
+        single_process = simulator.bid_histogram(4000)
+        with SimulatorPool(2) as pool:
+            simulator.pool = pool
+            parallel = simulator.run_bid_playouts(4000)
+        self.assertEqual(4000, sum(parallel.values()))
+        for tricks_won in range(4):
+            self.assertAlmostEqual(
+                single_process.get(tricks_won, 0) / 4000,
+                parallel.get(tricks_won, 0) / 4000,
+                delta=0.04,
+            )
+
+    def test_common_random_numbers(self):
+        wizard: Card = Card(CardType.WIZARD, Suit.NONE, wizard_index=0)
+        for batch_playouts in (False, True):
+            simulator: MonteCarloSimulator = MonteCarloSimulator(
+                "CPU4",
+                [Card(CardType.FOUR, Suit.YELLOW), wizard, Card(CardType.THREE, Suit.YELLOW)],
+                dict(),
+                Suit.BLUE,
+                Card(CardType.TEN, Suit.BLUE),
+                None,
+                None,
+                None,
+                "CPU4",
+                dict(),
+                dict(),
+                {"CPU2": "CPU3", "CPU3": "CPU4", "CPU4": "P1", "P1": "CPU2"},
+                1,
+                1,
+                None,
+                batch_playouts=batch_playouts,
+                common_random_numbers=True,
+            )
+            histograms = simulator.run_card_playouts(list(simulator.hand), 200)
+            self.assertEqual(set(simulator.hand), set(histograms))
+            for histogram in histograms.values():
+                self.assertGreaterEqual(sum(histogram.values()), 200)
+            # Leading the wizard always wins at least its own trick
+            self.assertEqual(0, histograms[wizard].get(0, 0))
+
+    def test_time_budget(self):
+        simulator: MonteCarloSimulator = MonteCarloSimulator(
+            "CPU4",
+            [
+                Card(CardType.FOUR, Suit.YELLOW),
+                Card(CardType.WIZARD, Suit.NONE, wizard_index=0),
+                Card(CardType.THREE, Suit.YELLOW),
+            ],
+            dict(),
+            Suit.BLUE,
+            Card(CardType.TEN, Suit.BLUE),
+            None,
+            None,
+            None,
+            "CPU2",
+            dict(),
+            dict(),
+            {"CPU2": "CPU3", "CPU3": "CPU4", "CPU4": "P1", "P1": "CPU2"},
+            1,
+            1,
+            None,
+            time_budget_ms=50,
+        )
+        start_time = time.perf_counter()
+        simulator.estimate_winnings()
+        elapsed_time = time.perf_counter() - start_time
+        # num_iterations is ignored on a time budget
+        self.assertGreater(simulator.playouts_completed, 1)
+        self.assertLess(elapsed_time, 0.5)
+
+    def test_playouts_completed_counts_deals(self):
+        simulator: MonteCarloSimulator = MonteCarloSimulator(
+            "CPU4",
+            [
+                Card(CardType.FOUR, Suit.YELLOW),
+                Card(CardType.WIZARD, Suit.NONE, wizard_index=0),
+                Card(CardType.THREE, Suit.YELLOW),
+            ],
+            dict(),
+            Suit.BLUE,
+            Card(CardType.TEN, Suit.BLUE),
+            None,
+            None,
+            None,
+            "CPU2",
+            dict(),
+            dict(),
+            {"CPU2": "CPU3", "CPU3": "CPU4", "CPU4": "P1", "P1": "CPU2"},
+            3,
+            20,
+            1,
+        )
+        # Branching playouts put more than one outcome in the histogram, but each is still a single playout
+        self.assertGreater(sum(simulator.decision_bid_histogram().values()), 20)
+        self.assertEqual(20, simulator.playouts_completed)
+
+    def test_adaptive_stopping(self):
+        self.assertFalse(is_settled([]))
+        self.assertFalse(is_settled([3]))
+        self.assertTrue(is_settled([10]))
+        self.assertFalse(is_settled([60, 40, 20]))
+        self.assertTrue(is_settled([120, 60, 20]))
+
+        lower, upper = hit_rate_bounds({0: 30, 1: 70}, 1)
+        self.assertLess(lower, 0.7)
+        self.assertGreater(upper, 0.7)
+        self.assertEqual((0.0, 1.0), hit_rate_bounds(dict(), 1))
+
+    def test_adaptive_choose_card(self):
+        one_yellow: Card = Card(CardType.ONE, Suit.YELLOW)
+        one_green: Card = Card(CardType.ONE, Suit.GREEN)
+        wizard: Card = Card(CardType.WIZARD, Suit.NONE, wizard_index=0)
+        simulator: MonteCarloSimulator = MonteCarloSimulator(
+            "CPU4",
+            [one_yellow, wizard, one_green],
+            dict(),
+            Suit.BLUE,
+            Card(CardType.TEN, Suit.BLUE),
+            None,
+            None,
+            None,
+            "CPU4",
+            dict(),
+            dict(),
+            {"CPU2": "CPU3", "CPU3": "CPU4", "CPU4": "P1", "P1": "CPU2"},
+            1,
+            800,
+            1,
+            batch_playouts=True,
+            adaptive=True,
+        )
+        # The wizard is confidently worse than the yellow one, the green one might still be as good
+        self.assertEqual(
+            [one_yellow, one_green],
+            simulator.surviving_cards(
+                {
+                    one_yellow: {1: 90, 0: 10},
+                    wizard: {1: 20, 2: 80},
+                    one_green: {1: 80, 0: 20},
+                }
+            ),
+        )
+        self.assertIn(simulator.choose_card(simulator.hand), simulator.hand)
+        self.assertLessEqual(simulator.playouts_completed, 800)
+
+    def test_round_state_follows_played_cards(self):
+        lookup = {"P1": "CPU2", "CPU2": "P3", "P3": "P1"}
+        simulator: MonteCarloSimulator = MonteCarloSimulator(
+            "CPU2",
+            [Card(CardType.FIVE, Suit.RED), Card(CardType.NINE, Suit.GREEN)],
+            dict(),
+            Suit.BLUE,
+            Card(CardType.TEN, Suit.BLUE),
+            None,
+            None,
+            None,
+            "P1",
+            dict(),
+            dict(),
+            lookup,
+            2,
+            10,
+            None,
+        )
+        simulator.start_round()
+        self.assertEqual({"P1": 2, "CPU2": 2, "P3": 2}, simulator.get_hand_sizes())
+
+        seven_red = Card(CardType.SEVEN, Suit.RED)
+        simulator.card_played("P1", seven_red)
+        simulator.card_played("CPU2", Card(CardType.FIVE, Suit.RED))
+        simulator.card_played("P3", Card(CardType.TWO, Suit.YELLOW))
+        self.assertEqual({"P3": {Suit.RED}}, simulator.missing_suits)
+        self.assertEqual("P1", simulator.current_winner)
+        self.assertEqual(seven_red, simulator.current_winning_card)
+        self.assertEqual(3, simulator.trick_size)
+        self.assertFalse(simulator.unseen_cards & mask_of([seven_red]))
+
+        simulator.trick_won("P1")
+        self.assertEqual(1, simulator.tricks_won[simulator.seats["P1"]])
+        self.assertEqual(0, simulator.trick_size)
+        self.assertIsNone(simulator.suit_to_follow)
+        self.assertEqual({"P1": 1, "CPU2": 1, "P3": 1}, simulator.get_hand_sizes())
+        self.assertEqual([Card(CardType.NINE, Suit.GREEN)], list(simulator.hand))
+
+        # Deals honour the void and leave out the cards played
+        for hands in simulator.generate_consistent_deals(simulator.get_hand_sizes(), 20):
+            self.assertEqual(1, hands[simulator.seats["P1"]].bit_count())
+            self.assertFalse(hands[simulator.seats["P3"]] & SUIT_MASKS[Suit.RED])
+            self.assertFalse(hands[simulator.seats["P1"]] & mask_of([seven_red]))
+
+    def test_trump_histograms_share_deals(self):
+        lookup = {"P1": "CPU2", "CPU2": "P3", "P3": "P1"}
+        hand = [
+            Card(CardType.THIRTEEN, Suit.RED),
+            Card(CardType.TWELVE, Suit.RED),
+            Card(CardType.ELEVEN, Suit.RED),
+        ]
+        for batch in (False, True):
+            simulator: MonteCarloSimulator = MonteCarloSimulator(
+                "CPU2",
+                hand,
+                dict(),
+                Suit.NONE,
+                Card(CardType.WIZARD, Suit.NONE),
+                None,
+                None,
+                None,
+                "P3",
+                dict(),
+                dict(),
+                lookup,
+                1,
+                200,
+                batch_playouts=batch,
+                rng=Rng(0),
+            )
+            histograms = simulator.trump_histograms(200)
+            self.assertEqual(set(Suit.all_suits), set(histograms))
+            if batch:
+                for histogram in histograms.values():
+                    self.assertEqual(200, sum(histogram.values()))
+
+            def mean_tricks(suit: Suit) -> float:
+                histogram = histograms[suit]
+                return sum(tricks * freq for tricks, freq in histogram.items()) / sum(
+                    histogram.values()
+                )
+
+            for suit in (Suit.BLUE, Suit.GREEN, Suit.YELLOW):
+                self.assertGreater(mean_tricks(Suit.RED), mean_tricks(suit))
+            # The simulator's own trump is left alone
+            self.assertEqual(Suit.NONE, simulator.trump_suit)
+
+    def test_bid_reuses_trump_playouts(self):
+        lookup = {"P1": "CPU2", "CPU2": "P3", "P3": "P1"}
+        scores = {"P1": 0, "CPU2": 0, "P3": 0}
+        player = MonteCarloPlayer("CPU2", 3, 1, 50, rng=Rng(0))
+        player.set_board(Board(None, Suit.NONE, dict(), scores, lookup, "P1"))
+        player.deal_hand(
+            [Card(CardType.THIRTEEN, Suit.GREEN), Card(CardType.TWO, Suit.YELLOW)]
+        )
+        trump = player.choose_trump()
+        histograms = player.trump_histograms
+        self.assertGreater(player.last_playouts, 0)
+
+        player.set_board(
+            Board(Card(CardType.WIZARD, Suit.NONE), trump, dict(), scores, lookup, "P3")
+        )
+        self.assertEqual(
+            most_frequent_outcome(histograms[trump]), player.select_bid(dict())
+        )
+        self.assertEqual(0, player.last_playouts)
+
+    def test_choose_trump_in_first_round(self):
+        # With this seed the card turned up in the first round is a wizard, and the dealer has no board yet
+        dealer = MonteCarloPlayer("CPU1", 3, 1, 5)
+        game = Game([dealer, RandomAIPlayer("P2", 3), RandomAIPlayer("P3", 3)], seed=3)
+        game.play_round(1)
+        self.assertIsNotNone(dealer.board)
+        self.assertEqual(CardType.WIZARD, dealer.board.trump_card.card_type)
+        self.assertIn(dealer.board.trump, Suit.all_suits)
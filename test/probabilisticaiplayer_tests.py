@@ -0,0 +1,239 @@
+import itertools
+import unittest
+
+from WizardGame.Board import Board
+from WizardGame.Card import build_deck, Card, CardType, Suit, compare_cards
+from WizardGame.ProbailisticAIPlayer import ProbabilisticAIPlayer
+from WizardGame.PlayerBid import PlayerBid
+from WizardGame.SeenCards import SeenCards
+from WizardGame.Trick import Trick
+
+
+def enumerated_losing_probability(
+    suits_left: frozenset[Suit],
+    card_to_beat: Card,
+    num_cards: int,
+    trick: Trick,
+    cards_seen: SeenCards,
+    suits_to_play: set[Suit],
+) -> float:
+    """Average over every possible hand of the chance of playing a losing card, dealing each hand explicitly"""
+    deck: list[Card] = [
+        card
+        for card in build_deck()
+        if hash(card) not in cards_seen
+        and (card.suit in suits_left or card.suit == Suit.NONE)
+    ]
+    total: float = 0.0
+    num_hands: int = 0
+    for hand in itertools.combinations(deck, num_cards):
+        playable: list[Card] = [card for card in hand if card.suit in suits_to_play]
+        if all(card.suit == Suit.NONE for card in playable):
+            playable = list(hand)
+        losing: int = sum(
+            compare_cards(card_to_beat, card, trick.trump) > 0 for card in playable
+        )
+        total += losing / len(playable)
+        num_hands += 1
+    return total / num_hands
+
+
+def branching_probability_of_players_having_losing_cards(
+    player_suits_left: dict[str, set[Suit]],
+    losing_cards_per_suit: dict[Suit, int],
+    players_left: list[str],
+    cards_left: int,
+) -> float:
+    """Branches over every suit for every player in turn"""
+    if len(players_left) == 0:
+        return 1.0
+    probability: float = 0.0
+    for suit, num_cards in losing_cards_per_suit.items():
+        if suit in player_suits_left[players_left[0]] and num_cards > 0:
+            probability += (
+                num_cards
+                / cards_left
+                * branching_probability_of_players_having_losing_cards(
+                    player_suits_left,
+                    {**losing_cards_per_suit, suit: num_cards - 1},
+                    players_left[1:],
+                    cards_left - 1,
+                )
+            )
+    return probability
+
+
+class ProbabilisticAIPlayerTests(unittest.TestCase):
+    def setUp(self) -> None:
+        self.player = ProbabilisticAIPlayer("P0", 4)
+        # Leave low blues and reds, a wizard and three jesters unseen
+        self.cards_seen = SeenCards(
+            card
+            for card in build_deck()
+            if card.suit in (Suit.GREEN, Suit.YELLOW)
+            or (card.suit == Suit.BLUE and card.card_type > CardType.SEVEN)
+            or (card.suit == Suit.RED and card.card_type > CardType.SIX)
+        )
+        for i in range(3):
+            self.cards_seen.add(Card(CardType.WIZARD, Suit.NONE, wizard_index=i))
+        self.cards_seen.add(Card(CardType.JESTER, Suit.NONE, jester_index=0))
+
+    def test_losing_probability_following_suit(self):
+        trick = Trick(Suit.RED)
+        card_to_beat = Card(CardType.FIVE, Suit.BLUE)
+        trick.play_card("P3", card_to_beat)
+        suits_left = frozenset({Suit.BLUE, Suit.RED})
+        for num_cards in range(1, 5):
+            self.assertAlmostEqual(
+                enumerated_losing_probability(
+                    suits_left,
+                    card_to_beat,
+                    num_cards,
+                    trick,
+                    self.cards_seen,
+                    {Suit.BLUE, Suit.NONE},
+                ),
+                self.player.simulate_player_losing_probability(
+                    suits_left, card_to_beat, num_cards, trick, self.cards_seen
+                ),
+            )
+
+    def test_losing_probability_without_suit_to_follow(self):
+        trick = Trick(Suit.BLUE)
+        card_to_beat = Card(CardType.JESTER, Suit.NONE)
+        trick.play_card("P3", card_to_beat)
+        suits_left = frozenset({Suit.RED})
+        for num_cards in range(1, 4):
+            self.assertAlmostEqual(
+                enumerated_losing_probability(
+                    suits_left,
+                    card_to_beat,
+                    num_cards,
+                    trick,
+                    self.cards_seen,
+                    {Suit(suit) for suit in Suit.values},
+                ),
+                self.player.simulate_player_losing_probability(
+                    suits_left, card_to_beat, num_cards, trick, self.cards_seen
+                ),
+            )
+
+    def test_losing_probability_with_too_few_cards_left(self):
+        trick = Trick(Suit.RED)
+        self.assertEqual(
+            0.0,
+            self.player.simulate_player_losing_probability(
+                frozenset(), Card(CardType.ONE, Suit.BLUE), 5, trick, self.cards_seen
+            ),
+        )
+
+    def test_probabilities_are_cached_for_the_round(self):
+        players = ["P0", "P1", "P2", "P3"]
+        board = Board(
+            Card(CardType.ONE, Suit.GREEN),
+            Suit.GREEN,
+            {player: PlayerBid(0) for player in players},
+            {player: 0 for player in players},
+            {player: players[(i + 1) % 4] for i, player in enumerate(players)},
+            "P1",
+        )
+        self.player.set_board(board)
+        trick = Trick(Suit.GREEN)
+        trick.play_card("P3", Card(CardType.FIVE, Suit.BLUE))
+        card = Card(CardType.SIX, Suit.BLUE)
+        probability = self.player.probability_of_winning_trick(
+            card, trick, self.cards_seen
+        )
+        self.assertEqual(
+            probability,
+            self.player.probability_of_winning_trick(card, trick, self.cards_seen),
+        )
+        self.assertEqual(1, self.player.probability_cache.hits)
+        self.player.set_board(board)
+        self.assertEqual(0, len(self.player.probability_cache.entries))
+
+    def test_probability_of_players_having_losing_cards(self):
+        player = ProbabilisticAIPlayer("P0", 6)
+        player.player_suits_left = {
+            "P1": {Suit.BLUE, Suit.GREEN, Suit.RED, Suit.YELLOW},
+            "P2": {Suit.BLUE, Suit.RED},
+            "P3": {Suit.GREEN, Suit.RED, Suit.YELLOW},
+            "P4": {Suit.YELLOW},
+            "P5": {Suit.BLUE, Suit.GREEN, Suit.RED, Suit.YELLOW},
+        }
+        losing_cards_per_suit = {
+            Suit.BLUE: 4,
+            Suit.GREEN: 2,
+            Suit.RED: 6,
+            Suit.YELLOW: 3,
+            Suit.NONE: 2,
+        }
+        players_left = {"P1", "P2", "P3", "P4", "P5"}
+        expected = branching_probability_of_players_having_losing_cards(
+            player.player_suits_left, losing_cards_per_suit, sorted(players_left), 30
+        )
+        self.assertGreater(expected, 0.0)
+        self.assertAlmostEqual(
+            expected,
+            player.probability_of_players_having_losing_cards(
+                losing_cards_per_suit, players_left, 30, 1.0
+            ),
+        )
+        # The arguments are left as they were
+        self.assertEqual({"P1", "P2", "P3", "P4", "P5"}, players_left)
+        self.assertEqual(4, losing_cards_per_suit[Suit.BLUE])
+
+    def test_player_info_records_voids_from_every_card_played(self):
+        players = ["P1", "P0", "P2"]
+        board = Board(
+            Card(CardType.ONE, Suit.GREEN),
+            Suit.GREEN,
+            {player: PlayerBid(1) for player in players},
+            {player: 0 for player in players},
+            {player: players[(i + 1) % 3] for i, player in enumerate(players)},
+            "P1",
+        )
+        ten_red = Card(CardType.TEN, Suit.RED)
+        hand = {ten_red, Card(CardType.NINE, Suit.RED), Card(CardType.THREE, Suit.BLUE)}
+        player = ProbabilisticAIPlayer("P0", 3, use_player_info=True)
+        uninformed_player = ProbabilisticAIPlayer("P0", 3)
+        for ai_player in (player, uninformed_player):
+            ai_player.deal_hand(set(hand))
+            ai_player.set_board(board)
+
+        # P2 fails to follow red after P0 has already played in the trick
+        for name, card in [
+            ("P1", Card(CardType.FIVE, Suit.RED)),
+            ("P0", Card(CardType.NINE, Suit.RED)),
+            ("P2", Card(CardType.TWO, Suit.BLUE)),
+        ]:
+            board.card_played(name, card)
+        board.trick_won("P0")
+        self.assertEqual({Suit.BLUE, Suit.GREEN, Suit.YELLOW}, player.player_suits_left["P2"])
+        self.assertTrue(player.player_suit_exhausted)
+        self.assertEqual(set(Suit.all_suits), uninformed_player.player_suits_left["P2"])
+
+        # Only the next trick's lead has been played when P0 chooses its card
+        trick = Trick(Suit.GREEN)
+        trick.play_card("P1", Card(CardType.TWO, Suit.RED))
+        board.card_played("P1", Card(CardType.TWO, Suit.RED))
+        probability = player.probability_of_winning_trick(
+            ten_red, trick, player.cards_seen
+        )
+        self.assertEqual(
+            player.probability_of_card_winning_with_player_info(
+                ten_red, trick, player.cards_seen, 1
+            ),
+            probability,
+        )
+        self.assertNotAlmostEqual(
+            uninformed_player.probability_of_winning_trick(
+                ten_red, trick, uninformed_player.cards_seen
+            ),
+            probability,
+        )
+        self.assertEqual({Suit.BLUE, Suit.GREEN, Suit.YELLOW}, player.player_suits_left["P2"])
+
+
+if __name__ == "__main__":
+    unittest.main()
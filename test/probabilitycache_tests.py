@@ -0,0 +1,31 @@
+import unittest
+
+from WizardGame.ProbabilityCache import ProbabilityCache
+
+
+class ProbabilityCacheTests(unittest.TestCase):
+    def test_evicts_least_recently_used(self):
+        cache = ProbabilityCache(max_size=2)
+        cache.put("a", 0.1)
+        cache.put("b", 0.2)
+        # Reading a makes b the least recently used entry
+        self.assertEqual(0.1, cache.get("a"))
+        cache.put("c", 0.3)
+        self.assertIsNone(cache.get("b"))
+        self.assertEqual(0.1, cache.get("a"))
+        self.assertEqual(0.3, cache.get("c"))
+
+    def test_hit_rate(self):
+        cache = ProbabilityCache()
+        self.assertEqual(0.0, cache.hit_rate())
+        self.assertIsNone(cache.get("a"))
+        cache.put("a", 0.0)
+        self.assertEqual(0.0, cache.get("a"))
+        self.assertEqual(0.5, cache.hit_rate())
+        cache.clear()
+        self.assertEqual(0, cache.lookups())
+        self.assertIsNone(cache.get("a"))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,37 @@
+import unittest
+
+from WizardAI.Game import Game
+from WizardAI.MonteCarloPlayer import MonteCarloPlayer
+from WizardAI.RandomAIPlayer import RandomAIPlayer
+from WizardAI.Rng import Rng
+
+
+def play_game(seed: int) -> tuple[dict[str, int], list[list[str]]]:
+    """:return: scores after a few rounds, and the cards played in every trick"""
+    game = Game(
+        [
+            RandomAIPlayer("P1", 3),
+            MonteCarloPlayer("CPU2", 3, 1, 20),
+            MonteCarloPlayer("CPU3", 3, 1, 20, batch_playouts=True),
+        ],
+        seed=seed,
+    )
+    for num_cards in range(2, 5):
+        game.play_round(num_cards)
+    return dict(game.player_scores), [
+        [str(card) for card in trick.cards.values()] for trick in game.tricks
+    ]
+
+
+class RngTests(unittest.TestCase):
+    def test_spawned_streams_are_reproducible(self):
+        first = [rng.random.random() for rng in Rng(7).spawn(3)]
+        second = [rng.random.random() for rng in Rng(7).spawn(3)]
+        self.assertEqual(first, second)
+        self.assertEqual(3, len(set(first)))
+        self.assertEqual(
+            Rng(7).generator.integers(2**63), Rng(7).generator.integers(2**63)
+        )
+
+    def test_game_replays_from_seed(self):
+        self.assertEqual(play_game(3), play_game(3))
@@ -0,0 +1,86 @@
+import unittest
+
+from WizardAI.Card import Card, CardType, Suit, TRICK_STRENGTHS
+from WizardAI.CardSet import mask_of
+from WizardAI.PlayoutEngine import PlayoutEngine, NO_CARD, NO_PLAYER
+from WizardAI.RolloutPolicy import (
+    DuckLowestPolicy,
+    NO_BID,
+    PlayToBidPolicy,
+    WinCheaplyPolicy,
+)
+
+FIVE_RED = Card(CardType.FIVE, Suit.RED)
+SEVEN_RED = Card(CardType.SEVEN, Suit.RED)
+KING_RED = Card(CardType.THIRTEEN, Suit.RED)
+TWO_BLUE = Card(CardType.TWO, Suit.BLUE)
+JESTER = Card(CardType.JESTER, Suit.NONE)
+
+
+class RolloutPolicyTests(unittest.TestCase):
+    def test_win_cheaply(self):
+        # Blue trumps, 5R leads
+        strengths = TRICK_STRENGTHS[Suit.BLUE][Suit.RED]
+        hand = mask_of([SEVEN_RED, KING_RED, TWO_BLUE])
+        policy = WinCheaplyPolicy()
+        self.assertEqual(
+            mask_of([SEVEN_RED]), policy.choose(hand, 0, strengths, FIVE_RED.id, [0], [1])
+        )
+        # Nothing beats the trump, so the weakest card gets thrown
+        self.assertEqual(
+            mask_of([SEVEN_RED]), policy.choose(hand, 0, strengths, TWO_BLUE.id, [0], [1])
+        )
+        # Leads the strongest card
+        self.assertEqual(
+            mask_of([TWO_BLUE]),
+            policy.choose(hand, 0, TRICK_STRENGTHS[Suit.BLUE][Suit.NONE], NO_CARD, [0], [1]),
+        )
+
+    def test_duck_lowest(self):
+        strengths = TRICK_STRENGTHS[Suit.BLUE][Suit.RED]
+        hand = mask_of([SEVEN_RED, KING_RED, JESTER])
+        self.assertEqual(
+            mask_of([JESTER]),
+            DuckLowestPolicy().choose(hand, 0, strengths, FIVE_RED.id, [0], [0]),
+        )
+
+    def test_play_to_bid(self):
+        strengths = TRICK_STRENGTHS[Suit.BLUE][Suit.RED]
+        hand = mask_of([SEVEN_RED, KING_RED, JESTER])
+        policy = PlayToBidPolicy()
+        # Still needs a trick
+        self.assertEqual(
+            mask_of([SEVEN_RED]), policy.choose(hand, 1, strengths, FIVE_RED.id, [0, 0], [0, 1])
+        )
+        # Bid made
+        self.assertEqual(
+            mask_of([JESTER]), policy.choose(hand, 1, strengths, FIVE_RED.id, [0, 1], [0, 1])
+        )
+        # Unknown bid, falls back on winning cheaply
+        self.assertEqual(
+            mask_of([SEVEN_RED]),
+            policy.choose(hand, 1, strengths, FIVE_RED.id, [0, 1], [0, NO_BID]),
+        )
+
+    def test_playout_engine_follows_policy(self):
+        # Seat 0 leads its trump 2B and wins it over the jester seat 1 ducks with, then seat 1 wins 4Y with 13Y
+        hands = [
+            mask_of([Card(CardType.FOUR, Suit.YELLOW), TWO_BLUE]),
+            mask_of([Card(CardType.THIRTEEN, Suit.YELLOW), JESTER]),
+        ]
+        winning_freq = dict()
+        engine = PlayoutEngine(2, 1, max_branch_factor=1, policy=PlayToBidPolicy())
+        engine.run(
+            Suit.BLUE,
+            hands,
+            [0, 0],
+            0,
+            NO_PLAYER,
+            NO_CARD,
+            None,
+            0,
+            1,
+            winning_freq,
+            bids=[NO_BID, 0],
+        )
+        self.assertEqual({1: 1}, winning_freq)
@@ -0,0 +1,47 @@
+import unittest
+
+from WizardGame.Card import build_deck, Card, CardType, Suit
+from WizardGame.SeenCards import SeenCards
+
+
+class SeenCardsTests(unittest.TestCase):
+    def test_counts_follow_added_cards(self):
+        deck = build_deck()
+        seen_cards = SeenCards(deck[::3])
+        seen = {hash(card) for card in deck[::3]}
+        self.assertEqual(len(seen), len(seen_cards))
+        self.assertEqual(60 - len(seen), seen_cards.unseen())
+        for suit in Suit.all_suits:
+            for rank in range(1, 15):
+                self.assertEqual(
+                    sum(
+                        Card.index(CardType(r), Suit(suit), 0, 0) not in seen
+                        for r in range(1, rank)
+                    ),
+                    seen_cards.unseen_below(Suit(suit), rank),
+                )
+            self.assertEqual(
+                seen_cards.unseen_below(Suit(suit), 14),
+                seen_cards.unseen_in_suit(Suit(suit)),
+            )
+        self.assertEqual(
+            sum(53 + i not in seen for i in range(4)), seen_cards.unseen_jesters()
+        )
+        self.assertEqual(
+            sum(57 + i not in seen for i in range(4)), seen_cards.unseen_wizards()
+        )
+
+    def test_cards_are_only_counted_once(self):
+        seen_cards = SeenCards([Card(CardType.TWO, Suit.RED)])
+        copy = seen_cards.copy()
+        self.assertFalse(copy.add(Card(CardType.TWO, Suit.RED)))
+        self.assertTrue(copy.add(Card(CardType.JESTER, Suit.NONE, jester_index=2)))
+        self.assertEqual(2, len(copy))
+        self.assertEqual(1, len(seen_cards))
+        self.assertIn(hash(Card(CardType.TWO, Suit.RED)), copy)
+        self.assertNotIn(hash(Card(CardType.THREE, Suit.RED)), copy)
+        self.assertEqual(11, copy.unseen_below(Suit.RED, 13))
+
+
+if __name__ == "__main__":
+    unittest.main()
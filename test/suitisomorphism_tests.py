@@ -0,0 +1,68 @@
+import random
+import unittest
+
+from WizardAI.Card import Card, CardType, Suit, CARDS_BY_ID
+from WizardAI.CardSet import FULL_DECK_MASK, mask_of
+from WizardAI.SuitIsomorphism import (
+    canonicalize,
+    permute_card_id,
+    permute_mask,
+    permute_suit,
+    restore_card_id,
+    restore_mask,
+    restore_suit,
+)
+
+PERMUTATIONS = [
+    (0, 1, 2, 3),
+    (1, 0, 3, 2),
+    (3, 2, 0, 1),
+    (2, 3, 1, 0),
+]
+
+
+class SuitIsomorphismTests(unittest.TestCase):
+    def test_permuted_positions_share_key(self):
+        rng = random.Random(0)
+        for i in range(200):
+            card_ids = rng.sample(range(1, 61), 12)
+            hand = mask_of(CARDS_BY_ID[card_id] for card_id in card_ids[:4])
+            seen = mask_of(CARDS_BY_ID[card_id] for card_id in card_ids[4:9])
+            trick = card_ids[9:]
+            trump = Suit(rng.randrange(len(Suit.values)))
+            key, permutation = canonicalize(hand, trump, seen, trick)
+            for other in PERMUTATIONS:
+                other_key, other_permutation = canonicalize(
+                    permute_mask(hand, other),
+                    permute_suit(trump, other),
+                    permute_mask(seen, other),
+                    [permute_card_id(card_id, other) for card_id in trick],
+                )
+                self.assertEqual(key, other_key)
+
+            # Mapping the key back gives the position
+            self.assertEqual(hand, restore_mask(key[0], permutation))
+            self.assertEqual(trump, restore_suit(key[1], permutation))
+            self.assertEqual(
+                trick, [restore_card_id(card_id, permutation) for card_id in key[3]]
+            )
+
+    def test_trump_becomes_blue(self):
+        wizard = Card(CardType.WIZARD, Suit.NONE)
+        hand = mask_of([Card(CardType.ONE, Suit.YELLOW), wizard])
+        key, permutation = canonicalize(hand, Suit.YELLOW)
+        self.assertEqual(Suit.BLUE, key[1])
+        self.assertEqual(mask_of([Card(CardType.ONE, Suit.BLUE), wizard]), key[0])
+        self.assertEqual(FULL_DECK_MASK, permute_mask(FULL_DECK_MASK, permutation))
+
+    def test_different_positions_have_different_keys(self):
+        one_red = Card(CardType.ONE, Suit.RED)
+        hand = mask_of([one_red, Card(CardType.TWO, Suit.GREEN)])
+        other_hand = mask_of([one_red, Card(CardType.TWO, Suit.RED)])
+        self.assertNotEqual(
+            canonicalize(hand, Suit.NONE)[0], canonicalize(other_hand, Suit.NONE)[0]
+        )
+        # Only the non-trump suits are interchangeable
+        self.assertNotEqual(
+            canonicalize(hand, Suit.RED)[0], canonicalize(hand, Suit.GREEN)[0]
+        )
@@ -0,0 +1,112 @@
+import copy
+import pickle
+import random
+import unittest
+
+from WizardAI.Card import (
+    Card,
+    CardType,
+    Suit,
+    build_deck,
+    build_shuffled_deck,
+    card_from_id,
+    card_from_string,
+    compare_cards,
+    trick_winner,
+    wins_trick,
+    InvalidCardException,
+)
+from WizardAI.CardSet import CardSet, playable_cards
+
+
+class WizardAICardTests(unittest.TestCase):
+    def test_cards_are_interned(self):
+        self.assertIs(Card(CardType.FOUR, Suit.YELLOW), Card(CardType.FOUR, Suit.YELLOW))
+        self.assertIs(card_from_string("4y"), Card(CardType.FOUR, Suit.YELLOW))
+        self.assertIs(
+            Card(CardType.WIZARD, Suit.NONE, wizard_index=2), build_deck()[56]
+        )
+
+    def test_deck_builders_return_singletons(self):
+        deck = build_deck()
+        shuffled_deck = build_shuffled_deck()
+        self.assertEqual(60, len(set(deck)))
+        self.assertEqual(set(deck), set(shuffled_deck))
+        for card in shuffled_deck:
+            self.assertIs(card_from_id(card.id), card)
+            self.assertEqual(card.id, hash(card))
+
+    def test_cards_are_immutable(self):
+        card = Card(CardType.ONE, Suit.RED)
+        with self.assertRaises(AttributeError):
+            card.suit = Suit.BLUE
+
+    def test_copies_keep_identity(self):
+        card = Card(CardType.JESTER, Suit.NONE, jester_index=3)
+        self.assertIs(card, pickle.loads(pickle.dumps(card)))
+        self.assertIs(card, copy.deepcopy(card))
+
+    def test_invalid_card(self):
+        with self.assertRaises(InvalidCardException):
+            Card(CardType.WIZARD, Suit.BLUE)
+
+    def test_card_set_operations(self):
+        hand = CardSet([Card(CardType.ONE, Suit.RED), Card(CardType.WIZARD, Suit.NONE)])
+        self.assertEqual(2, len(hand))
+        self.assertIn(Card(CardType.ONE, Suit.RED), hand)
+        hand.remove(Card(CardType.ONE, Suit.RED))
+        self.assertNotIn(Card(CardType.ONE, Suit.RED), hand)
+        self.assertEqual([Card(CardType.WIZARD, Suit.NONE)], list(hand))
+        with self.assertRaises(KeyError):
+            hand.remove(Card(CardType.ONE, Suit.RED))
+        with self.assertRaises(TypeError):
+            hash(hand)
+
+    def test_playable_cards(self):
+        jester = Card(CardType.JESTER, Suit.NONE)
+        one_red = Card(CardType.ONE, Suit.RED)
+        two_blue = Card(CardType.TWO, Suit.BLUE)
+        hand = CardSet([jester, one_red, two_blue])
+        self.assertEqual(CardSet([jester, one_red]), playable_cards(hand, Suit.RED))
+        self.assertEqual(hand, playable_cards(hand, Suit.YELLOW))
+        self.assertEqual(hand, playable_cards(hand, Suit.NONE))
+        self.assertEqual(hand, playable_cards(hand, None))
+
+    def test_wins_trick_matches_compare_cards(self):
+        for trump in Suit.values:
+            for winning_card in build_deck():
+                # Suits to follow for which winning_card can be the current winner of a trick
+                if winning_card.card_type == CardType.WIZARD:
+                    suits_to_follow = [None, *Suit.all_suits]
+                elif winning_card.card_type == CardType.JESTER:
+                    suits_to_follow = [Suit.NONE]
+                elif winning_card.suit == trump:
+                    suits_to_follow = Suit.all_suits
+                else:
+                    suits_to_follow = [winning_card.suit]
+
+                for suit_to_follow in suits_to_follow:
+                    for card in build_deck():
+                        if card is winning_card:
+                            continue
+                        self.assertEqual(
+                            compare_cards(winning_card, card, trump) < 0,
+                            wins_trick(card, winning_card, trump, suit_to_follow),
+                            f"{card} vs {winning_card}, trump={trump}, suit to follow={suit_to_follow}",
+                        )
+                self.assertTrue(wins_trick(winning_card, None, trump, None))
+
+    def test_trick_winner_matches_compare_cards(self):
+        rng = random.Random(0)
+        for i in range(2000):
+            trump = rng.choice(Suit.values)
+            cards = rng.sample(build_deck(), rng.randint(1, 6))
+            winner = None
+            for card in cards:
+                if compare_cards(winner, card, trump) < 0:
+                    winner = card
+            self.assertIs(winner, cards[trick_winner(cards, trump)])
+
+
+if __name__ == "__main__":
+    unittest.main()